@@ -20,6 +20,24 @@ class BaseClient(ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def fork(self) -> "BaseClient":
+        """
+        Create a new client for the same collection with its own connection to the database. In contrast to
+        __init__, the database is not reset. The returned client can be used concurrently to this client and should be
+        closed with :meth:`close` after use.
+
+        :return: A new client with its own connection.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def close(self) -> None:
+        """
+        Close the connection of the client to the database.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def insert(self, embeddings: list[list[float]], metadata: Optional[list[str]] = None, start_id: int = 0) -> None:
         """
@@ -45,6 +63,46 @@ class BaseClient(ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def upsert(self, embeddings: list[list[float]], ids: list[int], metadata: Optional[list[str]] = None) -> None:
+        """
+        Insert embeddings with the given ids into the database. If an id already exists, its embedding and metadata
+        are replaced.
+
+        :param embeddings: List of embeddings to insert or replace.
+        :param ids: List of ids of the embeddings. The length must match len(embeddings).
+        :param metadata: List of metadata to insert or replace.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, ids: list[int]) -> None:
+        """
+        Delete the embeddings with the given ids from the database. Ids that do not exist are ignored.
+
+        :param ids: List of ids of the embeddings to delete.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_batch_size(self, batch_size: int) -> None:
+        """
+        Set the number of embeddings sent to the database in one batch by :meth:`insert` and :meth:`batch_insert`.
+        Without a call, clients use the calibrated batch size for their dimension (see
+        :func:`ecovdbs.client.utility.read_batch_size`) or a fixed heuristic.
+
+        :param batch_size: The number of embeddings per batch.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def flush(self) -> None:
+        """
+        Make all inserted data durable. Some databases buffer inserted data and only persist it after a flush, which is
+        also needed to build the index on the inserted data. Call it once after the last insert.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def create_index(self) -> None:
         """
@@ -52,6 +110,25 @@ class BaseClient(ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def index_progress(self) -> float:
+        """
+        Get the progress of the index creation. Some databases keep building the index in the background after
+        :meth:`create_index` or :meth:`insert` returned. The index is fully built and ready for queries once the
+        progress reaches 1.
+
+        :return: The fraction of the inserted data that is indexed, between 0 and 1.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def drop_index(self) -> None:
+        """
+        Drop the index created by :meth:`create_index` while keeping the inserted data. Dropping a non-existing index
+        does nothing.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def disk_storage(self) -> float:
         """
@@ -88,6 +165,18 @@ class BaseClient(ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def batch_query(self, queries: list[list[float]], k: int) -> list[list[int]]:
+        """
+        Query the database with several embeddings at once and return the top k results of each. The search parameters
+        are the same as for :meth:`query`.
+
+        :param queries: The query embeddings.
+        :param k: The number of results to return per query.
+        :return: The ids of the top k results of every query in the order of the queries.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def filtered_query(self, query: list[float], k: int, keyword_filter: str) -> list[int]:
         """
@@ -114,3 +203,45 @@ class BaseClient(ABC):
         :return: The id of the top k results from the query.
         """
         raise NotImplementedError
+
+    @abstractmethod
+    def ping(self) -> None:
+        """
+        Send a request to the database that does no work in the engine. Its duration is the network and protocol
+        overhead of a request.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def query_engine_time(self, query: list[float], k: int) -> Optional[float]:
+        """
+        Run :meth:`query` with the server-side timing of the database.
+
+        :param query: The query embedding.
+        :param k: The number of results to return.
+        :return: The time the database engine spent on the query in seconds or None if the database does not expose
+            the time.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def query_plan(self, query: list[float], k: int, keyword_filter: Optional[str] = None) -> Optional[str]:
+        """
+        Get the execution plan of :meth:`query` or, with a keyword filter, of :meth:`filtered_query`.
+
+        :param query: The query embedding.
+        :param k: The number of results to return.
+        :param keyword_filter: The keyword filter of a filtered query.
+        :return: The plan as text or None if the database does not expose the plan.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def storage_breakdown(self, vacuum: bool = False) -> Optional[dict[str, float]]:
+        """
+        Split the storage used by the database into its components.
+
+        :param vacuum: Whether to reclaim the space of deleted entries before the storage is measured.
+        :return: The size of every component in MB or None if the database does not expose the components.
+        """
+        raise NotImplementedError
@@ -15,6 +15,72 @@ class MetricType(Enum):
     IP = "IP"
 
 
+class Quantization(Enum):
+    """
+    Enum for the representation of the vectors in the index.
+    NONE = Full precision (float32)
+    HALFVEC = Half precision (float16)
+    BINARY = One bit per dimension
+    """
+    NONE = "NONE"
+    HALFVEC = "HALFVEC"
+    BINARY = "BINARY"
+
+
+class FilterStrategy(Enum):
+    """
+    Enum for the execution of filtered queries.
+    INDEX = Filter the results of the vector index scan
+    PRE_FILTER = Exact search over the rows matching the filter
+    POST_FILTER = Filter an oversampled candidate set of the vector index
+    PARTIAL_INDEX = Separate vector indexes for the most frequent filter values
+    AUTO = Choose the strategy per filter value by its estimated selectivity
+    """
+    INDEX = "INDEX"
+    PRE_FILTER = "PRE_FILTER"
+    POST_FILTER = "POST_FILTER"
+    PARTIAL_INDEX = "PARTIAL_INDEX"
+    AUTO = "AUTO"
+
+
+class CacheMode(Enum):
+    """
+    Enum for the state of the caches of the database before the queries.
+    NONE = The caches are left as they are
+    WARM = The data and the index are loaded into the caches
+    COLD = The caches are emptied
+    """
+    NONE = "NONE"
+    WARM = "WARM"
+    COLD = "COLD"
+
+
+class ScalarIndexType(Enum):
+    """
+    Enum for different types of indexes on scalar fields.
+    NONE = No index, the filter is evaluated on the raw field
+    INVERTED = Inverted index from every value to its rows
+    TRIE = Trie of the string values
+    """
+    NONE = "NONE"
+    INVERTED = "INVERTED"
+    TRIE = "Trie"
+
+
+class ConsistencyLevel(Enum):
+    """
+    Enum for the consistency levels of searches.
+    STRONG = The search waits until it sees all writes issued before it
+    BOUNDED = The search may miss the writes of a short staleness window
+    SESSION = The search sees all writes of its own client
+    EVENTUALLY = The search does not wait for any write
+    """
+    STRONG = "Strong"
+    BOUNDED = "Bounded"
+    SESSION = "Session"
+    EVENTUALLY = "Eventually"
+
+
 class IndexType(Enum):
     """
     Enum for different types of indexes.
@@ -73,3 +139,23 @@ class BaseHNSWConfig(BaseIndexConfig, ABC):
             search.
         """
         raise NotImplementedError
+
+    @abstractmethod
+    def change_build_param(self, M: int, ef_construction: int) -> None:
+        """
+        Change the build parameters of the HNSW. The change takes effect the next time the index is created.
+
+        :param M: The maximum number of connections per node in the graph.
+        :param ef_construction: The size of the dynamic candidate list used during the index construction.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def change_build_threads(self, threads: int) -> None:
+        """
+        Change the number of threads used to build the HNSW. The change takes effect the next time the index is
+        created. Raises :class:`NotImplementedError` if the number of build threads can not be set by the client.
+
+        :param threads: The number of threads building the index.
+        """
+        raise NotImplementedError
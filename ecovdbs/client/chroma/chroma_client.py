@@ -1,17 +1,17 @@
 import logging
 import tqdm
+from copy import copy
 from typing import Optional
 
 import chromadb
 import docker
 from chromadb import ClientAPI, Collection, QueryResult
-from chromadb.utils.batch_utils import create_batches
 from docker.errors import NotFound, APIError
 
 from .chroma_config import ChromaConfig, ChromaHNSWConfig
 from ..base_client import BaseClient
 from ..base_config import BaseIndexConfig
-from ..utility import bytes_to_mb, get_size_of
+from ..utility import bytes_to_mb, get_size_of, pipelined_insert, batch_ranges, read_batch_size
 
 log = logging.getLogger(__name__)
 
@@ -37,11 +37,16 @@ class ChromaClient(BaseClient):
         self.__collection_name: str = "ecovdbs"
         self.__metadata_field: str = "metadata"
         self.__persistence_directory = "/chroma/chroma"
+        self.__db_config: ChromaConfig = db_config
         self.__client: ClientAPI = chromadb.HttpClient(host=db_config.host, port=db_config.port)
 
         # Ensure the client is alive by checking the heartbeat.
         assert self.__client.heartbeat() is not None
 
+        # The server limits the batch size, self.__client.max_batch_size >> 41666
+        self.__batch_size: int = min(read_batch_size(type(self).__name__, dimension) or self.__client.max_batch_size,
+                                     self.__client.max_batch_size)
+
         try:
             client = docker.from_env()
             self.__container = client.containers.get(db_config.container_name)
@@ -58,9 +63,20 @@ class ChromaClient(BaseClient):
                                                                                metadata=self.__index_config.index_param())
         log.info("Chroma client initialized")
 
+    def fork(self) -> "ChromaClient":
+        clone = copy(self)
+        clone.__client = chromadb.HttpClient(host=self.__db_config.host, port=self.__db_config.port)
+        clone.__collection = clone.__client.get_collection(name=self.__collection_name)
+        return clone
+
+    def close(self) -> None:
+        """
+        Not implemented! The HTTP client does not hold an open connection that needs to be closed.
+        """
+        return None
+
     def insert(self, embeddings: list[list[float]], metadata: Optional[list[str]] = None, start_id: int = 0) -> None:
-        # self.__client.max_batch_size >> 41666
-        if len(embeddings) > self.__client.max_batch_size:
+        if len(embeddings) > self.__batch_size:
             self.batch_insert(embeddings, metadata, start_id)
         else:
             ids, metadata = self.__pre_insert(len(embeddings), metadata, start_id)
@@ -68,10 +84,34 @@ class ChromaClient(BaseClient):
 
     def batch_insert(self, embeddings: list[list[float]], metadata: Optional[list[str]] = None,
                      start_id: int = 0) -> None:
-        ids, metadata = self.__pre_insert(len(embeddings), metadata, start_id)
-        batches = create_batches(api=self.__client, ids=ids, embeddings=embeddings, metadatas=metadata)
-        for batch in tqdm.tqdm(batches):
-            self.__collection.add(ids=batch[0], embeddings=batch[1], metadatas=batch[2])
+        log.info(f"Inserting {len(embeddings)} vectors into database")
+        if not metadata or len(metadata) != len(embeddings):
+            metadata = None
+        # The ids and metadata of the next batch are prepared while the previous batch is sent
+        pipelined_insert(tqdm.tqdm(batch_ranges(len(embeddings), self.__batch_size)),
+                         lambda r: self.__encode(embeddings, metadata, start_id, r[0], r[1]),
+                         lambda batch: self.__collection.add(ids=batch[0], embeddings=batch[1], metadatas=batch[2]))
+
+    def upsert(self, embeddings: list[list[float]], ids: list[int], metadata: Optional[list[str]] = None) -> None:
+        """
+        Upsert the embeddings in batches. Chroma DB marks the old vectors as deleted in the HNSW index and inserts the
+        new ones.
+        """
+        log.info(f"Upserting {len(embeddings)} vectors into database")
+        if not metadata or len(metadata) != len(embeddings):
+            metadata = None
+        for start, end in batch_ranges(len(embeddings), self.__batch_size):
+            batch_metadata = [{self.__metadata_field: md} for md in metadata[start:end]] if metadata else None
+            self.__collection.upsert(ids=[str(i) for i in ids[start:end]], embeddings=embeddings[start:end],
+                                     metadatas=batch_metadata)
+
+    def delete(self, ids: list[int]) -> None:
+        """
+        Delete the embeddings in batches. Chroma DB marks the deleted vectors as deleted in the HNSW index.
+        """
+        log.info(f"Deleting {len(ids)} vectors from database")
+        for start, end in batch_ranges(len(ids), self.__batch_size):
+            self.__collection.delete(ids=[str(i) for i in ids[start:end]])
 
     def __pre_insert(self, len_embeddings: int, metadata: Optional[list[str]], start_id: int):
         """
@@ -90,6 +130,36 @@ class ChromaClient(BaseClient):
             metadata) == len_embeddings else None
         return ids, metadata
 
+    def __encode(self, embeddings: list[list[float]], metadata: Optional[list[str]], start_id: int, start: int,
+                 end: int) -> tuple[list[str], list[list[float]], Optional[list[dict]]]:
+        """
+        Encode a batch of the embeddings into the ids, embeddings and metadata of the collection.
+
+        :param embeddings: List of embeddings to insert.
+        :param metadata: List of metadata strings to insert or None.
+        :param start_id: Index of the first inserted vector.
+        :param start: Index of the first embedding of the batch.
+        :param end: Index after the last embedding of the batch.
+        :return: A tuple containing the ids, the embeddings and the metadata of the batch.
+        """
+        ids: list[str] = [str(i) for i in range(start_id + start, start_id + end)]
+        batch_metadata = [{self.__metadata_field: md} for md in metadata[start:end]] if metadata else None
+        return ids, embeddings[start:end], batch_metadata
+
+    def set_batch_size(self, batch_size: int) -> None:
+        """
+        Set the batch size. The batch size is limited by the maximum batch size of the server.
+
+        :param batch_size: The number of embeddings per batch.
+        """
+        self.__batch_size = min(batch_size, self.__client.max_batch_size)
+
+    def flush(self) -> None:
+        """
+        Not implemented! The data is written by :meth:`insert`.
+        """
+        return None
+
     def create_index(self) -> float:
         """
         Not implemented! Chroma DB automatically creates an index of the embeddings as they are inserted into the
@@ -97,6 +167,26 @@ class ChromaClient(BaseClient):
         """
         pass
 
+    def index_progress(self) -> float:
+        """
+        Chroma DB builds the index while inserting, so the index is always ready.
+
+        :return: 1
+        """
+        return 1.0
+
+    def drop_index(self) -> None:
+        """
+        Chroma DB builds the index while inserting and the index parameters can not be changed after the collection
+        was created. Therefore, the collection is deleted and recreated with the current index configuration. The data
+        has to be inserted again afterward.
+        """
+        log.info(f"Recreating collection {self.__collection_name}")
+        self.__client.delete_collection(name=self.__collection_name)
+        self.__search_param = self.__index_config.search_param()
+        self.__collection = self.__client.get_or_create_collection(name=self.__collection_name,
+                                                                   metadata=self.__index_config.index_param())
+
     def disk_storage(self) -> float:
         """
         Only works if the database runs inside a docker container and the name passed in the config!
@@ -145,6 +235,15 @@ class ChromaClient(BaseClient):
         res: QueryResult = self.__collection.query(query_embeddings=query, n_results=k)
         return [int(id) for id in res["ids"][0]]
 
+    def batch_query(self, queries: list[list[float]], k: int) -> list[list[int]]:
+        """
+        Send all queries with one query request.
+        """
+        log.info(f"Query {k} vectors for {len(queries)} queries")
+        self.__pre_query()
+        res: QueryResult = self.__collection.query(query_embeddings=queries, n_results=k)
+        return [[int(id) for id in ids] for ids in res["ids"]]
+
     def filtered_query(self, query: list[float], k: int, keyword_filter: str) -> list[int]:
         log.info(f"Query {k} vectors with keyword_filter {keyword_filter}. Query: {query}")
         self.__pre_query()
@@ -157,3 +256,24 @@ class ChromaClient(BaseClient):
         Chroma DB does not support ranged queries.
         """
         raise NotImplementedError
+
+    def ping(self) -> None:
+        self.__client.heartbeat()
+
+    def query_engine_time(self, query: list[float], k: int) -> Optional[float]:
+        """
+        Not implemented! The Chroma server does not report the time spent on a query.
+        """
+        return None
+
+    def query_plan(self, query: list[float], k: int, keyword_filter: Optional[str] = None) -> Optional[str]:
+        """
+        Not implemented! The Chroma server does not expose the plan of a query.
+        """
+        return None
+
+    def storage_breakdown(self, vacuum: bool = False) -> Optional[dict[str, float]]:
+        """
+        Not implemented! The Chroma server does not expose its storage components.
+        """
+        return None
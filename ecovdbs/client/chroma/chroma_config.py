@@ -106,3 +106,13 @@ class ChromaHNSWConfig(BaseHNSWConfig):
 
     def change_ef_search(self, ef: int) -> None:
         self.__search_ef = ef
+
+    def change_build_param(self, M: int, ef_construction: int) -> None:
+        assert M > 0, "M must be positive integer."
+        self.__M = M
+        assert ef_construction > 0, "construction_ef must be positive integer."
+        self.__construction_ef = ef_construction
+
+    def change_build_threads(self, threads: int) -> None:
+        assert threads > 0, "num_threads must be positive integer."
+        self.__num_threads = threads
@@ -1,15 +1,18 @@
 import logging
+import urllib.request
+from copy import copy
 from typing import Optional
 
 import docker
+import numpy as np
 from docker.errors import NotFound, APIError
 from docker.models.containers import Container
 from pymilvus import DataType, connections, FieldSchema, CollectionSchema, Collection, utility, SearchResult
 
 from .milvus_config import MilvusConfig
 from ..base_client import BaseClient
-from ..base_config import BaseIndexConfig
-from ..utility import bytes_to_mb, get_size_of
+from ..base_config import BaseIndexConfig, MetricType, IndexType, ScalarIndexType
+from ..utility import bytes_to_mb, get_size_of, pipelined_insert, batch_ranges, read_batch_size
 
 log = logging.getLogger(__name__)
 
@@ -17,6 +20,70 @@ log = logging.getLogger(__name__)
 # https://github.com/zilliztech/VectorDBBench/blob/main/vectordb_bench/backend/clients/milvus/milvus.py
 MILVUS_LOAD_REQS_SIZE = 1.5 * 1024 * 1024
 
+# Prometheus histogram of the search latency in milliseconds measured by the proxy
+SEARCH_LATENCY_SUM = "milvus_proxy_sq_latency_sum"
+
+
+def _search_latency_sum(metrics_uri: str) -> float:
+    """
+    Read the total search latency of the proxy from the Prometheus metrics of the Milvus server.
+
+    :param metrics_uri: The URI of the metrics.
+    :return: The sum of all search latencies in milliseconds since the start of the server.
+    """
+    with urllib.request.urlopen(metrics_uri) as response:
+        lines = response.read().decode().splitlines()
+    # e.g. milvus_proxy_sq_latency_sum{node_id="1",query_type="search"} 1234.5
+    return sum(float(line.rsplit(" ", 1)[1]) for line in lines
+               if line.startswith(SEARCH_LATENCY_SUM) and 'query_type="search"' in line)
+
+
+def _range_bound(metric_type: str, distance: float) -> float:
+    """
+    Convert a distance to the bound of a Milvus range search. Milvus reports the squared Euclidean distance for L2 and
+    the similarity for IP and COSINE, where a larger value is closer. The distance follows the distance operators of
+    pgvector: the Euclidean distance, the negative inner product and one minus the cosine similarity.
+
+    :param metric_type: The metric type of the search parameters.
+    :param distance: The distance.
+    :return: The bound in the metric of Milvus.
+    """
+    if metric_type == MetricType.L2.value:
+        return distance ** 2
+    if metric_type == MetricType.IP.value:
+        return -distance
+    return 1 - distance
+
+
+def _theoretical_index_size(index_param: dict, nd: int, d: int) -> int:
+    """
+    Get the theoretical size of a Milvus index. For HNSW see https://github.com/milvus-io/milvus/discussions/24894, the
+    IVF sizes follow the index descriptions of https://milvus.io/docs/index.md.
+
+    :param index_param: The index parameters of the index configuration.
+    :param nd: The number of vectors.
+    :param d: The dimension of the vectors.
+    :return: Theoretical index size in bytes.
+    """
+    params = index_param["params"]
+    raw = nd * d * 4  # 4 bytes per float32
+    centroids = params.get("nlist", 0) * d * 4
+    ids = nd * 8  # 8 bytes per int64
+    index_type = index_param["index_type"]
+    if index_type == IndexType.HNSW.value:
+        return raw + nd * params["M"] * 8
+    if index_type == IndexType.IVFFlat.value:
+        return raw + ids + centroids
+    if index_type == IndexType.IVFSQ8.value:
+        return nd * d + ids + centroids  # 1 byte per dimension
+    if index_type == IndexType.IVFPQ.value:
+        codebooks = 2 ** params["nbits"] * d * 4
+        return nd * params["m"] * params["nbits"] // 8 + ids + centroids + codebooks
+    if index_type == IndexType.SCANN.value:
+        # 4 bits per pair of dimensions
+        return nd * d // 4 + ids + centroids + (raw if params["with_raw_data"] else 0)
+    return raw
+
 
 class MilvusClient(BaseClient):
     """
@@ -37,11 +104,21 @@ class MilvusClient(BaseClient):
         self.__collection_name: str = "ecovdbs"
         # Copied from VectorDBBench:
         # https://github.com/zilliztech/VectorDBBench/blob/main/vectordb_bench/backend/clients/milvus/milvus.py
-        self.__batch_size = int(MILVUS_LOAD_REQS_SIZE / (self.__dimension * 4))
+        # The heuristic is only used if no batch size was calibrated for the dimension
+        self.__batch_size = read_batch_size(type(self).__name__, dimension) or int(
+            MILVUS_LOAD_REQS_SIZE / (self.__dimension * 4))
         self.__index_name: str = "index"
+        self.__scalar_index_name: str = "metadata_index"
+        self.__scalar_index: ScalarIndexType = db_config.scalar_index
+        self.__mmap: bool = db_config.mmap
+        self.__loaded: bool = False
         self.__id_name: str = "id"
         self.__metadata_name: str = "metadata"
         self.__vector_name: str = "vector"
+        self.__connection_uri: str = db_config.connection_uri
+        self.__metrics_uri: str = db_config.metrics_uri
+        self.__range_filter: Optional[float] = db_config.range_filter
+        self.__alias: str = "default"
         if db_config.container_name == "milvus-minio":
             self.__persistence_directory: str = "/minio_data/a-bucket/files"
         else:
@@ -49,16 +126,17 @@ class MilvusClient(BaseClient):
             self.__object_storage_directory: str = f"{self.__persistence_directory}/data"
 
         # Connect to the Milvus server
-        connections.connect(uri=db_config.connection_uri)
+        connections.connect(alias=self.__alias, uri=self.__connection_uri)
 
         # Drop the collection if it already exists
-        if utility.has_collection(self.__collection_name):
-            utility.drop_collection(self.__collection_name)
+        if utility.has_collection(self.__collection_name, using=self.__alias):
+            utility.drop_collection(self.__collection_name, using=self.__alias)
 
         # Define the schema for the collection
         fields: list[FieldSchema] = [
             FieldSchema(name=self.__id_name, dtype=DataType.INT64, is_primary=True, auto_id=False),
-            FieldSchema(name=self.__metadata_name, dtype=DataType.VARCHAR, max_length=100),
+            FieldSchema(name=self.__metadata_name, dtype=DataType.VARCHAR, max_length=100,
+                        is_partition_key=db_config.partition_key),
             FieldSchema(name=self.__vector_name, dtype=DataType.FLOAT_VECTOR, dim=self.__dimension),
         ]
         schema: CollectionSchema = CollectionSchema(fields)
@@ -74,50 +152,147 @@ class MilvusClient(BaseClient):
             log.error(f"Could not find the database container with the name {db_config.container_name}")
 
         # Create the collection with the defined schema
-        self.__collection: Collection = Collection(self.__collection_name, schema)
+        # The consistency level of the collection is the default of all its searches
+        collection_args: dict = {"consistency_level": db_config.consistency_level.value}
+        if db_config.partition_key:
+            collection_args["num_partitions"] = db_config.num_partitions
+        self.__collection: Collection = Collection(self.__collection_name, schema, using=self.__alias,
+                                                   **collection_args)
+        if self.__mmap:
+            # Memory-map the fields of the collection (see https://milvus.io/docs/mmap.md)
+            self.__collection.set_properties({"mmap.enabled": True})
         log.info("Milvus client initialized")
 
+    def fork(self) -> "MilvusClient":
+        clone = copy(self)
+        # Every connection alias opens its own gRPC channel
+        clone.__alias = f"{self.__collection_name}-{id(clone)}"
+        connections.connect(alias=clone.__alias, uri=self.__connection_uri)
+        clone.__collection = Collection(self.__collection_name, using=clone.__alias)
+        return clone
+
+    def close(self) -> None:
+        connections.disconnect(self.__alias)
+
     def insert(self, embeddings: list[list[float]], metadata: Optional[list[str]] = None, start_id: int = 0) -> None:
         if len(embeddings) > self.__batch_size:
             self.batch_insert(embeddings, metadata, start_id)
         else:
-            data = self.__pre_insert(embeddings, metadata, start_id)
-            self.__collection.insert(data=data)
-            self.__collection.flush()
+            metadata = self.__pre_insert(embeddings, metadata)
+            vectors = np.asarray(embeddings, dtype=np.float32)
+            self.__collection.insert(data=self.__encode(vectors, metadata, start_id, 0, len(embeddings)))
 
     def batch_insert(self, embeddings: list[list[float]], metadata: Optional[list[str]] = None,
                      start_id: int = 0) -> None:
-        data = self.__pre_insert(embeddings, metadata, start_id)
-        for i in range(0, len(data), self.__batch_size):
-            self.__collection.insert(data=data[i:min(i + self.__batch_size, len(data))])
-        self.__collection.flush()
+        """
+        Insert the embeddings column-based in batches. The embeddings are converted to one float32 matrix, and every
+        batch sends a slice of it. Parallel insertion over several gRPC channels uses one fork per worker (see
+        :func:`parallel_insert`), and the data is flushed once by the caller.
+        """
+        metadata = self.__pre_insert(embeddings, metadata)
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        # The next batch is encoded while the previous one is sent
+        pipelined_insert(batch_ranges(len(embeddings), self.__batch_size),
+                         lambda r: self.__encode(vectors, metadata, start_id, r[0], r[1]),
+                         lambda data: self.__collection.insert(data=data))
+
+    def upsert(self, embeddings: list[list[float]], ids: list[int], metadata: Optional[list[str]] = None) -> None:
+        """
+        Upsert the embeddings in batches. Milvus deletes the old entities and inserts the new ones, the deleted
+        entities are only removed from the sealed segments by the compaction.
+        """
+        metadata = self.__pre_insert(embeddings, metadata)
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        for start, end in batch_ranges(len(embeddings), self.__batch_size):
+            self.__collection.upsert(data=[ids[start:end], metadata[start:end], vectors[start:end]])
+
+    def delete(self, ids: list[int]) -> None:
+        """
+        Delete the entities in batches. The deleted entities are only removed from the sealed segments by the
+        compaction.
+        """
+        log.info(f"Deleting {len(ids)} vectors from database")
+        for start, end in batch_ranges(len(ids), self.__batch_size):
+            self.__collection.delete(expr=f"{self.__id_name} in {list(ids[start:end])}")
 
-    def __pre_insert(self, embeddings: list[list[float]], metadata: Optional[list[str]], start_id: int) -> list[dict]:
+    def __pre_insert(self, embeddings: list[list[float]], metadata: Optional[list[str]]) -> list[str]:
         """
-        Prepare data for insertion into the database.
+        Prepare the metadata for insertion into the database.
 
         :param embeddings: List of embeddings to insert.
         :param metadata: List of metadata strings to insert. The length should match len(embeddings) if provided.
-        :param start_id: Index of the first inserted vector.
-        :return: A list of dictionaries containing the IDs, metadata, and vectors.
+        :return: The metadata or a list of empty strings if no matching metadata is provided.
         """
         log.info(f"Inserting {len(embeddings)} vectors into database")
         if not metadata or len(metadata) != len(embeddings):
-            metadata = ["" for _ in range(len(embeddings))]
+            metadata = [""] * len(embeddings)
+        return metadata
+
+    @staticmethod
+    def __encode(vectors: np.ndarray, metadata: list[str], start_id: int, start: int, end: int) -> list:
+        """
+        Encode a batch of the embeddings column-based in the order of the fields of the collection schema.
 
-        data = [{self.__id_name: start_id + i,
-                 self.__metadata_name: metadata[i],
-                 self.__vector_name: v} for i, v in enumerate(embeddings)]
+        :param vectors: The embeddings to insert as a float32 matrix.
+        :param metadata: List of metadata strings to insert.
+        :param start_id: Index of the first inserted vector.
+        :param start: Index of the first embedding of the batch.
+        :param end: Index after the last embedding of the batch.
+        :return: A list with the ids, the metadata and a float32 matrix of the vectors of the batch, which is a view of
+            ``vectors``.
+        """
+        return [list(range(start_id + start, start_id + end)),
+                metadata[start:end],
+                vectors[start:end]]
 
-        return data
+    def set_batch_size(self, batch_size: int) -> None:
+        self.__batch_size = batch_size
+
+    def flush(self) -> None:
+        """
+        Seal the growing segments and persist them. Milvus builds the index only for sealed segments.
+        """
+        self.__collection.flush()
 
     def create_index(self) -> None:
         index_param: dict = self.__index_config.index_param()
         log.info(f"Creating index {self.__index_config.index_param()}")
         self.__collection.create_index(self.__vector_name, index_param, index_name=self.__index_name)
-        utility.wait_for_index_building_complete(self.__collection_name, self.__index_name)
-        progress = utility.index_building_progress(self.__collection_name, self.__index_name)
-        print(f"[Milvus] Create index {progress} for collection {self.__collection_name} successfully!!!")
+        if self.__mmap:
+            # Available since pymilvus 2.4 (see https://milvus.io/docs/mmap.md)
+            self.__collection.alter_index(self.__index_name, {"mmap.enabled": True})
+        if self.__scalar_index is not ScalarIndexType.NONE:
+            log.info(f"Creating {self.__scalar_index.value} index on {self.__metadata_name}")
+            self.__collection.create_index(self.__metadata_name, {"index_type": self.__scalar_index.value},
+                                           index_name=self.__scalar_index_name)
+
+    def index_progress(self) -> float:
+        """
+        Get the progress of the index creation. Milvus builds the index asynchronously for every sealed segment, so the
+        index may still be building after :meth:`create_index` or :meth:`insert` returned.
+
+        :return: The fraction of indexed rows. 1 if no rows are pending for the index creation.
+        """
+        progress: dict = utility.index_building_progress(self.__collection_name, self.__index_name,
+                                                         using=self.__alias)
+        total_rows = progress["total_rows"]
+        indexed_rows = progress["indexed_rows"]
+        # Segments that are too small are never indexed, but they are not pending either
+        if total_rows == 0 or progress.get("pending_index_rows", total_rows - indexed_rows) == 0:
+            return 1.0
+        return indexed_rows / total_rows
+
+    def drop_index(self) -> None:
+        """
+        Drop the indexes of the collection. The collection is released from memory first, because Milvus does not
+        allow dropping the index of a loaded collection.
+        """
+        for index_name in (self.__index_name, self.__scalar_index_name):
+            if self.__collection.has_index(index_name=index_name):
+                log.info(f"Dropping index {index_name}")
+                self.__collection.release()
+                self.__loaded = False
+                self.__collection.drop_index(index_name=index_name)
 
     def disk_storage(self):
         """
@@ -130,21 +305,20 @@ class MilvusClient(BaseClient):
 
     def index_storage(self):
         """
-        Get the theoretical storage used by the index in the database.
+        Get the theoretical storage used by the index in the database. The memory of the loaded segments, which also
+        holds the raw vectors and the scalar fields, is reported by :meth:`storage_breakdown`.
 
         :return: Theoretical index storage used in MB.
         """
-        # Description of the theoretical index storage calculation:
-        # https://github.com/milvus-io/milvus/discussions/24894
         nd = self.__collection.num_entities
-        m = self.__index_config.index_param()["params"]["M"]
-        return bytes_to_mb(nd * self.__dimension * 4 + nd * m * 8)  # 4 bytes per float32, 8 bytes per int64
+        return bytes_to_mb(_theoretical_index_size(self.__index_config.index_param(), nd, self.__dimension))
 
     def load(self) -> None:
         """
         Load the collection into memory. This is necessary to perform queries on the collection.
         """
         self.__collection.load()
+        self.__loaded = True
 
     def query(self, query: list[float], k: int) -> list[int]:
         log.info(f"Query {k} vectors. Query: {query}")
@@ -153,7 +327,21 @@ class MilvusClient(BaseClient):
                                                      limit=k)
         return [result.id for result in res[0]]
 
+    def batch_query(self, queries: list[list[float]], k: int) -> list[list[int]]:
+        """
+        Send all queries with one search request.
+        """
+        log.info(f"Query {k} vectors for {len(queries)} queries")
+        search_param: dict = self.__index_config.search_param()
+        res: SearchResult = self.__collection.search(data=queries, anns_field=self.__vector_name, param=search_param,
+                                                     limit=k)
+        return [[result.id for result in hits] for hits in res]
+
     def filtered_query(self, query: list[float], k: int, keyword_filter: str) -> list[int]:
+        """
+        Search with an equality filter on the metadata. If the metadata is the partition key, Milvus only searches the
+        partition the filter value is hashed to.
+        """
         log.info(f"Query {k} vectors with keyword_filter {keyword_filter}. Query: {query}")
         search_param: dict = self.__index_config.search_param()
         expr = f'{self.__metadata_name} == "{keyword_filter}"'
@@ -162,6 +350,48 @@ class MilvusClient(BaseClient):
         return [result.id for result in res[0]]
 
     def ranged_query(self, query: list[float], k: int, distance: float) -> list[int]:
+        """
+        Range search (see https://milvus.io/docs/single-vector-search.md#Range-search). The distance is the outer bound
+        ``radius`` and the ``range_filter`` of the database configuration the inner bound.
+        """
         log.info(f"Query {k} vectors with distance {distance}. Query: {query}")
-        # TODO implement
-        # https://milvus.io/docs/single-vector-search.md#Range-search
+        search_param: dict = self.__index_config.search_param()
+        metric_type: str = search_param["metric_type"]
+        params: dict = {**search_param["params"], "radius": _range_bound(metric_type, distance)}
+        if self.__range_filter is not None:
+            params["range_filter"] = _range_bound(metric_type, self.__range_filter)
+        res: SearchResult = self.__collection.search(data=[query], anns_field=self.__vector_name,
+                                                     param={**search_param, "params": params}, limit=k)
+        return [result.id for result in res[0]]
+
+    def ping(self) -> None:
+        utility.get_server_version(using=self.__alias)
+
+    def query_engine_time(self, query: list[float], k: int) -> Optional[float]:
+        """
+        Run the query and read the search latency measured by the proxy from the Prometheus metrics of the server
+        before and after it. The engine time is only correct if no other search runs at the same time.
+        """
+        before = _search_latency_sum(self.__metrics_uri)
+        self.query(query, k)
+        after = _search_latency_sum(self.__metrics_uri)
+        return (after - before) / 1000
+
+    def query_plan(self, query: list[float], k: int, keyword_filter: Optional[str] = None) -> Optional[str]:
+        """
+        Not implemented! The Milvus server does not expose the plan of a search.
+        """
+        return None
+
+    def storage_breakdown(self, vacuum: bool = False) -> Optional[dict[str, float]]:
+        """
+        Get the memory of every loaded segment reported by the query nodes. With ``vacuum``, the segments are compacted
+        first to remove deleted entries. None if the collection is not loaded.
+        """
+        if vacuum:
+            self.__collection.compact()
+            self.__collection.wait_for_compaction_completed()
+        if not self.__loaded:
+            return None
+        segments = utility.get_query_segment_info(self.__collection_name, using=self.__alias)
+        return {f"segment_{segment.segmentID}": bytes_to_mb(segment.mem_size) for segment in segments}
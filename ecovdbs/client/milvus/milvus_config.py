@@ -1,6 +1,8 @@
 from dataclasses import dataclass
+from typing import Optional
 
-from ..base_config import BaseConfig, BaseIndexConfig, IndexType, MetricType, BaseHNSWConfig
+from ..base_config import BaseConfig, BaseIndexConfig, IndexType, MetricType, BaseHNSWConfig, ScalarIndexType, \
+    ConsistencyLevel
 
 
 @dataclass(frozen=True)
@@ -10,10 +12,30 @@ class MilvusConfig(BaseConfig):
 
     Attributes:
         connection_uri: The connection URI for the Milvus server. Defaults to "http://localhost:19530".
+        metrics_uri: The URI of the Prometheus metrics of the Milvus server. Defaults to
+            "http://localhost:9091/metrics".
         container_name: The name of the database container server. Defaults to "milvus-standalone". Use "milvus-minio"
             for docker-compose.
+        range_filter: The inner bound of range searches. Results closer to the query than this distance are excluded.
+            Defaults to None (no inner bound).
+        partition_key: Whether the metadata field is the partition key of the collection. Filtered searches then
+            only search the partition of the filter value. Defaults to False.
+        num_partitions: The number of partitions the metadata values are hashed to if the metadata field is the
+            partition key. Defaults to 16.
+        scalar_index: The index of the metadata field (see :class:`ScalarIndexType`). Defaults to no index.
+        consistency_level: The consistency level of the searches (see :class:`ConsistencyLevel`). Defaults to
+            bounded staleness, the default of Milvus.
+        mmap: Whether the fields and the vector index of the loaded collection are memory-mapped files instead of
+            being read into the memory of the query nodes. Defaults to False.
     """
     connection_uri: str = "http://localhost:19530"
+    metrics_uri: str = "http://localhost:9091/metrics"
+    range_filter: Optional[float] = None
+    partition_key: bool = False
+    num_partitions: int = 16
+    scalar_index: ScalarIndexType = ScalarIndexType.NONE
+    consistency_level: ConsistencyLevel = ConsistencyLevel.BOUNDED
+    mmap: bool = False
     container_name = "milvus-standalone"
 
 
@@ -45,9 +67,10 @@ class MilvusAutoIndexConfig(BaseIndexConfig):
         }
 
 
-class MilvusFlatConfig(BaseIndexConfig):
+class MilvusFlatConfig(BaseHNSWConfig):
     """
-    Configuration class for Flat type index in Milvus.
+    Configuration class for Flat type index in Milvus. The search is exhaustive, so it has no search parameter to
+    sweep.
     """
 
     def __init__(self, metric_type: MetricType):
@@ -72,10 +95,29 @@ class MilvusFlatConfig(BaseIndexConfig):
             "params": {},
         }
 
+    def change_ef_search(self, ef: int) -> None:
+        """
+        Not implemented! The exhaustive search has no search parameter.
+        """
+        return None
+
+    def change_build_param(self, M: int, ef_construction: int) -> None:
+        """
+        Not implemented! The index has no graph.
+        """
+        raise NotImplementedError
 
-class MilvusIVFFlatIndex(BaseIndexConfig):
+    def change_build_threads(self, threads: int) -> None:
+        """
+        Not implemented! Milvus sizes the build thread pool of the index node by the number of CPU cores of the server,
+        it can not be set per index.
+        """
+        raise NotImplementedError
+
+
+class MilvusIVFFlatIndex(BaseHNSWConfig):
     """
-    Configuration class for IVF_FLAT type index in Milvus.
+    Configuration class for IVF_FLAT type index in Milvus. The search parameter swept by the runner is ``nprobe``.
     """
 
     def __init__(self, metric_type: MetricType, nlist: int = 128, nprobe: int = 8):
@@ -106,10 +148,32 @@ class MilvusIVFFlatIndex(BaseIndexConfig):
             "params": {"nprobe": self.__nprobe},
         }
 
+    def change_ef_search(self, ef: int) -> None:
+        """
+        Change the number of units to query.
+
+        :param ef: The number of units to query (``nprobe``).
+        """
+        assert 0 < ef <= self.__nlist
+        self.__nprobe = ef
+
+    def change_build_param(self, M: int, ef_construction: int) -> None:
+        """
+        Not implemented! The index has no graph.
+        """
+        raise NotImplementedError
+
+    def change_build_threads(self, threads: int) -> None:
+        """
+        Not implemented! Milvus sizes the build thread pool of the index node by the number of CPU cores of the server,
+        it can not be set per index.
+        """
+        raise NotImplementedError
+
 
-class MilvusIVFSQ8Index(BaseIndexConfig):
+class MilvusIVFSQ8Index(BaseHNSWConfig):
     """
-    Configuration class for IVF_SQ8 type index in Milvus.
+    Configuration class for IVF_SQ8 type index in Milvus. The search parameter swept by the runner is ``nprobe``.
     """
 
     def __init__(self, metric_type: MetricType, nlist: int, nprobe: int = 8):
@@ -140,10 +204,32 @@ class MilvusIVFSQ8Index(BaseIndexConfig):
             "params": {"nprobe": self.__nprobe},
         }
 
+    def change_ef_search(self, ef: int) -> None:
+        """
+        Change the number of units to query.
+
+        :param ef: The number of units to query (``nprobe``).
+        """
+        assert 0 < ef <= self.__nlist
+        self.__nprobe = ef
+
+    def change_build_param(self, M: int, ef_construction: int) -> None:
+        """
+        Not implemented! The index has no graph.
+        """
+        raise NotImplementedError
+
+    def change_build_threads(self, threads: int) -> None:
+        """
+        Not implemented! Milvus sizes the build thread pool of the index node by the number of CPU cores of the server,
+        it can not be set per index.
+        """
+        raise NotImplementedError
+
 
-class MilvusIVFPQIndex(BaseIndexConfig):
+class MilvusIVFPQIndex(BaseHNSWConfig):
     """
-    Configuration class for IVF_PQ type index in Milvus.
+    Configuration class for IVF_PQ type index in Milvus. The search parameter swept by the runner is ``nprobe``.
     """
 
     def __init__(self, metric_type: MetricType, nlist: int, m: int, nbits: int = 8, nprobe: int = 8):
@@ -179,10 +265,32 @@ class MilvusIVFPQIndex(BaseIndexConfig):
             "params": {"nprobe": self.__nprobe},
         }
 
+    def change_ef_search(self, ef: int) -> None:
+        """
+        Change the number of units to query.
+
+        :param ef: The number of units to query (``nprobe``).
+        """
+        assert 0 < ef <= self.__nlist
+        self.__nprobe = ef
 
-class MilvusSCANNIndex(BaseIndexConfig):
+    def change_build_param(self, M: int, ef_construction: int) -> None:
+        """
+        Not implemented! The index has no graph.
+        """
+        raise NotImplementedError
+
+    def change_build_threads(self, threads: int) -> None:
+        """
+        Not implemented! Milvus sizes the build thread pool of the index node by the number of CPU cores of the server,
+        it can not be set per index.
+        """
+        raise NotImplementedError
+
+
+class MilvusSCANNIndex(BaseHNSWConfig):
     """
-    Configuration class for SCANN type index in Milvus.
+    Configuration class for SCANN type index in Milvus. The search parameter swept by the runner is ``reorder_k``.
     """
 
     def __init__(self, metric_type: MetricType, nlist: int, nprobe: int, reorder_k: int, with_raw_data: bool = True):
@@ -194,7 +302,7 @@ class MilvusSCANNIndex(BaseIndexConfig):
         :param reorder_k: Number of candidate units to query.
         :param with_raw_data: Whether to include the raw data in the index.
         """
-        self.__index_type: IndexType = IndexType.IVFPQ
+        self.__index_type: IndexType = IndexType.SCANN
         self.__metric_type: MetricType = metric_type
 
         assert 0 < nlist <= 65536
@@ -217,6 +325,28 @@ class MilvusSCANNIndex(BaseIndexConfig):
             "params": {"nprobe": self.__nprobe, "reorder_k": self.__reorder_k},
         }
 
+    def change_ef_search(self, ef: int) -> None:
+        """
+        Change the number of candidates that are re-ranked with the raw data.
+
+        :param ef: The number of candidates (``reorder_k``). It must be at least ``k``.
+        """
+        assert ef > 0
+        self.__reorder_k = ef
+
+    def change_build_param(self, M: int, ef_construction: int) -> None:
+        """
+        Not implemented! The index has no graph.
+        """
+        raise NotImplementedError
+
+    def change_build_threads(self, threads: int) -> None:
+        """
+        Not implemented! Milvus sizes the build thread pool of the index node by the number of CPU cores of the server,
+        it can not be set per index.
+        """
+        raise NotImplementedError
+
 
 class MilvusHNSWConfig(BaseHNSWConfig):
     """
@@ -258,3 +388,16 @@ class MilvusHNSWConfig(BaseHNSWConfig):
 
     def change_ef_search(self, ef: int) -> None:
         self.__ef = ef
+
+    def change_build_param(self, M: int, ef_construction: int) -> None:
+        assert 2 <= M <= 2048
+        self.__M = M
+        assert ef_construction > 0
+        self.__efConstruction = ef_construction
+
+    def change_build_threads(self, threads: int) -> None:
+        """
+        Not implemented! Milvus sizes the build thread pool of the index node by the number of CPU cores of the server,
+        it can not be set per index.
+        """
+        raise NotImplementedError
@@ -1,18 +1,103 @@
 import logging
+import struct
+import time
 import tqdm
+from copy import copy
 from typing import Optional
 
+import docker
+import numpy as np
 import psycopg
 from pgvector.psycopg import register_vector
 from psycopg import Connection, sql, Cursor
+from psycopg_pool import ConnectionPool, PoolTimeout
 
-from .pgvector_config import PgvectorConfig
+from .pgvector_config import PgvectorConfig, HNSW_MAX_EF_SEARCH
 from ..base_client import BaseClient
-from ..base_config import BaseIndexConfig
-from ..utility import bytes_to_mb
+from ..base_config import BaseIndexConfig, FilterStrategy, CacheMode
+from ..utility import bytes_to_mb, pipelined_insert, batch_ranges, read_batch_size
 
 log = logging.getLogger(__name__)
 
+# Header and trailer of the binary COPY format (see https://www.postgresql.org/docs/current/sql-copy.html)
+_COPY_HEADER = b"PGCOPY\n\xff\r\n\0" + struct.pack("!ii", 0, 0)
+_COPY_TRAILER = struct.pack("!h", -1)
+# Default of hnsw.ef_search if the index configuration does not set it
+_HNSW_DEFAULT_EF_SEARCH = 40
+
+
+def _ef_search(configured: int, candidates: int) -> int:
+    """
+    Get the value of ``hnsw.ef_search`` for a query whose index scan has to return a number of candidates.
+
+    :param configured: The configured value of ``hnsw.ef_search``.
+    :param candidates: The number of candidates or 0 if the query does not need more than ``k`` rows.
+    :return: The larger of both values, at most :data:`HNSW_MAX_EF_SEARCH`.
+    """
+    return min(max(configured, candidates), HNSW_MAX_EF_SEARCH)
+
+
+def _copy_row_dtype(dimension: int) -> np.dtype:
+    """
+    Get the layout of a row ``(id, vector, metadata)`` in the binary COPY format without the bytes of the metadata.
+    The binary format of pgvector is the dimension, an unused int16 and the big-endian float32 values.
+
+    :param dimension: The dimension of the vectors.
+    :return: A packed structured dtype of the field count, the id, the vector and the length of the metadata.
+    """
+    return np.dtype([("fields", ">i2"), ("id_length", ">i4"), ("id", ">i8"), ("vector_length", ">i4"),
+                     ("dimension", ">i2"), ("unused", ">i2"), ("vector", ">f4", (dimension,)),
+                     ("metadata_length", ">i4")])
+
+
+def _encode_copy_block(vectors: np.ndarray, metadata: list[str], start_id: int, start: int, end: int) -> bytes:
+    """
+    Encode a block of rows ``(id, vector, metadata)`` in the binary COPY format. The header and the trailer of the COPY
+    stream are not included. The rows are built as one structured array, the metadata bytes are scattered behind their
+    rows with a mask, so no row is encoded in Python.
+
+    :param vectors: The embeddings to insert as a big-endian float32 array.
+    :param metadata: List of metadata strings to insert.
+    :param start_id: Index of the first inserted vector.
+    :param start: Index of the first embedding of the block.
+    :param end: Index after the last embedding of the block.
+    :return: The encoded rows.
+    """
+    num_rows, dimension = end - start, vectors.shape[1]
+    rows = np.empty(num_rows, dtype=_copy_row_dtype(dimension))
+    rows["fields"] = 3
+    rows["id_length"] = 8
+    rows["id"] = np.arange(start_id + start, start_id + end)
+    rows["vector_length"] = 4 + 4 * dimension
+    rows["dimension"] = dimension
+    rows["unused"] = 0
+    rows["vector"] = vectors[start:end]
+    encoded = [md.encode("utf-8") for md in metadata[start:end]]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=num_rows)
+    rows["metadata_length"] = lengths
+    if not lengths.any():
+        return rows.tobytes()
+    # The metadata of row i starts after the fixed part of rows 0 to i and the metadata of rows 0 to i - 1
+    row_size = rows.dtype.itemsize
+    metadata_positions = np.repeat(np.arange(1, num_rows + 1) * row_size, lengths) + np.arange(lengths.sum())
+    block = np.empty(num_rows * row_size + lengths.sum(), dtype=np.uint8)
+    is_metadata = np.zeros(len(block), dtype=bool)
+    is_metadata[metadata_positions] = True
+    block[~is_metadata] = rows.view(np.uint8)
+    block[is_metadata] = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return block.tobytes()
+
+
+def _configure_connection(conn: Connection) -> None:
+    """
+    Configure a new connection of the connection pool. The vector type is registered for the binary transfer of numpy
+    arrays and the transaction of the type lookup is committed, so that the connection is idle.
+
+    :param conn: The new connection.
+    """
+    register_vector(conn)
+    conn.commit()
+
 
 class PgvectorClient(BaseClient):
     """
@@ -32,23 +117,34 @@ class PgvectorClient(BaseClient):
         """
         self.__dimension: int = dimension
         self.__index_config: BaseIndexConfig = index_config
-        self.__search_param = self.__index_config.search_param()
+        # The search parameters are set before the first query
+        self.__search_param: Optional[dict] = None
+        # The value of hnsw.ef_search set on the connection, raised for queries that need more candidates
+        self.__ef_search: Optional[int] = None
         self.__table_name = "ecovdbs"
         self.__index_name = "idx:ecovdbs"
         self.__id_name = "id"
         self.__metadata_name = "metadata"
         self.__vector_name = "vector"
+        # Number of rows encoded into one block of the COPY stream
+        self.__batch_size = read_batch_size(type(self).__name__, dimension) or 10_000
+        self.__db_config: PgvectorConfig = db_config
+        # Filter values with a partial index and the strategies chosen for the filter values
+        self.__partial_filters: list[str] = []
+        self.__filter_strategies: dict[str, FilterStrategy] = {}
 
-        # Establish connection to PostgreSQL database
-        self.__conn: Connection = psycopg.connect(
-            f"host={db_config.host} port={db_config.port} dbname={db_config.dbname} user={db_config.user} password={db_config.password}")
-
-        # Ensure the vector extension is available
-        self.__conn.execute("CREATE EXTENSION IF NOT EXISTS vector")
-        self.__conn.commit()
+        # Ensure the vector extension is available before the pool registers the vector type on its connections
+        with psycopg.connect(self.__conninfo(), autocommit=True) as conn:
+            conn.execute("CREATE EXTENSION IF NOT EXISTS vector")
+            if db_config.cache_mode == CacheMode.WARM:
+                conn.execute("CREATE EXTENSION IF NOT EXISTS pg_prewarm")
 
-        # Register the vector type for use in PostgreSQL
-        register_vector(self.__conn)
+        # The client and its forks take their connections from one pool
+        self.__pool: ConnectionPool = ConnectionPool(self.__conninfo(), min_size=1,
+                                                     max_size=db_config.max_connections,
+                                                     configure=_configure_connection, open=True)
+        self.__owns_pool: bool = True
+        self.__conn: Connection = self.__pool.getconn()
 
         # Drop the existing table and index if they exist
         drop_table = sql.SQL("DROP TABLE IF EXISTS {table_name};").format(table_name=sql.Identifier(self.__table_name))
@@ -61,39 +157,364 @@ class PgvectorClient(BaseClient):
 
         # Create a new table with a vector column of the specified dimension
         create_table = (sql.SQL(
-            "CREATE TABLE IF NOT EXISTS {table_name} ({id_name} bigserial PRIMARY KEY, {vector_name} vector({dimension}), {metadata_name} text);").format(
+            "CREATE {unlogged} TABLE IF NOT EXISTS {table_name} ({id_name} bigserial PRIMARY KEY, {vector_name} vector({dimension}), {metadata_name} text);").format(
+            unlogged=sql.SQL("UNLOGGED" if db_config.unlogged else ""),
             table_name=sql.Identifier(self.__table_name), id_name=sql.Identifier(self.__id_name),
             vector_name=sql.Identifier(self.__vector_name), dimension=dimension,
             metadata_name=sql.Identifier(self.__metadata_name)))
         self.__conn.execute(create_table)
         self.__conn.commit()
+        # Position of the write-ahead log after the creation of the table
+        self.__wal_start: str = self.__conn.execute("SELECT pg_current_wal_lsn()::text").fetchone()[0]
+        self.__conn.commit()
+        self.__prepare_statements()
         log.info("Pgvector client initialized")
 
+    def __prepare_statements(self) -> None:
+        """
+        Compose the statements of the query modes once. They are prepared on the server at their first execution on a
+        connection and their parameters are sent in the binary format (``%b``), the vectors as numpy arrays. If the
+        index is quantized, the index returns ``k * rerank_factor`` candidates ordered by the quantized distance and
+        the candidates are re-ranked with the full vectors (see :meth:`__query_params`).
+        """
+        search_param = self.__index_config.search_param()
+        operator = sql.SQL(search_param["metric_operator"])
+        table_name = sql.Identifier(self.__table_name)
+        id_name = sql.Identifier(self.__id_name)
+        vector_name = sql.Identifier(self.__vector_name)
+        metadata_name = sql.Identifier(self.__metadata_name)
+        self.__rerank_factor: Optional[int] = None
+        if search_param["quantization"] != "none":
+            self.__rerank_factor = search_param["rerank_factor"]
+        self.__hnsw: bool = self.__index_config.index_param()["index_type"] == "hnsw"
+
+        def knn_select(where: sql.Composable) -> str:
+            if self.__rerank_factor is None:
+                return sql.SQL(
+                    "SELECT {id_name} FROM {table_name}{where} ORDER BY {vector_name} {operator} %b::vector "
+                    "LIMIT %b::int").format(
+                    id_name=id_name, table_name=table_name, where=where, vector_name=vector_name,
+                    operator=operator).as_string(self.__conn)
+            # The ORDER BY expression of the candidates must match the expression of the index
+            return sql.SQL(
+                "SELECT {id_name} FROM (SELECT {id_name}, {vector_name} FROM {table_name}{where} ORDER BY "
+                "{indexed_vector} {quantized_operator} {quantized_query} LIMIT %b::int) AS candidates "
+                "ORDER BY {vector_name} {operator} %b::vector LIMIT %b::int").format(
+                id_name=id_name, vector_name=vector_name, table_name=table_name, where=where,
+                indexed_vector=self.__indexed_vector(), quantized_operator=sql.SQL(search_param["quantized_operator"]),
+                quantized_query=self.__quantized_query(), operator=operator).as_string(self.__conn)
+
+        self.__query_select: str = knn_select(sql.Composed(()))
+        self.__filtered_select: str = knn_select(sql.SQL(" WHERE {metadata_name} = %b").format(
+            metadata_name=metadata_name))
+        self.__filter_strategy = FilterStrategy[search_param["filter_strategy"].upper()]
+        self.__filter_factor: int = search_param["filter_factor"]
+        # The materialized rows cannot be ordered with the vector index, so all distances are computed
+        self.__pre_filtered_select: str = sql.SQL(
+            "WITH filtered AS MATERIALIZED (SELECT {id_name}, {vector_name} FROM {table_name} WHERE {metadata_name} "
+            "= %b) SELECT {id_name} FROM filtered ORDER BY {vector_name} {operator} %b::vector LIMIT %b::int").format(
+            id_name=id_name, vector_name=vector_name, table_name=table_name, metadata_name=metadata_name,
+            operator=operator).as_string(self.__conn)
+        self.__post_filtered_select: str = sql.SQL(
+            "SELECT {id_name} FROM (SELECT {id_name}, {vector_name}, {metadata_name} FROM {table_name} ORDER BY "
+            "{indexed_vector} {quantized_operator} {quantized_query} LIMIT %b::int) AS candidates WHERE "
+            "{metadata_name} = %b ORDER BY {vector_name} {operator} %b::vector LIMIT %b::int").format(
+            id_name=id_name, vector_name=vector_name, metadata_name=metadata_name, table_name=table_name,
+            indexed_vector=self.__indexed_vector(), quantized_operator=sql.SQL(search_param["quantized_operator"]),
+            quantized_query=self.__quantized_query(), operator=operator).as_string(self.__conn)
+        # TODO umrechnen distanz für andere Metriken außer L2 IP((embedding <#> '[3,1,2]') * -1), Cosine (1 -
+        #  (embedding <=> '[3,1,2]'))
+        # The distance of ranged queries is always the distance of the full vectors
+        self.__ranged_select: str = sql.SQL(
+            "SELECT {id_name} FROM {table_name} WHERE {vector_name} {operator} %b::vector < %b::float8 "
+            "ORDER BY {vector_name} {operator} %b::vector LIMIT %b::int").format(
+            id_name=id_name, table_name=table_name, vector_name=vector_name, operator=operator).as_string(self.__conn)
+
+    def __indexed_vector(self) -> sql.Composable:
+        """
+        Get the expression of the indexed vectors: the vector column, its cast to ``halfvec`` or its
+        ``binary_quantize`` bit vector.
+
+        :return: The expression in parentheses or the column.
+        """
+        vector_name = sql.Identifier(self.__vector_name)
+        quantization = self.__index_config.index_param()["quantization"]
+        if quantization == "halfvec":
+            return sql.SQL("({vector_name}::halfvec({dimension}))").format(vector_name=vector_name,
+                                                                          dimension=sql.Literal(self.__dimension))
+        if quantization == "binary":
+            return sql.SQL("(binary_quantize({vector_name})::bit({dimension}))").format(
+                vector_name=vector_name, dimension=sql.Literal(self.__dimension))
+        return vector_name
+
+    def __quantized_query(self) -> sql.Composable:
+        """
+        Get the expression of the query vector parameter in the representation of the index.
+
+        :return: The expression of the parameter.
+        """
+        quantization = self.__index_config.index_param()["quantization"]
+        if quantization == "halfvec":
+            return sql.SQL("%b::vector::halfvec({dimension})").format(dimension=sql.Literal(self.__dimension))
+        if quantization == "binary":
+            return sql.SQL("binary_quantize(%b::vector)")
+        return sql.SQL("%b::vector")
+
+    def __query_params(self, query: list[float], k: int, *filters) -> tuple:
+        """
+        Get the parameters of :attr:`__query_select` or :attr:`__filtered_select`.
+
+        :param query: The query vector.
+        :param k: The number of results.
+        :param filters: The parameters of the WHERE clause.
+        :return: The filters, the vector and ``k``. If the candidates are re-ranked, the vector and the number of
+            candidates before them.
+        """
+        vector = np.asarray(query, dtype=np.float32)
+        if self.__rerank_factor is None:
+            return *filters, vector, k
+        return *filters, vector, k * self.__rerank_factor, vector, k
+
+    def __post_filter_candidates(self, k: int) -> int:
+        """
+        Get the number of candidates of the vector index filtered by the post-filter strategy.
+
+        :param k: The number of results.
+        :return: ``k * filter_factor``, times the ``rerank_factor`` if the candidates are re-ranked.
+        """
+        return k * self.__filter_factor * (self.__rerank_factor or 1)
+
+    def __choose_filter_strategy(self, keyword_filter: str, k: int) -> FilterStrategy:
+        """
+        Choose the strategy of a filtered query (see :func:`_filter_param`). The strategy chosen automatically for a
+        filter value is cached. The post-filter strategy is not chosen automatically if the HNSW index scan cannot
+        return its candidates (see :data:`HNSW_MAX_EF_SEARCH`).
+
+        :param keyword_filter: The filter value.
+        :param k: The number of results.
+        :return: The strategy for the filter value.
+        """
+        if self.__filter_strategy != FilterStrategy.AUTO:
+            return self.__filter_strategy
+        if keyword_filter not in self.__filter_strategies:
+            if keyword_filter in self.__partial_filters:
+                strategy = FilterStrategy.PARTIAL_INDEX
+            elif self.__hnsw and self.__post_filter_candidates(k) > HNSW_MAX_EF_SEARCH:
+                strategy = FilterStrategy.PRE_FILTER
+            elif self.__selectivity(keyword_filter) * self.__filter_factor < 1:
+                strategy = FilterStrategy.PRE_FILTER
+            else:
+                strategy = FilterStrategy.POST_FILTER
+            log.info(f"Filter {keyword_filter} uses strategy {strategy.name}")
+            self.__filter_strategies[keyword_filter] = strategy
+        return self.__filter_strategies[keyword_filter]
+
+    def __selectivity(self, keyword_filter: str) -> float:
+        """
+        Estimate the fraction of rows matching a filter value with the statistics of the planner. The table is
+        analyzed if it has no statistics.
+
+        :param keyword_filter: The filter value.
+        :return: The estimated fraction of matching rows.
+        """
+        reltuples_query = sql.SQL("SELECT reltuples FROM pg_class WHERE oid = {table_name}::regclass").format(
+            table_name=sql.Literal(self.__table_name))
+        rows = self.__conn.execute(reltuples_query).fetchone()[0]
+        if rows <= 0:
+            self.__conn.execute(sql.SQL("ANALYZE {table_name}").format(table_name=sql.Identifier(self.__table_name)))
+            rows = self.__conn.execute(reltuples_query).fetchone()[0]
+        explain = sql.SQL("EXPLAIN (FORMAT JSON) SELECT 1 FROM {table_name} WHERE {metadata_name} = %s").format(
+            table_name=sql.Identifier(self.__table_name), metadata_name=sql.Identifier(self.__metadata_name))
+        plan = self.__conn.execute(explain, (keyword_filter,)).fetchone()[0][0]
+        self.__conn.commit()
+        return plan["Plan"]["Plan Rows"] / rows if rows > 0 else 1.0
+
+    def __filtered_statement(self, query: list[float], k: int, keyword_filter: str) -> tuple[str, tuple]:
+        """
+        Get the statement and the parameters of a filtered query with the strategy chosen for the filter value.
+
+        :param query: The query vector.
+        :param k: The number of results.
+        :param keyword_filter: The filter value.
+        :return: The statement and its parameters.
+        """
+        strategy = self.__choose_filter_strategy(keyword_filter, k)
+        vector = np.asarray(query, dtype=np.float32)
+        if strategy == FilterStrategy.PRE_FILTER:
+            self.__raise_ef_search(0)
+            return self.__pre_filtered_select, (keyword_filter, vector, k)
+        if strategy == FilterStrategy.POST_FILTER:
+            candidates = self.__post_filter_candidates(k)
+            self.__raise_ef_search(candidates)
+            if self.__hnsw:
+                # The index scan returns at most the capped hnsw.ef_search rows, so the LIMIT is capped as well
+                candidates = min(candidates, HNSW_MAX_EF_SEARCH)
+            return self.__post_filtered_select, (vector, candidates, keyword_filter, vector, k)
+        self.__raise_ef_search(k * self.__rerank_factor if self.__rerank_factor is not None else 0)
+        return self.__filtered_select, self.__query_params(query, k, keyword_filter)
+
+    def __raise_ef_search(self, candidates: int) -> None:
+        """
+        Set ``hnsw.ef_search`` to at least the number of candidates the index scan of the next query has to return.
+        The HNSW index scan returns at most ``hnsw.ef_search`` rows, so the candidates of the re-ranking and of the
+        post-filter strategy would be capped silently. Without candidates, the configured value is set again. The value
+        is capped to :data:`HNSW_MAX_EF_SEARCH` (see :func:`_ef_search`).
+
+        :param candidates: The number of candidates or 0 if the query does not need more than ``k`` rows.
+        """
+        if not self.__hnsw:
+            return
+        ef_search = _ef_search(self.__search_param["set"].get("hnsw.ef_search", _HNSW_DEFAULT_EF_SEARCH), candidates)
+        if ef_search != self.__ef_search:
+            log.info(f"Set hnsw.ef_search to {ef_search} for {candidates} candidates")
+            if candidates > ef_search:
+                log.warning(f"The index scan returns at most {ef_search} of {candidates} candidates, because "
+                            f"hnsw.ef_search is capped to {HNSW_MAX_EF_SEARCH}")
+            self.__set_param({"hnsw.ef_search": ef_search})
+            self.__ef_search = ef_search
+
+    def __conninfo(self) -> str:
+        """
+        Get the connection string for the database.
+
+        :return: The connection string built from the database configuration.
+        """
+        return (f"host={self.__db_config.host} port={self.__db_config.port} dbname={self.__db_config.dbname} "
+                f"user={self.__db_config.user} password={self.__db_config.password}")
+
+    def fork(self) -> "PgvectorClient":
+        """
+        Create a fork with its own connection of the pool. If the client and its forks hold all connections of the
+        pool, the pool grows by one connection, so that it is sized from the number of forks plus one.
+
+        :raises RuntimeError: If the server does not accept another connection in time, e.g. because its
+            ``max_connections`` is reached.
+        """
+        stats = self.__pool.get_stats()
+        in_use = stats["pool_size"] - stats["pool_available"]
+        if in_use >= self.__pool.max_size:
+            self.__pool.resize(self.__pool.min_size, in_use + 1)
+        clone = copy(self)
+        try:
+            clone.__conn = self.__pool.getconn()
+        except PoolTimeout as e:
+            raise RuntimeError(f"No connection for a fork with {in_use} connections in use. The server setting "
+                               f"max_connections may be lower than the number of forks plus one") from e
+        clone.__owns_pool = False
+        # The search parameters are set per connection, so they have to be set again before the first query
+        clone.__search_param = None
+        return clone
+
+    def close(self) -> None:
+        """
+        Return the connection to the pool. The pool is closed with the client that created it.
+        """
+        self.__pool.putconn(self.__conn)
+        if self.__owns_pool:
+            self.__pool.close()
+
     def insert(self, embeddings: list[list[float]], metadata: Optional[list[str]] = None, start_id: int = 0) -> None:
         log.info(f"Inserting {len(embeddings)} vectors into database")
         if not metadata or len(metadata) != len(embeddings):
             metadata = ["" for _ in range(len(embeddings))]
+        vectors = np.asarray(embeddings, dtype=">f4")
         cur: Cursor = self.__conn.cursor()
-        with cur.copy(
-                sql.SQL(
-                    "COPY {table_name} ({id_name}, {vector_name}, {metadata_name}) FROM STDIN (FORMAT BINARY)").format(
-                    table_name=sql.Identifier(self.__table_name), id_name=sql.Identifier(self.__id_name),
-                    vector_name=sql.Identifier(self.__vector_name),
-                    metadata_name=sql.Identifier(self.__metadata_name))) as copy:
-            copy.set_types(["bigint", "vector", "text"])
-            for i, embedding in tqdm.tqdm(enumerate(embeddings)):
-                copy.write_row((i + start_id, embedding, metadata[i]))
+        with cur.copy(self.__copy_statement()) as copy:
+            copy.write(_COPY_HEADER)
+            # The next block of the COPY stream is encoded while the previous one is sent
+            pipelined_insert(tqdm.tqdm(batch_ranges(len(embeddings), self.__batch_size)),
+                             lambda r: _encode_copy_block(vectors, metadata, start_id, r[0], r[1]),
+                             copy.write)
+            copy.write(_COPY_TRAILER)
         self.__conn.commit()
 
     def batch_insert(self, embeddings: list[list[float]], metadata: Optional[list[str]] = None,
                      start_id: int = 0) -> None:
         """
-        Not implemented.
+        Insert embeddings into the database with one ``COPY`` statement and one transaction per batch. In contrast to
+        :meth:`insert`, which streams all embeddings in one ``COPY`` statement, already committed batches are kept if
+        a later batch fails.
+        """
+        log.info(f"Inserting {len(embeddings)} vectors into database in batches")
+        if not metadata or len(metadata) != len(embeddings):
+            metadata = ["" for _ in range(len(embeddings))]
+        vectors = np.asarray(embeddings, dtype=">f4")
+        # The next batch is encoded while the previous one is copied
+        pipelined_insert(tqdm.tqdm(batch_ranges(len(embeddings), self.__batch_size)),
+                         lambda r: _encode_copy_block(vectors, metadata, start_id, r[0], r[1]),
+                         self.__copy_batch)
+
+    def upsert(self, embeddings: list[list[float]], ids: list[int], metadata: Optional[list[str]] = None) -> None:
+        """
+        Insert or update the rows with ``INSERT ... ON CONFLICT DO UPDATE`` and one transaction per batch. Updated rows
+        leave dead tuples in the table and the index until the next vacuum.
+        """
+        log.info(f"Upserting {len(embeddings)} vectors into database")
+        if not metadata or len(metadata) != len(embeddings):
+            metadata = ["" for _ in range(len(embeddings))]
+        upsert = sql.SQL(
+            "INSERT INTO {table_name} ({id_name}, {vector_name}, {metadata_name}) VALUES (%s, %s, %s) "
+            "ON CONFLICT ({id_name}) DO UPDATE SET {vector_name} = EXCLUDED.{vector_name}, "
+            "{metadata_name} = EXCLUDED.{metadata_name}").format(
+            table_name=sql.Identifier(self.__table_name), id_name=sql.Identifier(self.__id_name),
+            vector_name=sql.Identifier(self.__vector_name), metadata_name=sql.Identifier(self.__metadata_name))
+        for start, end in batch_ranges(len(embeddings), self.__batch_size):
+            vectors = np.asarray(embeddings[start:end], dtype=np.float32)
+            with self.__conn.cursor() as cur:
+                cur.executemany(upsert, [(ids[i], vector, metadata[i]) for i, vector in zip(range(start, end),
+                                                                                            vectors)])
+            self.__conn.commit()
+
+    def delete(self, ids: list[int]) -> None:
+        """
+        Delete the rows with one transaction per batch. The deleted rows leave dead tuples in the table and the index
+        until the next vacuum.
+        """
+        log.info(f"Deleting {len(ids)} vectors from database")
+        delete = sql.SQL("DELETE FROM {table_name} WHERE {id_name} = ANY(%s)").format(
+            table_name=sql.Identifier(self.__table_name), id_name=sql.Identifier(self.__id_name))
+        for start, end in batch_ranges(len(ids), self.__batch_size):
+            self.__conn.execute(delete, (ids[start:end],))
+            self.__conn.commit()
+
+    def __copy_statement(self) -> sql.Composed:
+        """
+        Get the ``COPY`` statement for inserting rows in the binary format.
+
+        :return: The composed ``COPY`` statement.
+        """
+        return sql.SQL(
+            "COPY {table_name} ({id_name}, {vector_name}, {metadata_name}) FROM STDIN (FORMAT BINARY)").format(
+            table_name=sql.Identifier(self.__table_name), id_name=sql.Identifier(self.__id_name),
+            vector_name=sql.Identifier(self.__vector_name), metadata_name=sql.Identifier(self.__metadata_name))
+
+    def __copy_batch(self, block: bytes) -> None:
         """
-        # TODO implement
-        pass
+        Insert an encoded block of rows with its own ``COPY`` statement and commit it.
+
+        :param block: The rows encoded in the binary COPY format without header and trailer.
+        """
+        with self.__conn.cursor().copy(self.__copy_statement()) as copy:
+            copy.write(_COPY_HEADER)
+            copy.write(block)
+            copy.write(_COPY_TRAILER)
+        self.__conn.commit()
+
+    def set_batch_size(self, batch_size: int) -> None:
+        self.__batch_size = batch_size
+
+    def flush(self) -> None:
+        """
+        Not implemented! The data is committed by :meth:`insert`.
+        """
+        return None
 
     def create_index(self) -> None:
+        """
+        Create the vector index. Depending on the filter strategy, a btree index on the metadata and partial vector
+        indexes for the most frequent filter values are created as well. The partial indexes are only created for the
+        values in the table, so they need the data to be inserted before the index is created.
+        """
         index_param = self.__index_config.index_param()
         log.info(f"Creating index {self.__index_config.index_param()}")
         self.__set_param(index_param["set"])
@@ -101,17 +522,87 @@ class PgvectorClient(BaseClient):
         if index_param["with"]:
             for k, v in index_param["with"].items():
                 opt.append(sql.SQL("{key} = {val}").format(key=sql.Identifier(k), val=sql.Literal(v)))
-            with_clause = sql.SQL(" WITH ({});").format(sql.SQL(", ").join(opt))
+            with_clause = sql.SQL(" WITH ({})").format(sql.SQL(", ").join(opt))
         else:
             with_clause = sql.Composed(())
-        index_clause = sql.SQL(
+        self.__conn.execute(self.__index_clause(self.__index_name, index_param) + with_clause)
+        self.__conn.commit()
+        if index_param["metadata_index"]:
+            metadata_index = sql.SQL("CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} ({metadata_name})").format(
+                index_name=sql.Identifier(f"{self.__index_name}:metadata"),
+                table_name=sql.Identifier(self.__table_name), metadata_name=sql.Identifier(self.__metadata_name))
+            self.__conn.execute(metadata_index)
+            self.__conn.commit()
+        if index_param["partial_indexes"]:
+            frequent_values = sql.SQL(
+                "SELECT {metadata_name} FROM {table_name} WHERE {metadata_name} IS NOT NULL GROUP BY {metadata_name} "
+                "ORDER BY count(*) DESC LIMIT {limit}").format(
+                metadata_name=sql.Identifier(self.__metadata_name), table_name=sql.Identifier(self.__table_name),
+                limit=sql.Literal(index_param["partial_indexes"]))
+            self.__partial_filters = [row[0] for row in self.__conn.execute(frequent_values).fetchall()]
+            if not self.__partial_filters:
+                log.warning("No partial indexes created because the table is empty")
+            for i, value in enumerate(self.__partial_filters):
+                where_clause = sql.SQL(" WHERE {metadata_name} = {value}").format(
+                    metadata_name=sql.Identifier(self.__metadata_name), value=sql.Literal(value))
+                self.__conn.execute(self.__index_clause(f"{self.__index_name}:{i}", index_param) + with_clause +
+                                    where_clause)
+                self.__conn.commit()
+        self.__filter_strategies = {}
+
+    def __index_clause(self, index_name: str, index_param: dict) -> sql.Composed:
+        """
+        Compose the ``CREATE INDEX`` statement of a vector index without its ``WITH`` and ``WHERE`` clauses.
+
+        :param index_name: The name of the index.
+        :param index_param: The index parameters.
+        :return: The composed statement.
+        """
+        return sql.SQL(
             "CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} USING {index_type} ({vector_name} {metric_type})").format(
-            index_name=sql.Identifier(self.__index_name), table_name=sql.Identifier(self.__table_name),
-            index_type=sql.Identifier(index_param["index_type"]), vector_name=sql.Identifier(self.__vector_name),
+            index_name=sql.Identifier(index_name), table_name=sql.Identifier(self.__table_name),
+            index_type=sql.Identifier(index_param["index_type"]), vector_name=self.__indexed_vector(),
             metric_type=sql.Identifier(index_param["metric_type"]))
-        index_with_with = (index_clause + with_clause)
-        self.__conn.execute(index_with_with)
+
+    def index_progress(self) -> float:
+        """
+        Get the progress of the index creation from ``pg_stat_progress_create_index``. ``CREATE INDEX`` blocks until
+        the index is built, therefore the progress is only below 1 while another connection is creating the index.
+
+        :return: The fraction of the tuples or blocks processed by the running index creation, 1 if no index creation
+            is running.
+        """
+        progress_query = sql.SQL(
+            "SELECT tuples_done, tuples_total, blocks_done, blocks_total FROM pg_stat_progress_create_index "
+            "WHERE relid = {table_name}::regclass").format(table_name=sql.Literal(self.__table_name))
+        row = self.__conn.execute(progress_query).fetchone()
+        # The statistics are cached until the end of the transaction
+        self.__conn.commit()
+        if row is None:
+            return 1.0
+        tuples_done, tuples_total, blocks_done, blocks_total = row
+        if tuples_total:
+            return tuples_done / tuples_total
+        if blocks_total:
+            return blocks_done / blocks_total
+        return 0.0
+
+    def drop_index(self) -> None:
+        log.info(f"Dropping index {self.__index_name}")
+        for index_name in self.__vector_index_names():
+            drop_index = sql.SQL("DROP INDEX IF EXISTS {index_name};").format(index_name=sql.Identifier(index_name))
+            self.__conn.execute(drop_index)
         self.__conn.commit()
+        self.__partial_filters = []
+        self.__filter_strategies = {}
+
+    def __vector_index_names(self) -> list[str]:
+        """
+        Get the names of the vector index and the partial vector indexes.
+
+        :return: The names of the indexes.
+        """
+        return [self.__index_name] + [f"{self.__index_name}:{i}" for i in range(len(self.__partial_filters))]
 
     def __set_param(self, param):
         """
@@ -140,16 +631,87 @@ class PgvectorClient(BaseClient):
         return bytes_to_mb(res.fetchall()[0][0])
 
     def index_storage(self) -> float:
-        database_size_query = sql.SQL("SELECT pg_relation_size({index_name})").format(
-            index_name=sql.Literal(self.__index_name))
+        """
+        Get the storage of the vector index, including the partial vector indexes.
+
+        :return: Index storage in MB.
+        """
+        database_size_query = sql.SQL("SELECT {sizes}").format(sizes=sql.SQL(" + ").join(
+            sql.SQL("pg_relation_size({index_name})").format(index_name=sql.Literal(index_name))
+            for index_name in self.__vector_index_names()))
         res = self.__conn.execute(database_size_query)
         return bytes_to_mb(res.fetchall()[0][0])
 
     def load(self) -> None:
         """
-        Not implemented! No need in Pgvector.
+        Set the caches to the cache mode of the database configuration. With warm caches, the table, its TOAST table,
+        where large vectors are stored, and the vector indexes are loaded into the shared buffers with ``pg_prewarm``.
+        With cold caches, the container is restarted, which empties the shared buffers, and the page cache of the
+        kernel is dropped. Dropping the page cache needs a privileged ``docker exec`` and affects the whole host.
+        Without a cache mode, nothing is done. The runner loads the data before the queries of every ef value, so
+        with cold caches the queries of every ef value start from empty caches. With cold caches, no fork may be open,
+        so forks have to be created after loading.
+
+        :raises RuntimeError: If forks are open or if the page cache could not be dropped with cold caches.
         """
-        return None
+        if self.__db_config.cache_mode == CacheMode.WARM:
+            self.__prewarm()
+        elif self.__db_config.cache_mode == CacheMode.COLD:
+            self.__restart()
+
+    def __prewarm(self) -> None:
+        """
+        Load the table, its TOAST table and the vector indexes into the shared buffers.
+        """
+        relations = [sql.Literal(self.__table_name)] + [sql.Literal(name) for name in self.__vector_index_names()]
+        prewarm = sql.SQL("SELECT {blocks}").format(blocks=sql.SQL(" + ").join(
+            sql.SQL("pg_prewarm({relation})").format(relation=relation) for relation in relations))
+        blocks = self.__conn.execute(prewarm).fetchone()[0]
+        toast_prewarm = sql.SQL(
+            "SELECT pg_prewarm(reltoastrelid) FROM pg_class WHERE oid = {table_name}::regclass AND reltoastrelid <> 0"
+        ).format(table_name=sql.Literal(self.__table_name))
+        toast_blocks = self.__conn.execute(toast_prewarm).fetchone()
+        self.__conn.commit()
+        log.info(f"Prewarmed {blocks + (toast_blocks[0] if toast_blocks else 0)} blocks")
+
+    def __restart(self, timeout: float = 120) -> None:
+        """
+        Restart the database container, drop the page cache and replace the connection of the client. The restart
+        would break the connections of forks, so no fork may be open.
+
+        :param timeout: The maximum time in seconds to wait for the database to accept connections again.
+        :raises RuntimeError: If forks hold connections of the pool or if the page cache could not be dropped, e.g.
+            because ``/proc/sys`` is mounted read-only in the container. The queries would otherwise run against a
+            warm page cache.
+        """
+        stats = self.__pool.get_stats()
+        # The connection of this client is the only one in use
+        if stats["pool_size"] - stats["pool_available"] > 1:
+            raise RuntimeError("Cold caches need a restart of the database, which would break the connections of the "
+                               "open forks. Close the forks before loading and fork again afterwards")
+        log.info(f"Restarting container {self.__db_config.container_name}")
+        container = docker.from_env().containers.get(self.__db_config.container_name)
+        # A shutdown that is killed after the timeout empties unlogged tables
+        container.restart(timeout=60)
+        exit_code, output = container.exec_run(["sh", "-c", "sync && echo 3 > /proc/sys/vm/drop_caches"],
+                                               privileged=True)
+        if exit_code != 0:
+            raise RuntimeError(f"Dropping the page cache failed: {output.decode(errors='replace').strip()}")
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                psycopg.connect(self.__conninfo()).close()
+                break
+            except psycopg.OperationalError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.5)
+        # The connections of the pool were closed by the restart
+        self.__conn.close()
+        self.__pool.putconn(self.__conn)
+        self.__pool.check()
+        self.__conn = self.__pool.getconn()
+        self.__search_param = None
 
     def __pre_query(self) -> None:
         """
@@ -160,54 +722,114 @@ class PgvectorClient(BaseClient):
         if search_param != self.__search_param:
             self.__search_param = search_param
             self.__set_param(search_param["set"])
+            self.__ef_search = search_param["set"].get("hnsw.ef_search")
 
     def query(self, query: list[float], k: int) -> list[int]:
         log.info(f"Query {k} vectors. Query: {query}")
         self.__pre_query()
-        select = sql.Composed([
-            sql.SQL(
-                "SELECT {id_name} FROM {table_name} ORDER BY {vector_name} ").format(
-                id_name=sql.Identifier(self.__id_name), table_name=sql.Identifier(self.__table_name),
-                vector_name=sql.Identifier(self.__vector_name)),
-            sql.SQL(self.__search_param["metric_operator"]),
-            sql.SQL(" %s::vector LIMIT %s::int")
-        ])
-        res = self.__conn.execute(select, (query, k))
+        self.__raise_ef_search(k * self.__rerank_factor if self.__rerank_factor is not None else 0)
+        res = self.__conn.execute(self.__query_select, self.__query_params(query, k), prepare=True, binary=True)
         return [int(r[0]) for r in res.fetchall()]
 
+    def batch_query(self, queries: list[list[float]], k: int) -> list[list[int]]:
+        """
+        Send all queries in pipeline mode, so that the next query is sent before the result of the previous one is
+        received.
+        """
+        log.info(f"Query {k} vectors for {len(queries)} queries")
+        self.__pre_query()
+        self.__raise_ef_search(k * self.__rerank_factor if self.__rerank_factor is not None else 0)
+        with self.__conn.pipeline():
+            cursors = [self.__conn.execute(self.__query_select, self.__query_params(vector, k), prepare=True,
+                                           binary=True)
+                       for vector in np.asarray(queries, dtype=np.float32)]
+        return [[int(r[0]) for r in cursor.fetchall()] for cursor in cursors]
+
     def filtered_query(self, query: list[float], k: int, keyword_filter: str) -> list[int]:
+        """
+        Query with the filter strategy of the index configuration (see :func:`_filter_param`).
+        """
         log.info(f"Query {k} vectors with keyword_filter {keyword_filter}. Query: {query}")
         self.__pre_query()
-        select = sql.Composed([
-            sql.SQL(
-                "SELECT {id_name} FROM {table_name} WHERE {metadata_name} = {keyword_filter} ORDER BY {vector_name} ").format(
-                id_name=sql.Identifier(self.__id_name), table_name=sql.Identifier(self.__table_name),
-                metadata_name=sql.Identifier(self.__metadata_name), keyword_filter=sql.Literal(keyword_filter),
-                vector_name=sql.Identifier(self.__vector_name)),
-            sql.SQL(self.__search_param["metric_operator"]),
-            sql.SQL(" %s::vector LIMIT %s::int")
-        ])
-        # print(self.__conn.execute(sql.SQL("explain analyze ") + select, (query, k)).fetchall()) Post filtern:
-        # Reihenfolge der Bearbeitung anders als erwartet. Es werden nicht alle Dateien mit WHERE sortiert und
-        # limitiert, sondern alle sortierten limitierten mit where zurückgegeben
-        res = self.__conn.execute(select, (query, k))
+        statement, params = self.__filtered_statement(query, k, keyword_filter)
+        res = self.__conn.execute(statement, params, prepare=True, binary=True)
         return [int(r[0]) for r in res.fetchall()]
 
     def ranged_query(self, query: list[float], k: int, distance: float) -> list[int]:
         log.info(f"Query {k} vectors with distance {distance}. Query: {query}")
         self.__pre_query()
-        select = sql.Composed([
-            sql.SQL(
-                # TODO umrechnen distanz für andere Metriken außer L2 IP((embedding <#> '[3,1,2]') * -1), Cosine (1 -
-                #  (embedding <=> '[3,1,2]'))
-                "SELECT {id_name} FROM {table_name} WHERE {vector_name} ").format(
-                id_name=sql.Identifier(self.__id_name), table_name=sql.Identifier(self.__table_name),
-                vector_name=sql.Identifier(self.__vector_name)),
-            sql.SQL(self.__search_param["metric_operator"]),
-            sql.SQL(" %s::vector < %s::int ORDER BY {vector_name} ").format(
-                vector_name=sql.Identifier(self.__vector_name)),
-            sql.SQL(self.__search_param["metric_operator"]),
-            sql.SQL(" %s::vector LIMIT %s::int")
-        ])
-        res = self.__conn.execute(select, (query, distance, query, k))
+        vector = np.asarray(query, dtype=np.float32)
+        res = self.__conn.execute(self.__ranged_select, (vector, distance, vector, k), prepare=True, binary=True)
         return [int(r[0]) for r in res.fetchall()]
+
+    def ping(self) -> None:
+        self.__conn.execute("SELECT 1").fetchone()
+
+    def query_engine_time(self, query: list[float], k: int) -> Optional[float]:
+        """
+        Run the query with ``EXPLAIN (ANALYZE, BUFFERS)``. The engine time is the planning time plus the execution time
+        reported by the server.
+        """
+        self.__pre_query()
+        self.__raise_ef_search(k * self.__rerank_factor if self.__rerank_factor is not None else 0)
+        explain = "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + self.__query_select
+        plan = self.__conn.execute(explain, self.__query_params(query, k)).fetchone()[0][0]
+        return (plan["Planning Time"] + plan["Execution Time"]) / 1000
+
+    def query_plan(self, query: list[float], k: int, keyword_filter: Optional[str] = None) -> Optional[str]:
+        """
+        Get the plan of the query from ``EXPLAIN``. The plan of a filtered query starts with the chosen strategy and
+        the plan of a query on an HNSW index with the value of ``hnsw.ef_search`` used by the query.
+        """
+        self.__pre_query()
+        if keyword_filter is None:
+            self.__raise_ef_search(k * self.__rerank_factor if self.__rerank_factor is not None else 0)
+            statement, params = self.__query_select, self.__query_params(query, k)
+        else:
+            statement, params = self.__filtered_statement(query, k, keyword_filter)
+        plan = "\n".join(row[0] for row in self.__conn.execute("EXPLAIN " + statement, params).fetchall())
+        self.__conn.commit()
+        if self.__hnsw:
+            plan = f"ef_search: {self.__ef_search}\n{plan}"
+        if keyword_filter is None:
+            return plan
+        return f"Strategy: {self.__choose_filter_strategy(keyword_filter, k).name.lower()}\n{plan}"
+
+    def storage_breakdown(self, vacuum: bool = False) -> Optional[dict[str, float]]:
+        """
+        Split the storage of the table into the heap (``heap``), the free space map (``fsm``), the visibility map
+        (``vm``), the TOAST table with its index (``toast``), where vectors above about 2 kB are stored, the vector
+        indexes (``vector_index``) and the other indexes (``other_indexes``). ``wal`` is the write-ahead log written by
+        the server since the table was created.
+        """
+        if vacuum:
+            # VACUUM cannot run inside a transaction
+            self.__conn.commit()
+            self.__conn.autocommit = True
+            try:
+                self.__conn.execute(sql.SQL("VACUUM {table_name}").format(
+                    table_name=sql.Identifier(self.__table_name)))
+            finally:
+                self.__conn.autocommit = False
+        breakdown_query = sql.SQL(
+            "SELECT pg_relation_size(oid, 'main'), pg_relation_size(oid, 'fsm'), pg_relation_size(oid, 'vm'), "
+            "CASE WHEN reltoastrelid = 0 THEN 0 ELSE pg_total_relation_size(reltoastrelid) END, pg_indexes_size(oid), "
+            "{vector_index_size}, pg_wal_lsn_diff(pg_current_wal_lsn(), {wal_start}::pg_lsn) "
+            "FROM pg_class WHERE oid = {table_name}::regclass").format(
+            # The vector index does not exist before it is created
+            vector_index_size=sql.SQL(" + ").join(
+                sql.SQL("COALESCE(pg_relation_size(to_regclass({index_name})), 0)").format(
+                    index_name=sql.Literal(index_name))
+                for index_name in self.__vector_index_names()),
+            wal_start=sql.Literal(self.__wal_start), table_name=sql.Literal(self.__table_name))
+        heap, fsm, vm, toast, indexes, vector_index, wal = self.__conn.execute(breakdown_query).fetchone()
+        self.__conn.commit()
+        return {
+            "heap": bytes_to_mb(heap),
+            "fsm": bytes_to_mb(fsm),
+            "vm": bytes_to_mb(vm),
+            "toast": bytes_to_mb(toast),
+            "vector_index": bytes_to_mb(vector_index),
+            "other_indexes": bytes_to_mb(indexes - vector_index),
+            "wal": bytes_to_mb(float(wal))
+        }
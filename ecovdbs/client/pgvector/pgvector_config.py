@@ -1,8 +1,11 @@
 from dataclasses import dataclass
 from typing import Optional
 
-from ..base_config import BaseConfig, BaseIndexConfig, MetricType, IndexType, BaseHNSWConfig
+from ..base_config import BaseConfig, BaseIndexConfig, MetricType, IndexType, BaseHNSWConfig, Quantization, \
+    FilterStrategy, CacheMode
 
+# Maximum of hnsw.ef_search accepted by pgvector. The HNSW index scan returns at most hnsw.ef_search rows
+HNSW_MAX_EF_SEARCH = 1000
 
 @dataclass(frozen=True)
 class PgvectorConfig(BaseConfig):
@@ -15,12 +18,24 @@ class PgvectorConfig(BaseConfig):
         dbname: The database name. Defaults to "postgres".
         user: The username for the database. Defaults to "postgres".
         password: The password for the database. Defaults to "pwd".
+        max_connections: The initial maximum number of connections of the connection pool shared by the client and
+            its forks. The pool grows if more forks are created (see :meth:`PgvectorClient.fork`). Defaults to 64.
+        unlogged: Create the table ``UNLOGGED``. No write-ahead log is written for the table, which speeds up the
+            insertion, but the table is emptied after a crash of the server. Defaults to False.
+        cache_mode: The state of the caches set by :meth:`PgvectorClient.load` before the queries. Defaults to
+            leaving the caches as they are.
+        container_name: The name of the Docker container of the database, which is restarted for cold caches.
+            Defaults to "pgvector".
     """
     host: str = "localhost"
     port: int = 5432
     dbname: str = "postgres"
     user: str = "postgres"
     password: str = "pwd"
+    max_connections: int = 64
+    unlogged: bool = False
+    cache_mode: CacheMode = CacheMode.NONE
+    container_name: str = "pgvector"
 
 
 class PgvectorHNSWConfig(BaseHNSWConfig):
@@ -32,7 +47,10 @@ class PgvectorHNSWConfig(BaseHNSWConfig):
 
     def __init__(self, metric_type: MetricType, m: Optional[int] = None, ef_construction: Optional[int] = None,
                  ef_search: Optional[int] = None, maintenance_work_mem: Optional[str] = None,
-                 max_parallel_maintenance_workers: Optional[int] = None):
+                 max_parallel_maintenance_workers: Optional[int] = None,
+                 quantization: Quantization = Quantization.NONE, rerank_factor: int = 4,
+                 filter_strategy: FilterStrategy = FilterStrategy.INDEX, filter_factor: int = 10,
+                 partial_indexes: int = 10):
         """
         Initialize the PgvectorHNSWConfig with specified parameters.
 
@@ -45,6 +63,15 @@ class PgvectorHNSWConfig(BaseHNSWConfig):
         :param maintenance_work_mem:  Memory to use for maintenance work. Indexes build significantly faster when
             the graph fits into maintenance_work_mem
         :param max_parallel_maintenance_workers: The maximum number of parallel maintenance workers.
+        :param quantization: The representation of the vectors in the index (see :func:`_quantization_param`).
+        :param rerank_factor: The number of candidates per result that are re-ranked with the full vectors if the
+            index is quantized. The client raises ``hnsw.ef_search`` to at least ``k * rerank_factor``, at most to
+            :data:`HNSW_MAX_EF_SEARCH`.
+        :param filter_strategy: The execution of filtered queries (see :func:`_filter_param`).
+        :param filter_factor: The number of candidates per result of the post-filter strategy.
+            The client raises ``hnsw.ef_search`` to at least ``k * filter_factor``, times ``rerank_factor`` for a
+            quantized index, at most to :data:`HNSW_MAX_EF_SEARCH`, which also caps the candidates.
+        :param partial_indexes: The number of filter values with a partial index of the partial index strategy.
         """
         self.__index_type: IndexType = IndexType.HNSW
         self.__metric_type = metric_type
@@ -53,20 +80,28 @@ class PgvectorHNSWConfig(BaseHNSWConfig):
         self.__ef_search: Optional[int] = ef_search
         self.__maintenance_work_mem: Optional[str] = maintenance_work_mem
         self.__max_parallel_maintenance_workers: Optional[int] = max_parallel_maintenance_workers
+        self.__quantization: Quantization = quantization
+        self.__rerank_factor: int = rerank_factor
+        self.__filter_strategy: FilterStrategy = filter_strategy
+        self.__filter_factor: int = filter_factor
+        self.__partial_indexes: int = partial_indexes
 
     def index_param(self) -> dict:
         """
-        Generate the index parameters dictionary. The directory contains the keys ``index_type`` and ``metric_type``
-        for the corresponding type. The keys ``with`` and ``set`` contain an empty directory but may contain further
-        keys. ``with`` may contain the keys ``m`` and ``ef_construction`` if the value is different from the default
-        value of the database. ``set`` may contain the keys ``maintenance_work_mem``
-        and ``max_parallel_maintenance_workers``.
+        Generate the index parameters dictionary. The directory contains the keys ``index_type``, ``metric_type``,
+        ``quantization``, ``partial_indexes`` and ``metadata_index`` (see :func:`_partial_index_param`) for the
+        corresponding type. The keys ``with`` and ``set`` contain an empty directory but may contain further keys.
+        ``with`` may contain the keys ``m`` and ``ef_construction`` if the value is different from the default value
+        of the database. ``set`` may contain the keys ``maintenance_work_mem`` and
+        ``max_parallel_maintenance_workers``.
 
         :return: A dictionary of index parameters.
         """
         param = {
             "index_type": self.__index_type.value.lower(),
-            "metric_type": _distance_metric[self.__metric_type],
+            "metric_type": _operator_class(self.__metric_type, self.__quantization),
+            "quantization": self.__quantization.value.lower(),
+            **_partial_index_param(self.__filter_strategy, self.__partial_indexes),
             "with": {},
             "set": {}
         }
@@ -82,15 +117,18 @@ class PgvectorHNSWConfig(BaseHNSWConfig):
 
     def search_param(self) -> dict:
         """
-        Generate the search parameters dictionary. The directory contains the keys ``metric_operator`` for the operator
-        and ``set`` as an empty dictionary. ``set`` may contain the key ``hnsw.ef_search`` if the value is different
-        from the default.
+        Generate the search parameters dictionary. The directory contains the keys ``metric_operator`` for the operator,
+        the keys of :func:`_quantization_param` and :func:`_filter_param` and ``set`` as a dictionary (see
+        :func:`_filter_set_param`). ``set`` may contain the key
+        ``hnsw.ef_search`` if the value is different from the default.
 
         :return: A dictionary of search parameters.
         """
         param = {
             "metric_operator": _metric_operator[self.__metric_type],
-            "set": {}
+            **_quantization_param(self.__metric_type, self.__quantization, self.__rerank_factor),
+            **_filter_param(self.__filter_strategy, self.__filter_factor),
+            "set": _filter_set_param(self.__filter_strategy)
         }
         if self.__ef_search is not None:
             param["set"]["hnsw.ef_search"] = self.__ef_search
@@ -99,6 +137,24 @@ class PgvectorHNSWConfig(BaseHNSWConfig):
     def change_ef_search(self, ef: int) -> None:
         self.__ef_search = ef
 
+    def change_build_param(self, M: int, ef_construction: int) -> None:
+        # Limits of pgvector: m in [2, 100], ef_construction in [4, 1000] and at least 2 * m
+        assert 2 <= M <= 100
+        self.__m = M
+        assert 4 <= ef_construction <= 1000 and ef_construction >= 2 * M
+        self.__ef_construction = ef_construction
+
+    def change_build_threads(self, threads: int) -> None:
+        """
+        Change the number of processes building the index. The leader process builds the index together with
+        ``threads - 1`` parallel maintenance workers. The number of workers is further limited by the server setting
+        ``max_worker_processes`` (default 8).
+
+        :param threads: The number of processes building the index.
+        """
+        assert threads > 0
+        self.__max_parallel_maintenance_workers = threads - 1
+
 
 class PgvectorIVFFlatConfig(BaseIndexConfig):
     """
@@ -113,7 +169,10 @@ class PgvectorIVFFlatConfig(BaseIndexConfig):
     """
 
     def __init__(self, metric_type: MetricType, lists: int, probes: Optional[int] = None,
-                 max_parallel_maintenance_workers: Optional[int] = None):
+                 max_parallel_maintenance_workers: Optional[int] = None,
+                 quantization: Quantization = Quantization.NONE, rerank_factor: int = 4,
+                 filter_strategy: FilterStrategy = FilterStrategy.INDEX, filter_factor: int = 10,
+                 partial_indexes: int = 10):
         """
         Initialize the PgvectorIVFFlatConfig with specified parameters. For more details
         see :class:`PgvectorIVFFlatConfig`.
@@ -122,25 +181,39 @@ class PgvectorIVFFlatConfig(BaseIndexConfig):
         :param lists: The number of lists for the IVF-Flat index.
         :param probes: The number of probes for the IVF-Flat index.
         :param max_parallel_maintenance_workers: The maximum number of parallel maintenance workers.
+        :param quantization: The representation of the vectors in the index (see :func:`_quantization_param`).
+        :param rerank_factor: The number of candidates per result that are re-ranked with the full vectors if the
+            index is quantized.
+        :param filter_strategy: The execution of filtered queries (see :func:`_filter_param`).
+        :param filter_factor: The number of candidates per result of the post-filter strategy.
+        :param partial_indexes: The number of filter values with a partial index of the partial index strategy.
         """
-        self.__index_type: IndexType = IndexType.HNSW
+        self.__index_type: IndexType = IndexType.IVFFlat
         self.__metric_type = metric_type
         self.__lists: int = lists
         self.__probes: Optional[int] = probes
         self.__max_parallel_maintenance_workers: Optional[int] = max_parallel_maintenance_workers
+        self.__quantization: Quantization = quantization
+        self.__rerank_factor: int = rerank_factor
+        self.__filter_strategy: FilterStrategy = filter_strategy
+        self.__filter_factor: int = filter_factor
+        self.__partial_indexes: int = partial_indexes
 
     def index_param(self) -> dict:
         """
-        Generate the index parameters dictionary. The directory contains the keys ``index_type`` and ``metric_type``
-        for the corresponding type. The key ``with`` contains a directory with the key ``lists``. The key ``set``
-         contains an empty directory but may contain the key ``max_parallel_maintenance_workers`` if the value is
-        different from the default value of the database.
+        Generate the index parameters dictionary. The directory contains the keys ``index_type``, ``metric_type``,
+        ``quantization``, ``partial_indexes`` and ``metadata_index`` (see :func:`_partial_index_param`) for the
+        corresponding type. The key ``with`` contains a directory with the key ``lists``. The key ``set`` contains an
+        empty directory but may contain the key ``max_parallel_maintenance_workers`` if the value is different from
+        the default value of the database.
 
         :return: A dictionary of index parameters.
         """
         param = {
             "index_type": self.__index_type.value.lower().replace("_", ""),
-            "metric_type": _distance_metric[self.__metric_type],
+            "metric_type": _operator_class(self.__metric_type, self.__quantization),
+            "quantization": self.__quantization.value.lower(),
+            **_partial_index_param(self.__filter_strategy, self.__partial_indexes),
             "with": {
                 "lists": self.__lists
             },
@@ -152,15 +225,18 @@ class PgvectorIVFFlatConfig(BaseIndexConfig):
 
     def search_param(self) -> dict:
         """
-        Generate the search parameters dictionary. The directory contains the keys ``metric_operator`` for the operator
-        and ``set`` as an empty dictionary. ``set`` may contain the key ``ivfflat.probes`` if the value is different
-        from the default.
+        Generate the search parameters dictionary. The directory contains the keys ``metric_operator`` for the operator,
+        the keys of :func:`_quantization_param` and :func:`_filter_param` and ``set`` as a dictionary (see
+        :func:`_filter_set_param`). ``set`` may contain the key
+        ``ivfflat.probes`` if the value is different from the default.
 
         :return: A dictionary of search parameters.
         """
         param = {
             "metric_operator": _metric_operator[self.__metric_type],
-            "set": {}
+            **_quantization_param(self.__metric_type, self.__quantization, self.__rerank_factor),
+            **_filter_param(self.__filter_strategy, self.__filter_factor),
+            "set": _filter_set_param(self.__filter_strategy)
         }
         if self.__probes is not None:
             param["set"]["ivfflat.probes"] = self.__probes
@@ -180,3 +256,102 @@ _metric_operator = {
     MetricType.IP: "<#>",
     MetricType.COSINE: "<=>"
 }
+
+# Mapping of MetricType to pgvector distance metric of half precision vectors
+_halfvec_distance_metric = {
+    MetricType.L2: "halfvec_l2_ops",
+    MetricType.IP: "halfvec_ip_ops",
+    MetricType.COSINE: "halfvec_cosine_ops"
+}
+
+
+def _operator_class(metric_type: MetricType, quantization: Quantization) -> str:
+    """
+    Get the operator class of the index. Binary vectors are always compared with the Hamming distance.
+
+    :param metric_type: The metric type for distance calculation.
+    :param quantization: The representation of the vectors in the index.
+    :return: The name of the operator class.
+    """
+    if quantization == Quantization.HALFVEC:
+        return _halfvec_distance_metric[metric_type]
+    if quantization == Quantization.BINARY:
+        return "bit_hamming_ops"
+    return _distance_metric[metric_type]
+
+
+def _quantization_param(metric_type: MetricType, quantization: Quantization, rerank_factor: int) -> dict:
+    """
+    Generate the search parameters of a quantized index. With ``halfvec``, the index is built over the vectors cast to
+    half precision (up to 4000 dimensions). With ``binary``, it is built over ``binary_quantize`` of the vectors, one
+    bit per dimension, and compared with the Hamming distance. The index of a quantized vector returns
+    ``k * rerank_factor`` candidates, which are re-ranked with the full vectors.
+
+    :param metric_type: The metric type for distance calculation.
+    :param quantization: The representation of the vectors in the index.
+    :param rerank_factor: The number of candidates per result.
+    :return: A dictionary with the keys ``quantization``, ``quantized_operator`` for the operator of the index and
+        ``rerank_factor``.
+    """
+    assert rerank_factor > 0
+    return {
+        "quantization": quantization.value.lower(),
+        "quantized_operator": "<~>" if quantization == Quantization.BINARY else _metric_operator[metric_type],
+        "rerank_factor": rerank_factor
+    }
+
+
+def _filter_param(filter_strategy: FilterStrategy, filter_factor: int) -> dict:
+    """
+    Generate the search parameters of filtered queries. The strategies are:
+
+    - ``index``: The vector index is scanned and its results are filtered. If few rows match the filter, the index scan
+      ends with fewer than ``k`` results.
+    - ``pre_filter``: The rows matching the filter are read with a btree index on the metadata and their distances are
+      computed exactly.
+    - ``post_filter``: The vector index returns ``k * filter_factor`` candidates, which are filtered. An HNSW index
+      returns at most :data:`HNSW_MAX_EF_SEARCH` candidates.
+    - ``partial_index``: The most frequent filter values have their own partial vector index. Other values use the
+      ``index`` strategy.
+    - ``auto``: A value with a partial index uses it. Otherwise, ``pre_filter`` is used if the planner estimates that
+      fewer than one of ``filter_factor`` rows match or if an HNSW index cannot return the candidates of
+      ``post_filter``, and ``post_filter`` for more frequent values.
+
+    :param filter_strategy: The execution of filtered queries.
+    :param filter_factor: The number of candidates per result of the post-filter strategy.
+    :return: A dictionary with the keys ``filter_strategy`` and ``filter_factor``.
+    """
+    assert filter_factor > 0
+    return {
+        "filter_strategy": filter_strategy.value.lower(),
+        "filter_factor": filter_factor
+    }
+
+
+def _filter_set_param(filter_strategy: FilterStrategy) -> dict:
+    """
+    Generate the settings of filtered queries. A generic plan of a prepared statement does not know the filter value
+    and cannot use a partial index, so every execution is planned with its parameters if partial indexes are used.
+
+    :param filter_strategy: The execution of filtered queries.
+    :return: A dictionary that may contain the key ``plan_cache_mode``.
+    """
+    if filter_strategy in (FilterStrategy.PARTIAL_INDEX, FilterStrategy.AUTO):
+        return {"plan_cache_mode": "force_custom_plan"}
+    return {}
+
+
+def _partial_index_param(filter_strategy: FilterStrategy, partial_indexes: int) -> dict:
+    """
+    Generate the index parameters of filtered queries.
+
+    :param filter_strategy: The execution of filtered queries.
+    :param partial_indexes: The number of filter values with a partial index.
+    :return: A dictionary with the keys ``partial_indexes``, 0 if the strategy uses no partial indexes, and
+        ``metadata_index``, whether a btree index on the metadata is created.
+    """
+    uses_partial_indexes = filter_strategy in (FilterStrategy.PARTIAL_INDEX, FilterStrategy.AUTO)
+    return {
+        "partial_indexes": partial_indexes if uses_partial_indexes else 0,
+        "metadata_index": filter_strategy in (FilterStrategy.PRE_FILTER, FilterStrategy.AUTO)
+    }
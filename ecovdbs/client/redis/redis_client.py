@@ -1,4 +1,5 @@
 import logging
+from copy import copy
 from typing import Optional
 
 import numpy as np
@@ -7,11 +8,12 @@ from redis.client import Pipeline
 from redis.commands.search.field import VectorField, TextField
 from redis.commands.search.indexDefinition import IndexDefinition, IndexType
 from redis.commands.search.query import Query
+from redis.exceptions import ResponseError
 
 from .redis_config import RedisConfig
 from ..base_client import BaseClient
 from ..base_config import BaseIndexConfig
-from ..utility import bytes_to_mb
+from ..utility import bytes_to_mb, pipelined_insert, batch_ranges, read_batch_size
 
 log = logging.getLogger(__name__)
 
@@ -33,7 +35,7 @@ class RedisClient(BaseClient):
         """
         self.__dimension: int = dimension
         self.__index_config: BaseIndexConfig = index_config
-        self.__batch_size = 1000
+        self.__batch_size = read_batch_size(type(self).__name__, dimension) or 1000
         self.__index_name: str = "ecovdbs"
         self.__metadata_name: str = "metadata"
         self.__vector_name: str = "vector"
@@ -42,6 +44,8 @@ class RedisClient(BaseClient):
         else:
             self.__vector_dtype = np.float64
 
+        self.__db_config: RedisConfig = db_config
+
         # Initialize the Redis client
         self.__client: Redis = Redis(host=db_config.host, port=db_config.port, password=db_config.password)
 
@@ -49,26 +53,77 @@ class RedisClient(BaseClient):
         self.__client.flushdb()
         log.info("Redis client initialized")
 
+    def fork(self) -> "RedisClient":
+        clone = copy(self)
+        clone.__client = Redis(host=self.__db_config.host, port=self.__db_config.port,
+                               password=self.__db_config.password)
+        return clone
+
+    def close(self) -> None:
+        self.__client.close()
+
     def insert(self, embeddings: list[list[float]], metadata: Optional[list[str]] = None, start_id: int = 0) -> None:
         if len(embeddings) > self.__batch_size:
             self.batch_insert(embeddings, metadata, start_id)
         else:
             pipeline, metadata = self.__pre_insert(len(embeddings), metadata)
-            for i, embedding in enumerate(embeddings):
-                pipeline.hset(str(i + start_id),
-                              mapping={self.__vector_name: np.array(embedding).astype(self.__vector_dtype).tobytes(),
-                                       self.__metadata_name: metadata[i]})
-            pipeline.execute()
+            self.__send(pipeline, self.__encode(embeddings, metadata, start_id, 0, len(embeddings)))
 
     def batch_insert(self, embeddings: list[list[float]], metadata: Optional[list[str]] = None,
                      start_id: int = 0) -> None:
         pipeline, metadata = self.__pre_insert(len(embeddings), metadata)
-        for i, embedding in enumerate(embeddings):
-            pipeline.hset(str(i + start_id),
-                          mapping={self.__vector_name: np.array(embedding).astype(self.__vector_dtype).tobytes(),
-                                   self.__metadata_name: metadata[i]})
-            if i % self.__batch_size == 0:
-                pipeline.execute()
+        # The next batch is converted to bytes while the previous one is sent
+        pipelined_insert(batch_ranges(len(embeddings), self.__batch_size),
+                         lambda r: self.__encode(embeddings, metadata, start_id, r[0], r[1]),
+                         lambda batch: self.__send(pipeline, batch))
+
+    def upsert(self, embeddings: list[list[float]], ids: list[int], metadata: Optional[list[str]] = None) -> None:
+        """
+        Overwrite the hashes of the ids in batches. Redis reindexes an overwritten hash, the old vector is marked as
+        deleted in the HNSW graph.
+        """
+        pipeline, metadata = self.__pre_insert(len(embeddings), metadata)
+        for start, end in batch_ranges(len(embeddings), self.__batch_size):
+            vectors = np.asarray(embeddings[start:end], dtype=self.__vector_dtype)
+            self.__send(pipeline, [(str(ids[i]), {self.__vector_name: vector.tobytes(),
+                                                  self.__metadata_name: metadata[i]})
+                                   for i, vector in zip(range(start, end), vectors)])
+
+    def delete(self, ids: list[int]) -> None:
+        """
+        Delete the hashes of the ids in batches. Redis removes deleted hashes from the index, the vectors are marked as
+        deleted in the HNSW graph.
+        """
+        log.info(f"Deleting {len(ids)} vectors from database")
+        for start, end in batch_ranges(len(ids), self.__batch_size):
+            self.__client.delete(*[str(i) for i in ids[start:end]])
+
+    def __encode(self, embeddings: list[list[float]], metadata: list[str], start_id: int, start: int,
+                 end: int) -> list[tuple[str, dict]]:
+        """
+        Encode a batch of the embeddings into the keys and mappings of the hashes.
+
+        :param embeddings: List of embeddings to insert.
+        :param metadata: List of metadata strings to insert.
+        :param start_id: Index of the first inserted vector.
+        :param start: Index of the first embedding of the batch.
+        :param end: Index after the last embedding of the batch.
+        :return: A list of tuples with the key and the mapping of every hash.
+        """
+        vectors = np.asarray(embeddings[start:end], dtype=self.__vector_dtype)
+        return [(str(start_id + i), {self.__vector_name: vector.tobytes(), self.__metadata_name: metadata[i]})
+                for i, vector in zip(range(start, end), vectors)]
+
+    @staticmethod
+    def __send(pipeline: Pipeline, batch: list[tuple[str, dict]]) -> None:
+        """
+        Send an encoded batch of hashes to the database with one pipeline execution.
+
+        :param pipeline: The pipeline to use.
+        :param batch: A list of tuples with the key and the mapping of every hash.
+        """
+        for key, mapping in batch:
+            pipeline.hset(key, mapping=mapping)
         pipeline.execute()
 
     def __pre_insert(self, len_embeddings: int, metadata: Optional[list[str]]) -> tuple[Pipeline, list[str]]:
@@ -85,10 +140,21 @@ class RedisClient(BaseClient):
             metadata = ["" for _ in range(len_embeddings)]
         return pipeline, metadata
 
+    def set_batch_size(self, batch_size: int) -> None:
+        self.__batch_size = batch_size
+
+    def flush(self) -> None:
+        """
+        Not implemented! The data is written by :meth:`insert`.
+        """
+        return None
+
     def create_index(self) -> None:
         param = self.__index_config.index_param()
         log.info(f"Creating index {self.__index_config.index_param()}")
         param["param"]["DIM"] = self.__dimension
+        if "workers" in param:
+            self.__set_workers(param["workers"])
         fields = [
             VectorField(name=self.__vector_name, algorithm=param["index"], attributes=param["param"],
                         as_name=self.__vector_name),
@@ -97,6 +163,41 @@ class RedisClient(BaseClient):
         definition = IndexDefinition(index_type=IndexType.HASH)
         self.__client.ft(self.__index_name).create_index(fields=fields, definition=definition)
 
+    def __set_workers(self, workers: int) -> None:
+        """
+        Set the number of worker threads of the search module. Older versions of the module only accept the setting
+        when the module is loaded (``REDISEARCH_ARGS="WORKERS <n>"``).
+
+        :param workers: The number of worker threads.
+        :raises ResponseError: If the server rejects the setting. The index would be built with the threads of the
+            server, so the build must not be reported with ``workers`` threads.
+        """
+        try:
+            self.__client.ft(self.__index_name).config_set("WORKERS", workers)
+        except ResponseError as e:
+            log.error(f"Could not set WORKERS to {workers}: {e}")
+            raise
+
+    def index_progress(self) -> float:
+        """
+        Get the progress of the index creation from ``FT.INFO``. ``FT.CREATE`` returns immediately and already existing
+        hashes are indexed in the background.
+
+        :return: The value of ``percent_indexed``, between 0 and 1.
+        """
+        return float(self.__client.ft(self.__index_name).info()["percent_indexed"])
+
+    def drop_index(self) -> None:
+        """
+        Drop the index without deleting the indexed hashes.
+        """
+        try:
+            self.__client.ft(self.__index_name).dropindex(delete_documents=False)
+            log.info(f"Dropped index {self.__index_name}")
+        except ResponseError:
+            # The index does not exist
+            pass
+
     def disk_storage(self) -> float:
         # The size in bytes of the dataset (used_memory_overhead subtracted from used_memory)
         return bytes_to_mb(self.__client.info("memory")["used_memory_dataset"])
@@ -122,15 +223,35 @@ class RedisClient(BaseClient):
         """
         return None
 
-    def query(self, query: list[float], k: int) -> list[int]:
-        log.info(f"Query {k} vectors. Query: {query}")
-        redis_query = Query(
+    def __knn_query(self, k: int) -> Query:
+        """
+        Get the KNN query of :meth:`query` with the parameter ``query_vector``.
+
+        :param k: The number of results to return.
+        :return: The query.
+        """
+        return Query(
             f"(*)=>[KNN {k} @{self.__vector_name} $query_vector]=>{{{self.__pre_query()}$YIELD_DISTANCE_AS: vector_score}}").sort_by(
             "vector_score").return_fields("vector_score", "id", "metadata").paging(0, k).dialect(2)
-        res = self.__client.ft(self.__index_name).search(redis_query, {
+
+    def query(self, query: list[float], k: int) -> list[int]:
+        log.info(f"Query {k} vectors. Query: {query}")
+        res = self.__client.ft(self.__index_name).search(self.__knn_query(k), {
             "query_vector": np.array(query, dtype=np.float32).tobytes()}).docs
         return [int(doc['id']) for doc in res]
 
+    def batch_query(self, queries: list[list[float]], k: int) -> list[list[int]]:
+        """
+        Send all queries with one pipeline execution. The responses of a pipeline are not parsed by the client, a raw
+        ``FT.SEARCH`` response is the total followed by the key and the fields of every document.
+        """
+        log.info(f"Query {k} vectors for {len(queries)} queries")
+        pipeline = self.__client.pipeline(transaction=False)
+        search = pipeline.ft(self.__index_name)
+        for vector in np.asarray(queries, dtype=np.float32):
+            search.search(self.__knn_query(k), {"query_vector": vector.tobytes()})
+        return [[int(key) for key in res[1::2]] for res in pipeline.execute()]
+
     def filtered_query(self, query: list[float], k: int, keyword_filter: str) -> list[int]:
         log.info(f"Query {k} vectors with keyword_filter {keyword_filter}. Query: {query}")
         redis_query = Query(
@@ -148,3 +269,51 @@ class RedisClient(BaseClient):
         res = self.__client.ft(self.__index_name).search(redis_query, {
             "query_vector": np.array(query, dtype=np.float32).tobytes()}).docs
         return [int(doc['id']) for doc in res]
+
+    def ping(self) -> None:
+        self.__client.ping()
+
+    def query_engine_time(self, query: list[float], k: int) -> Optional[float]:
+        """
+        Run the query with ``FT.PROFILE``. The engine time is the ``Total profile time`` reported by the server.
+        """
+        _, profile = self.__client.ft(self.__index_name).profile(
+            self.__knn_query(k), query_params={"query_vector": np.array(query, dtype=np.float32).tobytes()})
+        total = _find_profile_value(profile, "Total profile time")
+        return float(total) / 1000 if total is not None else None
+
+    def query_plan(self, query: list[float], k: int, keyword_filter: Optional[str] = None) -> Optional[str]:
+        """
+        Not implemented! The plan of ``FT.EXPLAIN`` is not read.
+        """
+        return None
+
+    def storage_breakdown(self, vacuum: bool = False) -> Optional[dict[str, float]]:
+        """
+        Not implemented! The storage components of Redis are not read.
+        """
+        return None
+
+
+def _find_profile_value(profile, key: str):
+    """
+    Find a value in the output of ``FT.PROFILE``. Depending on the version of the server and the protocol, the output
+    is a dictionary or a nested list of key-value pairs.
+
+    :param profile: The profile part of the output.
+    :param key: The key of the value.
+    :return: The value or None if the key is not found.
+    """
+    if isinstance(profile, dict):
+        for k, v in profile.items():
+            if (k.decode() if isinstance(k, bytes) else k) == key:
+                return v
+        profile = list(profile.values())
+    if isinstance(profile, (list, tuple)):
+        for i, item in enumerate(profile):
+            if (item.decode() if isinstance(item, bytes) else item) == key and i + 1 < len(profile):
+                return profile[i + 1]
+            value = _find_profile_value(item, key)
+            if value is not None:
+                return value
+    return None
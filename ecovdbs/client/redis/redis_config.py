@@ -81,7 +81,7 @@ class RedisHNSWConfig(BaseHNSWConfig):
 
     def __init__(self, metric_type: MetricType, data_type: str = "FLOAT32", initial_cap: Optional[int] = None,
                  M: Optional[int] = None, ef_construction: Optional[int] = None, ef_runtime: Optional[int] = None,
-                 epsilon: Optional[int] = None):
+                 epsilon: Optional[int] = None, workers: Optional[int] = None):
         """
         Initialize the RedisHNSWConfig with the specified parameters.
 
@@ -98,6 +98,8 @@ class RedisHNSWConfig(BaseHNSWConfig):
         :param epsilon: Relative factor that sets the boundaries in which a range query may search for candidates. That
             is, vector candidates whose distance from the query vector is radius*(1 + EPSILON) are potentially scanned,
             allowing more extensive search and more accurate results (at the expense of runtime).
+        :param workers: Number of worker threads of the search module building the vector index in the background.
+            This is a setting of the server (``FT.CONFIG SET WORKERS``), not of the index.
         """
         assert data_type in ["FLOAT32", "FLOAT64"]
         self.__type = data_type
@@ -108,13 +110,15 @@ class RedisHNSWConfig(BaseHNSWConfig):
         self.__ef_construction: Optional[int] = ef_construction
         self.__ef_runtime: Optional[int] = ef_runtime
         self.__epsilon: Optional[int] = epsilon
+        self.__workers: Optional[int] = workers
 
     def index_param(self) -> dict:
         """
         Generate the index parameters dictionary. The directory contains the keys ``index`` for the index and ``param``
         for a directory with params for the index. ``param`` contains the keys ``TYPE`` and ``DISTANCE_METRIC`` and may
         contain the keys ``INITIAL_CAP``, ``M``, ``EF_CONSTRUCTION``, ``EF_RUNTIME``, ``EPSILON`` if the value is
-        different from the default value of the database.
+        different from the default value of the database. The directory contains the key ``workers`` if the number of
+        worker threads is set.
 
         :return: A dictionary of index parameters.
         """
@@ -132,10 +136,13 @@ class RedisHNSWConfig(BaseHNSWConfig):
             param["EF_RUNTIME"] = self.__ef_runtime
         if self.__epsilon is not None:
             param["EPSILON"] = self.__epsilon
-        return {
+        index_param = {
             "index": self.__index_type.value,
             "param": param
         }
+        if self.__workers is not None:
+            index_param["workers"] = self.__workers
+        return index_param
 
     def search_param(self) -> Optional[dict]:
         """
@@ -150,3 +157,13 @@ class RedisHNSWConfig(BaseHNSWConfig):
 
     def change_ef_search(self, ef: int) -> None:
         self.__ef_runtime = ef
+
+    def change_build_param(self, M: int, ef_construction: int) -> None:
+        assert M > 0
+        self.__M = M
+        assert ef_construction > 0
+        self.__ef_construction = ef_construction
+
+    def change_build_threads(self, threads: int) -> None:
+        assert threads > 0
+        self.__workers = threads
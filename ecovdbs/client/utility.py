@@ -1,7 +1,20 @@
+import json
+import os
+import threading
 from logging import Logger
+from queue import Queue, Full
+from typing import Callable, Iterable, TypeVar, Any, Optional
 
 from docker.models.containers import Container
 
+from ..config import BATCH_SIZE_PATH
+
+# Number of encoded batches that may wait in the insert pipeline while another batch is sent to the database
+INSERT_QUEUE_DEPTH = 2
+
+T = TypeVar("T")
+U = TypeVar("U")
+
 
 def bytes_to_mb(bytes: int) -> float:
     """
@@ -36,3 +49,107 @@ def get_size_of(path: str, container: Container, log: Logger) -> int:
     else:
         log.error(f"The database container returned an error: {result.exit_code}")
         return -1
+
+
+class _PipelineEnd:
+    """
+    Marker put into the queue of :func:`pipelined_insert` after the last batch. Holds the exception of the encoding
+    thread if it failed.
+    """
+
+    def __init__(self, exception: Any = None) -> None:
+        self.exception = exception
+
+
+def pipelined_insert(batches: Iterable[T], encode: Callable[[T], U], send: Callable[[U], None],
+                     depth: int = INSERT_QUEUE_DEPTH) -> None:
+    """
+    Insert batches with a double-buffered producer/consumer pipeline. A background thread encodes the next batches into
+    the format of the database while the calling thread sends the previously encoded batch. The queue between both
+    holds at most ``depth`` encoded batches, which bounds the memory used by the pipeline. The insertion takes about
+    max(encode, send) instead of encode + send.
+
+    :param batches: The batches to insert, e.g. ranges of the embeddings.
+    :param encode: Function that encodes a batch into the format of the database.
+    :param send: Function that sends an encoded batch to the database. It is called in the calling thread in the order
+        of the batches.
+    :param depth: The maximal number of encoded batches waiting to be sent.
+    """
+    queue: Queue = Queue(maxsize=depth)
+    stopped = threading.Event()
+
+    def put(item: Any) -> bool:
+        # Wait for a free slot, but give up if the consumer stopped
+        while not stopped.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                pass
+        return False
+
+    def produce() -> None:
+        try:
+            for batch in batches:
+                if not put(encode(batch)):
+                    return
+            put(_PipelineEnd())
+        except BaseException as e:
+            put(_PipelineEnd(e))
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = queue.get()
+            if isinstance(item, _PipelineEnd):
+                if item.exception is not None:
+                    raise item.exception
+                break
+            send(item)
+    finally:
+        stopped.set()
+        producer.join()
+
+
+def batch_ranges(num: int, batch_size: int) -> list[tuple[int, int]]:
+    """
+    Split the indices ``0`` to ``num`` into consecutive ranges of at most ``batch_size`` elements.
+
+    :param num: The number of elements.
+    :param batch_size: The maximal number of elements per range.
+    :return: A list of ``(start, end)`` tuples. ``end`` is exclusive.
+    """
+    return [(start, min(start + batch_size, num)) for start in range(0, num, batch_size)]
+
+
+def read_batch_size(client_name: str, dimension: int) -> Optional[int]:
+    """
+    Read the calibrated insert batch size of a client for a dimension.
+
+    :param client_name: The name of the client class.
+    :param dimension: The dimension of the embeddings.
+    :return: The calibrated batch size or None if the client was not calibrated for the dimension.
+    """
+    if not os.path.exists(BATCH_SIZE_PATH):
+        return None
+    with open(BATCH_SIZE_PATH, 'r') as file:
+        batch_sizes: dict = json.load(file)
+    return batch_sizes.get(client_name, {}).get(str(dimension))
+
+
+def save_batch_size(client_name: str, dimension: int, batch_size: int) -> None:
+    """
+    Save the calibrated insert batch size of a client for a dimension. Clients created afterward use this batch size.
+
+    :param client_name: The name of the client class.
+    :param dimension: The dimension of the embeddings.
+    :param batch_size: The calibrated batch size.
+    """
+    batch_sizes: dict = {}
+    if os.path.exists(BATCH_SIZE_PATH):
+        with open(BATCH_SIZE_PATH, 'r') as file:
+            batch_sizes = json.load(file)
+    batch_sizes.setdefault(client_name, {})[str(dimension)] = batch_size
+    with open(BATCH_SIZE_PATH, 'w') as file:
+        json.dump(batch_sizes, file, indent=4)
@@ -27,6 +27,9 @@ RESULT_BASE_PATH = os.path.join(BASE_PATH, "results")
 PLOT_BASE_PATH = os.path.join(BASE_PATH, "plots")
 DATA_BASE_PATH = os.path.join(BASE_PATH, "data")
 
+# Define the path of the file with the calibrated insert batch sizes
+BATCH_SIZE_PATH = os.path.join(DATA_BASE_PATH, "batch_sizes.json")
+
 # Create the directories if they do not already exist
 os.makedirs(RESULT_BASE_PATH, exist_ok=True)
 os.makedirs(PLOT_BASE_PATH, exist_ok=True)
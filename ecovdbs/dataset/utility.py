@@ -3,6 +3,11 @@ from urllib.request import urlretrieve
 
 import numpy as np
 
+from ..client.base_config import MetricType
+
+# Maximum number of query-data distances held in memory at once by brute_force_neighbors
+BRUTE_FORCE_BLOCK_SIZE = 25_000_000
+
 
 def download(src_url: str, dest_path: str) -> None:
     """
@@ -50,3 +55,35 @@ def fvecs_read(fname):
     :return: List of vectors from the .fvecs file.
     """
     return _ivecs_read(fname).view('float32').tolist()
+
+
+def brute_force_neighbors(data_vectors: list[list[float]], query_vectors: list[list[float]], k: int,
+                          metric_type: MetricType) -> list[list[int]]:
+    """
+    Calculate the exact k nearest neighbors of every query vector among the data vectors. The queries are processed
+    in blocks, so that at most ``BRUTE_FORCE_BLOCK_SIZE`` distances are held in memory.
+
+    :param data_vectors: List of data vectors. The index in the list is the id of a vector.
+    :param query_vectors: List of query vectors.
+    :param k: The number of neighbors per query.
+    :param metric_type: The metric to calculate the distance with (see :class:`MetricType`).
+    :return: The ids of the k nearest neighbors of every query, ordered by distance.
+    """
+    data = np.asarray(data_vectors, dtype=np.float32)
+    queries = np.asarray(query_vectors, dtype=np.float32)
+    if metric_type == MetricType.COSINE:
+        data = data / np.maximum(np.linalg.norm(data, axis=1, keepdims=True), np.finfo(np.float32).tiny)
+        queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), np.finfo(np.float32).tiny)
+    # The squared norm of the query does not change the order of the L2 distances
+    data_norms = (data * data).sum(axis=1) if metric_type == MetricType.L2 else None
+    k = min(k, len(data))
+    block = max(1, BRUTE_FORCE_BLOCK_SIZE // max(len(data), 1))
+    neighbors: list[list[int]] = []
+    for start in range(0, len(queries), block):
+        distances = -queries[start:start + block] @ data.T
+        if data_norms is not None:
+            distances = data_norms + 2 * distances
+        nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        order = np.take_along_axis(distances, nearest, axis=1).argsort(axis=1)
+        neighbors.extend(np.take_along_axis(nearest, order, axis=1).tolist())
+    return neighbors
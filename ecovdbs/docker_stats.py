@@ -1,57 +1,502 @@
 import os
 import threading
 import time
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Iterator, Optional
 
 import docker
 import matplotlib.pyplot as plt
+import numpy as np
 
 from .config import PLOT_BASE_PATH
 
+# Scheduling period in microseconds used for CPU limits
+CPU_PERIOD = 100_000
+
+# Files of the memory controller inside the container for cgroup v2 and cgroup v1
+CGROUP_V2_MEMORY_EVENTS = "/sys/fs/cgroup/memory.events"
+CGROUP_V2_SWAP_CURRENT = "/sys/fs/cgroup/memory.swap.current"
+CGROUP_V1_OOM_CONTROL = "/sys/fs/cgroup/memory/memory.oom_control"
+CGROUP_V1_MEMORY_STAT = "/sys/fs/cgroup/memory/memory.stat"
+
 
 def get_memory_usage(container):
     stats = container.stats(stream=False)
     return stats['memory_stats']['usage']
 
 
-def get_cpu_usage(container):
-    stats = container.stats(stream=False)
-    cpu_delta = stats['cpu_stats']['cpu_usage']['total_usage'] - stats['precpu_stats']['cpu_usage']['total_usage']
-    system_cpu_delta = stats['cpu_stats']['system_cpu_usage'] - stats['precpu_stats']['system_cpu_usage']
-    num_cpus = len(stats['cpu_stats']['cpu_usage']['percpu_usage'])
-    if system_cpu_delta > 0 and cpu_delta > 0:
-        cpu_usage = (cpu_delta / system_cpu_delta) * num_cpus * 100.0
-    else:
-        cpu_usage = 0.0
-    return cpu_usage
+def read_container_file(container, path: str) -> Optional[str]:
+    """
+    Read a file inside a running container.
+
+    :param container: The container.
+    :param path: The path of the file inside the container.
+    :return: The content of the file or None if it could not be read.
+    """
+    exit_code, output = container.exec_run(["cat", path])
+    return output.decode() if exit_code == 0 else None
+
+
+def parse_key_values(content: Optional[str]) -> dict[str, int]:
+    """
+    Parse the lines ``<key> <value>`` of a cgroup statistics file.
+
+    :param content: The content of the file or None.
+    :return: A dictionary of the integer values, empty if the content is None.
+    """
+    values: dict[str, int] = {}
+    for line in (content or "").splitlines():
+        parts = line.split()
+        if len(parts) == 2 and parts[1].lstrip('-').isdigit():
+            values[parts[0]] = int(parts[1])
+    return values
+
+
+@dataclass(frozen=True)
+class MemoryPressure:
+    """
+    Memory pressure counters of a container. The counters are cumulative since the start of the container.
+
+    Attributes:
+        oom_killed: True if the container was stopped by the OOM killer.
+        oom_kills: The number of processes inside the container killed by the OOM killer.
+        swap: The swap used by the container in bytes.
+        major_faults: The number of major page faults, i.e. pages read back from disk or swap.
+    """
+    oom_killed: bool
+    oom_kills: int
+    swap: int
+    major_faults: int
+
+
+@dataclass(frozen=True)
+class Phase:
+    """
+    A phase of a runner marked on the monitor, e.g. the insertion, the index build or the queries for one ef value.
+
+    Attributes:
+        name: The name of the phase.
+        operations: The number of vectors or queries processed in the phase.
+        start: The start of the phase.
+        end: The end of the phase.
+    """
+    name: str
+    operations: int
+    start: datetime
+    end: datetime
+
+
+@dataclass(frozen=True)
+class ResourceUsage:
+    """
+    Resource usage of a container in a time span, computed from the samples taken in the time span. All values are 0 if
+    less than two samples were taken.
+
+    Attributes:
+        cpu_time: The CPU time used in seconds.
+        avg_cpu_usage: The average CPU usage in percent of one core.
+        peak_cpu_usage: The highest CPU usage between two samples in percent of one core.
+        avg_memory: The average memory usage in bytes.
+        peak_memory: The highest memory usage in bytes.
+        block_read: The bytes read from block devices.
+        block_write: The bytes written to block devices.
+        network_received: The bytes received over the network.
+        network_sent: The bytes sent over the network.
+    """
+    cpu_time: float = 0.0
+    avg_cpu_usage: float = 0.0
+    peak_cpu_usage: float = 0.0
+    avg_memory: float = 0.0
+    peak_memory: float = 0.0
+    block_read: float = 0.0
+    block_write: float = 0.0
+    network_received: float = 0.0
+    network_sent: float = 0.0
+
+
+# Columns of a resource reading: the cumulative CPU time in seconds, the memory usage in bytes, the cumulative bytes
+# read from and written to block devices, the cumulative bytes received and sent over the network and the number of
+# processes
+CPU_TIME, MEMORY, BLOCK_READ, BLOCK_WRITE, NET_RX, NET_TX, PIDS = range(7)
+NUM_COLUMNS = 7
+
+# Number of samples the arrays of the monitor are preallocated for, the arrays double in size when they are full
+INITIAL_SAMPLE_CAPACITY = 36_000
+
+# Mount point of the cgroup v2 hierarchy on the host
+CGROUP_ROOT = "/sys/fs/cgroup"
+
+
+def parse_stats(stats: dict) -> list[float]:
+    """
+    Parse one reading of the Docker stats API into the columns of a resource reading.
+
+    :param stats: The stats of the container as returned by the Docker daemon.
+    :return: The values of the columns ``CPU_TIME`` to ``PIDS``.
+    """
+    blkio = stats.get('blkio_stats', {}).get('io_service_bytes_recursive') or []
+    networks = (stats.get('networks') or {}).values()
+    return [stats['cpu_stats']['cpu_usage']['total_usage'] / 1e9,
+            stats['memory_stats'].get('usage', 0),
+            sum(entry['value'] for entry in blkio if entry['op'].lower() == 'read'),
+            sum(entry['value'] for entry in blkio if entry['op'].lower() == 'write'),
+            sum(network['rx_bytes'] for network in networks),
+            sum(network['tx_bytes'] for network in networks),
+            stats.get('pids_stats', {}).get('current', 0)]
+
+
+class CgroupReader:
+    """
+    Reads the resource usage of a container directly from its cgroup v2 files on the host and its network counters from
+    ``/proc/<pid>/net/dev``. A reading takes a few microseconds, so the container can be sampled at any frequency.
+    Only available if the Docker daemon runs on the same Linux host with cgroup v2.
+    """
+
+    def __init__(self, cgroup_path: str, pid: int) -> None:
+        """
+        Initialize the CgroupReader with the cgroup directory and a process of the container.
+
+        :param cgroup_path: The cgroup directory of the container on the host.
+        :param pid: The host PID of a process in the network namespace of the container.
+        """
+        self.__cgroup_path: str = cgroup_path
+        self.__net_dev: str = f"/proc/{pid}/net/dev"
+
+    @staticmethod
+    def open(container) -> Optional["CgroupReader"]:
+        """
+        Locate the cgroup v2 directory of the container on the host.
+
+        :param container: The running container.
+        :return: A reader for the container or None if its cgroup v2 files are not accessible.
+        """
+        pid = container.attrs["State"]["Pid"]
+        try:
+            with open(f"/proc/{pid}/cgroup") as file:
+                lines = file.read().splitlines()
+        except OSError:
+            return None
+        for line in lines:
+            # The cgroup v2 hierarchy has the ID 0 and no controllers, e.g. 0::/system.slice/docker-<id>.scope
+            if line.startswith("0::"):
+                cgroup_path = CGROUP_ROOT + line[3:]
+                if os.access(os.path.join(cgroup_path, "cpu.stat"), os.R_OK):
+                    return CgroupReader(cgroup_path, pid)
+        return None
+
+    def read(self, out) -> None:
+        """
+        Read the resource usage of the container.
+
+        :param out: The row to write the columns ``CPU_TIME`` to ``PIDS`` to.
+        """
+        out[CPU_TIME] = parse_key_values(self.__read("cpu.stat"))["usage_usec"] / 1e6
+        out[MEMORY] = int(self.__read("memory.current"))
+        block_read = block_write = 0
+        # One line per device, e.g. 8:0 rbytes=1459200 wbytes=314773504 rios=192 wios=353 dbytes=0 dios=0
+        for line in self.__read("io.stat").splitlines():
+            fields = dict(field.split("=") for field in line.split()[1:])
+            block_read += int(fields.get("rbytes", 0))
+            block_write += int(fields.get("wbytes", 0))
+        out[BLOCK_READ] = block_read
+        out[BLOCK_WRITE] = block_write
+        received = sent = 0
+        with open(self.__net_dev) as file:
+            # Two header lines, then "<interface>: <8 receive counters> <8 transmit counters>"
+            for line in file.read().splitlines()[2:]:
+                interface, counters = line.split(":", 1)
+                if interface.strip() != "lo":
+                    counters = counters.split()
+                    received += int(counters[0])
+                    sent += int(counters[8])
+        out[NET_RX] = received
+        out[NET_TX] = sent
+        out[PIDS] = int(self.__read("pids.current"))
+
+    def __read(self, name: str) -> str:
+        """
+        Read a file of the cgroup of the container.
+
+        :param name: The name of the file.
+        :return: The content of the file.
+        """
+        with open(os.path.join(self.__cgroup_path, name)) as file:
+            return file.read()
+
+    def close(self) -> None:
+        return None
+
+
+class StatsStreamReader:
+    """
+    Reads the resource usage of a container from one streaming stats feed of the Docker daemon. The feed is consumed by
+    a background thread and a reading returns the latest stats. The daemon sends the stats about once per second, so
+    consecutive samples may repeat the same reading.
+    """
+
+    def __init__(self, container) -> None:
+        """
+        Initialize the StatsStreamReader and start consuming the stats feed of the container.
+
+        :param container: The running container.
+        """
+        self.__stream = container.stats(stream=True, decode=True)
+        self.__latest: list[float] = parse_stats(next(self.__stream))
+        self.__running = True
+        threading.Thread(target=self.__consume, daemon=True).start()
+
+    def __consume(self) -> None:
+        """
+        Keep the latest reading of the stats feed until the reader is closed or the feed ends with the container.
+        """
+        for stats in self.__stream:
+            if not self.__running:
+                break
+            self.__latest = parse_stats(stats)
+
+    def read(self, out) -> None:
+        """
+        Copy the latest reading of the stats feed.
+
+        :param out: The row to write the columns ``CPU_TIME`` to ``PIDS`` to.
+        """
+        out[:] = self.__latest
+
+    def close(self) -> None:
+        self.__running = False
 
 
 class ContainerMonitor(threading.Thread):
+    """
+    Thread sampling the resource usage of a container every ``interval`` seconds. The samples are read from the cgroup
+    v2 files of the container if the host exposes them (see :class:`CgroupReader`) and from the streaming stats feed of
+    the Docker daemon otherwise (see :class:`StatsStreamReader`). They are stored in preallocated arrays.
+    """
+
     def __init__(self, container_id, interval=.1):
         super().__init__()
-        self.client = docker.from_env()
+        self.__client: Optional[docker.DockerClient] = None
         self.container_id = container_id
         self.interval = interval
         self.running = True
-        self.memory_usages = []
-        self.cpu_usages = []
-        self.timestamps = []
+        self.__lock = threading.Lock()
+        self.__times = np.empty(INITIAL_SAMPLE_CAPACITY)
+        self.__readings = np.empty((INITIAL_SAMPLE_CAPACITY, NUM_COLUMNS))
+        self.__count = 0
+        self.phases: list[Phase] = []
+
+    @property
+    def client(self) -> docker.DockerClient:
+        """
+        The Docker client. It is created at its first use, so the monitors can be defined without a running daemon.
+        """
+        if self.__client is None:
+            self.__client = docker.from_env()
+        return self.__client
 
     def run(self):
         container = self.client.containers.get(self.container_id)
-        print(f"Starting monitoring for container {self.container_id}.")
-        while self.running:
-            self.timestamps.append(datetime.now())
-            memory_usage = get_memory_usage(container)
-            cpu_usage = get_cpu_usage(container)
-            self.memory_usages.append(memory_usage)
-            self.cpu_usages.append(cpu_usage)
+        reader = CgroupReader.open(container) or StatsStreamReader(container)
+        print(f"Starting monitoring for container {self.container_id} with {type(reader).__name__}.")
+        next_sample = time.monotonic()
+        try:
+            while self.running:
+                self.__sample(reader)
+                next_sample += self.interval
+                delay = next_sample - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    # The sampling fell behind, continue at the regular interval from now instead of catching up
+                    next_sample = time.monotonic()
+        except (OSError, KeyError, ValueError) as e:
+            # The cgroup of the container is removed when the container stops
+            print(f"Could not sample container {self.container_id}: {e}")
+        finally:
+            reader.close()
         print(f"Stopped monitoring for container {self.container_id}.")
         self.summarize_stats()
 
+    def __sample(self, reader: CgroupReader | StatsStreamReader) -> None:
+        """
+        Take one sample and append it to the arrays, doubling their size if they are full.
+
+        :param reader: The reader of the resource usage.
+        """
+        if self.__count == len(self.__times):
+            with self.__lock:
+                self.__times = np.concatenate([self.__times, np.empty_like(self.__times)])
+                self.__readings = np.concatenate([self.__readings, np.empty_like(self.__readings)])
+        reader.read(self.__readings[self.__count])
+        self.__times[self.__count] = time.time()
+        self.__count += 1
+
+    def __samples(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get the samples taken so far.
+
+        :return: The UNIX timestamps of the samples and their readings with the columns ``CPU_TIME`` to ``PIDS``.
+        """
+        with self.__lock:
+            return self.__times[:self.__count], self.__readings[:self.__count]
+
+    @property
+    def timestamps(self) -> list[datetime]:
+        return [datetime.fromtimestamp(t) for t in self.__samples()[0]]
+
+    @property
+    def memory_usages(self) -> np.ndarray:
+        return self.__samples()[1][:, MEMORY]
+
+    @property
+    def cpu_usages(self) -> np.ndarray:
+        """
+        The CPU usage in percent of one core between each sample and the previous one, 0 for the first sample.
+        """
+        times, readings = self.__samples()
+        usages = np.zeros(len(times))
+        if len(times) > 1:
+            usages[1:] = np.diff(readings[:, CPU_TIME]) / np.maximum(np.diff(times), 1e-9) * 100
+        return usages
+
+    @property
+    def block_io(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        The cumulative bytes read from and written to block devices.
+        """
+        readings = self.__samples()[1]
+        return readings[:, BLOCK_READ], readings[:, BLOCK_WRITE]
+
+    @property
+    def network_io(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        The cumulative bytes received and sent over the network.
+        """
+        readings = self.__samples()[1]
+        return readings[:, NET_RX], readings[:, NET_TX]
+
+    @property
+    def pids(self) -> np.ndarray:
+        return self.__samples()[1][:, PIDS]
+
     def stop(self):
         self.running = False
 
+    @contextmanager
+    def phase(self, name: str, operations: int) -> Iterator[None]:
+        """
+        Mark the code run in the context as a phase (see :class:`Phase`). The phases are shaded in the plots of the
+        monitor and their resource usage can be read with :meth:`resource_usage`.
+
+        :param name: The name of the phase.
+        :param operations: The number of vectors or queries processed in the phase.
+        """
+        start = datetime.now()
+        try:
+            yield
+        finally:
+            self.phases.append(Phase(name, operations, start, datetime.now()))
+
+    def resource_usage(self, start: datetime, end: datetime) -> ResourceUsage:
+        """
+        Get the resource usage between the first and the last sample taken between start and end.
+
+        :param start: The start of the time span.
+        :param end: The end of the time span.
+        :return: The resource usage in the time span (see :class:`ResourceUsage`).
+        """
+        times, readings = self.__samples()
+        window = np.flatnonzero((times >= start.timestamp()) & (times <= end.timestamp()))
+        if len(window) < 2:
+            return ResourceUsage()
+        first, last = window[0], window[-1]
+        delta = readings[last] - readings[first]
+        memory = readings[window, MEMORY]
+        return ResourceUsage(float(delta[CPU_TIME]), float(delta[CPU_TIME] / (times[last] - times[first]) * 100),
+                             float(self.cpu_usages[window[1:]].max()), float(memory.mean()), float(memory.max()),
+                             float(delta[BLOCK_READ]), float(delta[BLOCK_WRITE]), float(delta[NET_RX]),
+                             float(delta[NET_TX]))
+
+    def average_cpu_usage(self, start: datetime, end: datetime) -> float:
+        """
+        Get the average CPU usage between the first and the last sample taken between start and end.
+
+        :param start: The start of the time span.
+        :param end: The end of the time span.
+        :return: The average CPU usage in percent of one core or 0 if less than two samples were taken in the time span.
+        """
+        return self.resource_usage(start, end).avg_cpu_usage
+
+    def average_memory_usage(self, start: datetime, end: datetime) -> float:
+        """
+        Get the average memory usage of the samples taken between start and end.
+
+        :param start: The start of the time span.
+        :param end: The end of the time span.
+        :return: The average memory usage in bytes or 0 if no sample was taken in the time span.
+        """
+        times, readings = self.__samples()
+        usages = readings[(times >= start.timestamp()) & (times <= end.timestamp()), MEMORY]
+        return float(usages.mean()) if len(usages) else 0.0
+
+    def limit_cpus(self, cpus: Optional[float]) -> None:
+        """
+        Limit the CPU time of the running container to the given number of cores without restarting it.
+
+        :param cpus: The number of cores or None to remove the limit.
+        """
+        container = self.client.containers.get(self.container_id)
+        # The container may use cpu_quota microseconds of CPU time every cpu_period, a quota of -1 removes the limit
+        container.update(cpu_period=CPU_PERIOD, cpu_quota=int(cpus * CPU_PERIOD) if cpus else -1)
+
+    def limit_memory(self, memory: Optional[float]) -> None:
+        """
+        Limit the memory of the running container without restarting it. The container may additionally swap out as
+        much memory as the limit, so that swapping can be observed before the OOM killer steps in.
+
+        :param memory: The memory limit in MB or None to remove the limit.
+        """
+        container = self.client.containers.get(self.container_id)
+        if memory:
+            container.update(mem_limit=f"{int(memory)}m", memswap_limit=f"{2 * int(memory)}m")
+        else:
+            # A limit of -1 removes the limit
+            container.update(mem_limit=-1, memswap_limit=-1)
+
+    def memory_usage(self) -> float:
+        """
+        Get the current memory usage of the container.
+
+        :return: The memory usage in bytes of the latest sample or read from the container if no sample was taken yet.
+        """
+        readings = self.__samples()[1]
+        if len(readings):
+            return float(readings[-1, MEMORY])
+        return get_memory_usage(self.client.containers.get(self.container_id))
+
+    def memory_pressure(self) -> MemoryPressure:
+        """
+        Read the memory pressure counters of the container. The OOM kills and the swap are read from the memory
+        controller inside the container (cgroup v2 with a fallback to cgroup v1), the major page faults from the
+        container stats. Counters that cannot be read are 0.
+
+        :return: The memory pressure counters (see :class:`MemoryPressure`).
+        """
+        container = self.client.containers.get(self.container_id)
+        if container.attrs["State"]["OOMKilled"] or container.status != "running":
+            return MemoryPressure(container.attrs["State"]["OOMKilled"], 0, 0, 0)
+        events = read_container_file(container, CGROUP_V2_MEMORY_EVENTS)
+        if events is not None:
+            oom_kills = parse_key_values(events).get("oom_kill", 0)
+            swap = int(read_container_file(container, CGROUP_V2_SWAP_CURRENT) or 0)
+        else:
+            oom_kills = parse_key_values(read_container_file(container, CGROUP_V1_OOM_CONTROL)).get("oom_kill", 0)
+            swap = parse_key_values(read_container_file(container, CGROUP_V1_MEMORY_STAT)).get("swap", 0)
+        memory_stats = container.stats(stream=False)['memory_stats'].get('stats', {})
+        return MemoryPressure(False, oom_kills, swap, memory_stats.get('pgmajfault', 0))
+
     def summarize_stats(self):
         timestamp = time.strftime('%Y-%m-%d-%H-%M-%S')
         # Plot memory usage
@@ -60,6 +505,7 @@ class ContainerMonitor(threading.Thread):
         plt.xlabel('Time')
         plt.ylabel('Memory Usage (MB)')
         plt.title(f'Memory Usage Over Time for Container {self.container_id}')
+        self.__shade_phases(plt.gca())
         plt.legend()
         plt.grid(True)
         plt.savefig(os.path.join(PLOT_BASE_PATH, f"{timestamp}-{self.container_id}-MemoryUsage.png"))
@@ -71,15 +517,53 @@ class ContainerMonitor(threading.Thread):
         plt.xlabel('Time')
         plt.ylabel('CPU Usage (%)')
         plt.title(f'CPU Usage Over Time for Container {self.container_id}')
+        self.__shade_phases(plt.gca())
         plt.legend()
         plt.grid(True)
         plt.savefig(os.path.join(PLOT_BASE_PATH, f"{timestamp}-{self.container_id}-CPUUsage.png"))
         plt.close()
 
+        # Plot block I/O, network I/O and the number of processes
+        timestamps = self.timestamps
+        fig, (ax_block, ax_network, ax_pids) = plt.subplots(3, 1, figsize=(12, 12), sharex=True)
+        for ax, (received, sent), labels in ((ax_block, self.block_io, ('Read', 'Written')),
+                                             (ax_network, self.network_io, ('Received', 'Sent'))):
+            ax.plot(timestamps, received / (1024 ** 2), label=labels[0])
+            ax.plot(timestamps, sent / (1024 ** 2), label=labels[1])
+            ax.legend()
+            ax.grid(True)
+        ax_block.set_ylabel('Block I/O (MB)')
+        ax_network.set_ylabel('Network I/O (MB)')
+        ax_pids.plot(timestamps, self.pids, color='green')
+        ax_pids.set_ylabel('Processes')
+        ax_pids.set_xlabel('Time')
+        ax_pids.grid(True)
+        for ax in (ax_block, ax_network, ax_pids):
+            self.__shade_phases(ax)
+        ax_block.set_title(f'I/O and Processes Over Time for Container {self.container_id}')
+        fig.savefig(os.path.join(PLOT_BASE_PATH, f"{timestamp}-{self.container_id}-IOUsage.png"))
+        plt.close(fig)
+
+    def __shade_phases(self, ax: plt.Axes) -> None:
+        """
+        Shade the marked phases in a plot over time and label them with their names.
+
+        :param ax: The axes of the plot.
+        """
+        top = ax.get_ylim()[1]
+        for i, phase in enumerate(self.phases):
+            ax.axvspan(phase.start, phase.end, color=f"C{i % 10}", alpha=0.15)
+            ax.text(phase.start, top, phase.name, rotation=90, va='top', fontsize=8)
+
 
 container_mapper = {
     "CHROMA": ContainerMonitor("chromadb"),
     "MILVUS": ContainerMonitor("milvus-standalone"),
+    "MILVUS_IVF_FLAT": ContainerMonitor("milvus-standalone"),
+    "MILVUS_IVF_SQ8": ContainerMonitor("milvus-standalone"),
+    "MILVUS_IVF_PQ": ContainerMonitor("milvus-standalone"),
+    "MILVUS_SCANN": ContainerMonitor("milvus-standalone"),
+    "MILVUS_FLAT": ContainerMonitor("milvus-standalone"),
     "PGVECTOR": ContainerMonitor("pgvector"),
     "REDIS": ContainerMonitor("redis-stack")
 }
@@ -1,16 +1,32 @@
 import argparse
 import logging
+import time
 from argparse import Namespace
+from functools import partial
 
+from .client.base_config import Quantization, FilterStrategy, CacheMode, ScalarIndexType, ConsistencyLevel
 from .dataset.dataset import Dataset
 from .dataset.dataset_reader import dataset_mapper
 from .docker_stats import container_mapper, ContainerMonitor
-from .results.result import plot_results
-from .runner.case_config import IndexTime, QueryMode, HNSWCase, HNSWConfig
-from .runner.result_config import HNSWRunnerResult
-from .runner.runner import HNSWRunner
+from .results.result import plot_results, plot_insert_scaling, plot_batch_size_calibration, \
+    plot_mixed_workload, plot_freshness, plot_churn, plot_prefix_scaling, plot_build_scaling, \
+    plot_query_scaling, plot_memory_pressure
+from .runner.case_config import IndexTime, QueryMode, HNSWCase, HNSWConfig, HNSWGridConfig, Scenario, \
+    MixedWorkloadConfig, FreshnessConfig, ChurnConfig, ChurnMode, PrefixScalingConfig, \
+    QueryScalingConfig, MemoryPressureConfig
+from .runner.build_scaling import BuildScalingRunner
+from .runner.churn import ChurnRunner
+from .runner.prefix_scaling import PrefixScalingRunner
+from .runner.query_scaling import QueryScalingRunner
+from .runner.freshness import FreshnessRunner
+from .runner.memory_pressure import MemoryPressureRunner
+from .runner.mixed_workload import MixedWorkloadRunner
+from .runner.result_config import HNSWRunnerResult, InsertScalingResult, BatchSizeCalibrationResult, \
+    MixedWorkloadResult, FreshnessResult, ChurnResult, PrefixScalingResult, BuildScalingResult, \
+    MemoryPressureResult
+from .runner.runner import HNSWRunner, HNSWGridRunner, InsertScalingRunner, BatchSizeCalibrationRunner
 from .runner.task_config import HNSWTask
-from .runner.utility import client_mapper, save_hnsw_runner_result
+from .runner.utility import client_mapper, save_hnsw_runner_result, save_result
 
 
 def print_enum_keys(enum_class, enum_name: str) -> None:
@@ -23,6 +39,223 @@ def print_dict_keys(d: dict, dict_name: str) -> None:
     print(f"Possible {dict_name} values: {', '.join(keys)}")
 
 
+def run_hnsw(client_tasks: list[type[HNSWTask]], container: list[ContainerMonitor], case: HNSWCase,
+             build_configs: list[HNSWConfig]) -> None:
+    """
+    Run the HNSW scenario for every client and plot the results. With more than one build configuration, the data is
+    inserted once and the index is rebuilt for every build configuration.
+
+    :param client_tasks: The task classes of the clients.
+    :param container: The container monitors of the clients.
+    :param case: The HNSW case (see :class:`HNSWCase`).
+    :param build_configs: The build configurations (see :class:`HNSWConfig`).
+    """
+    # results[i][j] is the result of the i-th client for the j-th build configuration
+    results: list[list[HNSWRunnerResult]] = []
+    for task, monitor in zip(client_tasks, container):
+        monitor.start()
+        if len(build_configs) > 1:
+            # Insert the data once and rebuild only the index for every build configuration
+            res: list[HNSWRunnerResult] = HNSWGridRunner(task(case), build_configs, monitor).run()
+        else:
+            res: list[HNSWRunnerResult] = [HNSWRunner(task(case), monitor).run()]
+        monitor.stop()
+        results.append(res)
+        for r in res:
+            save_hnsw_runner_result(r)
+
+    timestamp: str = time.strftime('%Y-%m-%d-%H-%M-%S')
+    for j, build_config in enumerate(build_configs):
+        cell_results: list[HNSWRunnerResult] = [res[j] for res in results]
+        if len(build_configs) > 1:
+            plot_results(cell_results, f"{timestamp}-M{build_config.M}-efC{build_config.ef_construction}")
+        else:
+            plot_results(cell_results, timestamp)
+
+
+def run_insert_scaling(client_tasks: list[type[HNSWTask]], container: list[ContainerMonitor], case: HNSWCase,
+                       workers: list[int]) -> None:
+    """
+    Run the insert scaling scenario for every client and plot the results.
+
+    :param client_tasks: The task classes of the clients.
+    :param container: The container monitors of the clients.
+    :param case: The HNSW case (see :class:`HNSWCase`).
+    :param workers: The numbers of parallel workers to insert the data with.
+    """
+    results: list[InsertScalingResult] = []
+    for task, monitor in zip(client_tasks, container):
+        monitor.start()
+        res: InsertScalingResult = InsertScalingRunner(partial(task, case), workers).run()
+        monitor.stop()
+        results.append(res)
+        save_result(res)
+    plot_insert_scaling(results, time.strftime('%Y-%m-%d-%H-%M-%S'))
+
+
+def run_batch_size_calibration(client_tasks: list[type[HNSWTask]], container: list[ContainerMonitor],
+                               case: HNSWCase, batch_sizes: list[int], sample_size: int) -> None:
+    """
+    Run the batch size calibration scenario for every client, save the best batch sizes and plot the results.
+
+    :param client_tasks: The task classes of the clients.
+    :param container: The container monitors of the clients.
+    :param case: The HNSW case (see :class:`HNSWCase`).
+    :param batch_sizes: The batch sizes to try.
+    :param sample_size: The number of vectors inserted for every batch size.
+    """
+    results: list[BatchSizeCalibrationResult] = []
+    for task, monitor in zip(client_tasks, container):
+        monitor.start()
+        res: BatchSizeCalibrationResult = BatchSizeCalibrationRunner(partial(task, case), batch_sizes,
+                                                                     sample_size).run()
+        monitor.stop()
+        results.append(res)
+        save_result(res)
+    plot_batch_size_calibration(results, time.strftime('%Y-%m-%d-%H-%M-%S'))
+
+
+def run_mixed_workload(client_tasks: list[type[HNSWTask]], container: list[ContainerMonitor], case: HNSWCase,
+                       config: MixedWorkloadConfig) -> None:
+    """
+    Run the mixed workload scenario for every client and plot the results.
+
+    :param client_tasks: The task classes of the clients.
+    :param container: The container monitors of the clients.
+    :param case: The HNSW case (see :class:`HNSWCase`).
+    :param config: The configuration of the workload (see :class:`MixedWorkloadConfig`).
+    """
+    results: list[MixedWorkloadResult] = []
+    for task, monitor in zip(client_tasks, container):
+        monitor.start()
+        res: MixedWorkloadResult = MixedWorkloadRunner(task(case), config).run()
+        monitor.stop()
+        results.append(res)
+        save_result(res)
+    plot_mixed_workload(results, time.strftime('%Y-%m-%d-%H-%M-%S'))
+
+
+def run_freshness(client_tasks: list[type[HNSWTask]], container: list[ContainerMonitor], case: HNSWCase,
+                  config: FreshnessConfig) -> None:
+    """
+    Run the freshness scenario for every client and plot the results.
+
+    :param client_tasks: The task classes of the clients.
+    :param container: The container monitors of the clients.
+    :param case: The HNSW case (see :class:`HNSWCase`).
+    :param config: The configuration of the measurement (see :class:`FreshnessConfig`).
+    """
+    results: list[FreshnessResult] = []
+    for task, monitor in zip(client_tasks, container):
+        monitor.start()
+        res: FreshnessResult = FreshnessRunner(task(case), config).run()
+        monitor.stop()
+        results.append(res)
+        save_result(res)
+    plot_freshness(results, time.strftime('%Y-%m-%d-%H-%M-%S'))
+
+
+def run_churn(client_tasks: list[type[HNSWTask]], container: list[ContainerMonitor], case: HNSWCase,
+              config: ChurnConfig) -> None:
+    """
+    Run the churn scenario for every client and plot the results.
+
+    :param client_tasks: The task classes of the clients.
+    :param container: The container monitors of the clients.
+    :param case: The HNSW case (see :class:`HNSWCase`).
+    :param config: The configuration of the churn (see :class:`ChurnConfig`).
+    """
+    results: list[ChurnResult] = []
+    for task, monitor in zip(client_tasks, container):
+        monitor.start()
+        res: ChurnResult = ChurnRunner(task(case), config).run()
+        monitor.stop()
+        results.append(res)
+        save_result(res)
+    plot_churn(results, time.strftime('%Y-%m-%d-%H-%M-%S'))
+
+
+def run_prefix_scaling(client_tasks: list[type[HNSWTask]], container: list[ContainerMonitor], case: HNSWCase,
+                       config: PrefixScalingConfig) -> None:
+    """
+    Run the prefix scaling scenario for every client and plot the results.
+
+    :param client_tasks: The task classes of the clients.
+    :param container: The container monitors of the clients.
+    :param case: The HNSW case (see :class:`HNSWCase`).
+    :param config: The configuration of the prefixes (see :class:`PrefixScalingConfig`).
+    """
+    results: list[PrefixScalingResult] = []
+    for task, monitor in zip(client_tasks, container):
+        monitor.start()
+        res: PrefixScalingResult = PrefixScalingRunner(task(case), config).run()
+        monitor.stop()
+        results.append(res)
+        save_result(res)
+    plot_prefix_scaling(results, config.extrapolation_factor, time.strftime('%Y-%m-%d-%H-%M-%S'))
+
+
+def run_build_scaling(client_tasks: list[type[HNSWTask]], container: list[ContainerMonitor], case: HNSWCase,
+                      threads: list[int]) -> None:
+    """
+    Run the build scaling scenario for every client and plot the results.
+
+    :param client_tasks: The task classes of the clients.
+    :param container: The container monitors of the clients.
+    :param case: The HNSW case (see :class:`HNSWCase`).
+    :param threads: The numbers of build threads.
+    """
+    results: list[BuildScalingResult] = []
+    for task, monitor in zip(client_tasks, container):
+        monitor.start()
+        res: BuildScalingResult = BuildScalingRunner(task(case), sorted(threads), monitor).run()
+        monitor.stop()
+        results.append(res)
+        save_result(res)
+    plot_build_scaling(results, time.strftime('%Y-%m-%d-%H-%M-%S'))
+
+
+def run_query_scaling(client_tasks: list[type[HNSWTask]], container: list[ContainerMonitor], case: HNSWCase,
+                      config: QueryScalingConfig) -> None:
+    """
+    Run the query scaling scenario for every client and plot the results.
+
+    :param client_tasks: The task classes of the clients.
+    :param container: The container monitors of the clients.
+    :param case: The HNSW case (see :class:`HNSWCase`).
+    :param config: The configuration of the query scaling scenario (see :class:`QueryScalingConfig`).
+    """
+    results: list[list[HNSWRunnerResult]] = []
+    for task, monitor in zip(client_tasks, container):
+        monitor.start()
+        res: list[HNSWRunnerResult] = QueryScalingRunner(task(case), config, monitor).run()
+        monitor.stop()
+        results.append(res)
+        for r in res:
+            save_hnsw_runner_result(r)
+    plot_query_scaling(results, time.strftime('%Y-%m-%d-%H-%M-%S'))
+
+
+def run_memory_pressure(client_tasks: list[type[HNSWTask]], container: list[ContainerMonitor], case: HNSWCase,
+                        config: MemoryPressureConfig) -> None:
+    """
+    Run the memory pressure scenario for every client and plot the results.
+
+    :param client_tasks: The task classes of the clients.
+    :param container: The container monitors of the clients.
+    :param case: The HNSW case (see :class:`HNSWCase`).
+    :param config: The configuration of the memory pressure scenario (see :class:`MemoryPressureConfig`).
+    """
+    results: list[MemoryPressureResult] = []
+    for task, monitor in zip(client_tasks, container):
+        monitor.start()
+        res: MemoryPressureResult = MemoryPressureRunner(task(case), config, monitor).run()
+        monitor.stop()
+        results.append(res)
+        save_result(res)
+    plot_memory_pressure(results, time.strftime('%Y-%m-%d-%H-%M-%S'))
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Instantiate clients and read datasets by name")
     parser.add_argument(
@@ -57,6 +290,163 @@ def main() -> None:
         "--query-modes-list", action='store_true',
         help="Print a list of all possible query-modes values and exit"
     )
+    parser.add_argument(
+        "--scenario", type=str, default='hnsw',
+        help="Scenario (in lowercase). Default is hnsw. E.g., --scenario insert_scaling"
+    )
+    parser.add_argument(
+        "--scenarios-list", action='store_true',
+        help="Print a list of all possible scenario values and exit"
+    )
+    parser.add_argument(
+        "--workers", nargs='+', type=int,
+        help="Number of parallel insert workers. The hnsw scenario uses the first value (default 1), the "
+             "insert_scaling scenario all values (default 1 2 4 8). E.g., --workers 1 2 4 8 16"
+    )
+    parser.add_argument(
+        "--batch-sizes", nargs='+', type=int, default=[64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384],
+        help="Insert batch sizes tried by the batch_size_calibration scenario. E.g., --batch-sizes 100 1000 10000"
+    )
+    parser.add_argument(
+        "--sample-size", type=int, default=50_000,
+        help="Number of vectors inserted for every batch size by the batch_size_calibration scenario. Default is "
+             "50000."
+    )
+    parser.add_argument(
+        "--m", nargs='+', type=int, default=HNSWGridConfig().M,
+        help="List of HNSW M values. Default is 24. E.g., --m 16 24 32"
+    )
+    parser.add_argument(
+        "--ef-construction", nargs='+', type=int, default=HNSWGridConfig().ef_construction,
+        help="List of HNSW ef_construction values. Default is 200. E.g., --ef-construction 100 200"
+    )
+    parser.add_argument(
+        "--ef-search", nargs='+', type=int, default=HNSWGridConfig().ef_search,
+        help="List of HNSW ef_search values. Default is 120 200 400 800. E.g., --ef-search 100 200"
+    )
+    parser.add_argument(
+        "--initial-fraction", type=float, default=MixedWorkloadConfig().initial_fraction,
+        help="Fraction of the dataset inserted before the mixed_workload or freshness scenario starts. Default is 0.5."
+    )
+    parser.add_argument(
+        "--write-rate", type=float, default=MixedWorkloadConfig().write_rate,
+        help="Vectors per second inserted by all writers of the mixed_workload scenario, 0 for no limit. Default is "
+             "1000."
+    )
+    parser.add_argument(
+        "--writers", type=int, default=MixedWorkloadConfig().writers,
+        help="Number of writer threads of the mixed_workload scenario. Default is 1."
+    )
+    parser.add_argument(
+        "--readers", type=int, default=MixedWorkloadConfig().readers,
+        help="Number of reader threads of the mixed_workload scenario. Default is 1."
+    )
+    parser.add_argument(
+        "--ingest-rates", nargs='+', type=float, default=FreshnessConfig().ingest_rates,
+        help="Background ingest rates in vectors per second of the freshness scenario, 0 for no background ingest. "
+             "Default is 0 1000 10000. E.g., --ingest-rates 0 5000"
+    )
+    parser.add_argument(
+        "--markers", type=int, default=FreshnessConfig().markers,
+        help="Number of marker vectors probed per ingest rate by the freshness scenario. Default is 100."
+    )
+    parser.add_argument(
+        "--churn-fraction", type=float, default=ChurnConfig().fraction,
+        help="Fraction of the dataset replaced per round by the churn scenario. Default is 0.05."
+    )
+    parser.add_argument(
+        "--churn-rounds", type=int, default=ChurnConfig().rounds,
+        help="Number of rounds of the churn scenario. Default is 5."
+    )
+    parser.add_argument(
+        "--churn-mode", type=str, default=ChurnConfig().mode.name.lower(),
+        help="Churn mode (in lowercase). Default is upsert. E.g., --churn-mode delete_insert"
+    )
+    parser.add_argument(
+        "--churn-modes-list", action='store_true',
+        help="Print a list of all possible churn-mode values and exit"
+    )
+    parser.add_argument(
+        "--prefix-fractions", nargs='+', type=float, default=PrefixScalingConfig().fractions,
+        help="Fractions of the dataset inserted up to every step of the prefix_scaling scenario. Default is 0.1 0.2 "
+             "... 1.0. E.g., --prefix-fractions 0.25 0.5 1"
+    )
+    parser.add_argument(
+        "--build-threads", nargs='+', type=int, default=[1, 2, 4, 8],
+        help="Numbers of index build threads of the build_scaling scenario. Default is 1 2 4 8. E.g., --build-threads "
+             "1 2 4 8 16 32 64"
+    )
+    parser.add_argument(
+        "--cpu-limits", nargs='+', type=float, default=[1, 2, 4, 8, 16],
+        help="Numbers of cores the database container is limited to in the query_scaling scenario. Default is "
+             "1 2 4 8 16. E.g., --cpu-limits 0.5 1 2 4"
+    )
+    parser.add_argument(
+        "--threads-per-core", type=int, default=2,
+        help="Number of concurrent query threads per core of the limit in the query_scaling scenario. Default is 2."
+    )
+    parser.add_argument(
+        "--memory-fractions", nargs='+', type=float, default=[1.5, 1.0, 0.5],
+        help="Memory limits of the memory_pressure scenario as fractions of the index size, on top of the memory of "
+             "the idle container. Default is 1.5 1.0 0.5. E.g., --memory-fractions 2 1 0.75 0.5 0.25"
+    )
+    parser.add_argument(
+        "--profile-queries", type=int, default=0,
+        help="Number of queries profiled for every ef value to split the latency into engine, network and client "
+             "time. Default is 0 (no profiling). E.g., --profile-queries 100"
+    )
+    parser.add_argument(
+        "--query-batch-size", type=int, default=1,
+        help="Number of standard queries sent at once. Default is 1. E.g., --query-batch-size 32"
+    )
+    parser.add_argument(
+        "--quantization", type=str, default="none",
+        help="Representation of the vectors in the pgvector index (none, halfvec or binary). Default is none. "
+             "E.g., --quantization binary"
+    )
+    parser.add_argument(
+        "--rerank-factor", type=int, default=4,
+        help="Number of candidates per result re-ranked with the full vectors if the pgvector index is quantized. "
+             "Default is 4. E.g., --rerank-factor 10"
+    )
+    parser.add_argument(
+        "--filter-strategy", type=str, default="index",
+        help="Execution of filtered pgvector queries (index, pre_filter, post_filter, partial_index or auto). Default "
+             "is index. E.g., --filter-strategy auto"
+    )
+    parser.add_argument(
+        "--filter-factor", type=int, default=10,
+        help="Number of candidates per result of the post_filter strategy. Default is 10. E.g., --filter-factor 20"
+    )
+    parser.add_argument(
+        "--partial-indexes", type=int, default=10,
+        help="Number of the most frequent filter values with a partial index of the partial_index and auto "
+             "strategies. Default is 10. E.g., --partial-indexes 5"
+    )
+    parser.add_argument(
+        "--cache-mode", type=str, default="none",
+        help="State of the pgvector caches before the queries of every ef value (none, warm or cold). Default is none. "
+             "E.g., --cache-mode cold"
+    )
+    parser.add_argument(
+        "--partition-key", action="store_true",
+        help="Make the metadata the partition key of the Milvus collection, so filtered queries only search the "
+             "partition of the filter value."
+    )
+    parser.add_argument(
+        "--scalar-index", type=str, default="none",
+        help="Index of the Milvus metadata field (none, inverted or trie). Default is none. E.g., --scalar-index "
+             "inverted"
+    )
+    parser.add_argument(
+        "--consistency-level", type=str, default="bounded",
+        help="Consistency level of the Milvus searches (strong, bounded, session or eventually). Default is bounded. "
+             "E.g., --consistency-level strong"
+    )
+    parser.add_argument(
+        "--mmap", action="store_true",
+        help="Memory-map the fields and the vector index of the loaded Milvus collection."
+    )
 
     args: Namespace = parser.parse_args()
 
@@ -80,6 +470,16 @@ def main() -> None:
         print_enum_keys(QueryMode, "query-modes")
         return
 
+    # Handle the --scenarios-list argument
+    if args.scenarios_list:
+        print_enum_keys(Scenario, "scenario")
+        return
+
+    # Handle the --churn-modes-list argument
+    if args.churn_modes_list:
+        print_enum_keys(ChurnMode, "churn-mode")
+        return
+
     # Convert dataset input to uppercase to match the dictionary keys
     dataset_key: str = args.dataset.upper()
 
@@ -92,6 +492,9 @@ def main() -> None:
     # Convert query-mode inputs to uppercase to match the Enum keys
     query_mode_key: str = args.query_mode.upper()
 
+    # Convert scenario input to uppercase to match the Enum keys
+    scenario_key: str = args.scenario.upper()
+
     # Process the dataset
     if dataset_key in dataset_mapper.keys():
         dataset: Dataset = dataset_mapper[dataset_key]()
@@ -116,6 +519,62 @@ def main() -> None:
         print(f"Error: {query_mode_key.lower()} is not a valid query mode.")
         return
 
+    # Process scenario
+    if scenario_key and scenario_key in Scenario.__members__:
+        scenario: Scenario = Scenario[scenario_key]
+        print(f"Scenario set to: {scenario_key.lower()}")
+    else:
+        print(f"Error: {scenario_key.lower()} is not a valid scenario.")
+        return
+
+    # Process churn-mode
+    churn_mode_key: str = args.churn_mode.upper()
+    if churn_mode_key in ChurnMode.__members__:
+        churn_mode: ChurnMode = ChurnMode[churn_mode_key]
+    else:
+        print(f"Error: {churn_mode_key.lower()} is not a valid churn mode.")
+        return
+
+    # Process quantization
+    quantization_key: str = args.quantization.upper()
+    if quantization_key in Quantization.__members__:
+        quantization: Quantization = Quantization[quantization_key]
+    else:
+        print(f"Error: {quantization_key.lower()} is not a valid quantization.")
+        return
+
+    # Process filter-strategy
+    filter_strategy_key: str = args.filter_strategy.upper()
+    if filter_strategy_key in FilterStrategy.__members__:
+        filter_strategy: FilterStrategy = FilterStrategy[filter_strategy_key]
+    else:
+        print(f"Error: {filter_strategy_key.lower()} is not a valid filter strategy.")
+        return
+
+    # Process cache-mode
+    cache_mode_key: str = args.cache_mode.upper()
+    if cache_mode_key in CacheMode.__members__:
+        cache_mode: CacheMode = CacheMode[cache_mode_key]
+    else:
+        print(f"Error: {cache_mode_key.lower()} is not a valid cache mode.")
+        return
+
+    # Process scalar-index
+    scalar_index_key: str = args.scalar_index.upper()
+    if scalar_index_key in ScalarIndexType.__members__:
+        scalar_index: ScalarIndexType = ScalarIndexType[scalar_index_key]
+    else:
+        print(f"Error: {scalar_index_key.lower()} is not a valid scalar index.")
+        return
+
+    # Process consistency-level
+    consistency_level_key: str = args.consistency_level.upper()
+    if consistency_level_key in ConsistencyLevel.__members__:
+        consistency_level: ConsistencyLevel = ConsistencyLevel[consistency_level_key]
+    else:
+        print(f"Error: {consistency_level_key.lower()} is not a valid consistency level.")
+        return
+
     # Process clients
     client_tasks: list[HNSWTask] = []
     container: list[ContainerMonitor] = []
@@ -129,17 +588,45 @@ def main() -> None:
             print(f"Error: {client_key.lower()} is not a valid client name.")
             return
 
-    case: HNSWCase = HNSWCase(dataset, HNSWConfig(), index_time_value, query_mode)
+    # Every combination of M and ef_construction is a build configuration of the grid
+    grid: HNSWGridConfig = HNSWGridConfig(args.m, args.ef_construction, args.ef_search)
+    build_configs: list[HNSWConfig] = grid.build_configs()
+    insert_workers: int = args.workers[0] if args.workers else 1
+    case: HNSWCase = HNSWCase(dataset, build_configs[0], index_time_value, query_mode, insert_workers,
+                              args.profile_queries, args.query_batch_size, quantization, args.rerank_factor,
+                              filter_strategy, args.filter_factor, args.partial_indexes, cache_mode,
+                              args.partition_key, scalar_index, consistency_level, args.mmap)
 
     logging.basicConfig(level=logging.WARNING, format="%(asctime)s %(levelname)s %(name)s %(message)s")
     logging.getLogger("ecovdbs.runner.runner").setLevel(logging.INFO)
+    logging.getLogger("ecovdbs.runner.mixed_workload").setLevel(logging.INFO)
+    logging.getLogger("ecovdbs.runner.freshness").setLevel(logging.INFO)
+    logging.getLogger("ecovdbs.runner.churn").setLevel(logging.INFO)
+    logging.getLogger("ecovdbs.runner.prefix_scaling").setLevel(logging.INFO)
+    logging.getLogger("ecovdbs.runner.build_scaling").setLevel(logging.INFO)
+    logging.getLogger("ecovdbs.runner.query_scaling").setLevel(logging.INFO)
+    logging.getLogger("ecovdbs.runner.memory_pressure").setLevel(logging.INFO)
 
-    results: list[HNSWRunnerResult] = []
-    for task, monitor in zip(client_tasks, container):
-        monitor.start()
-        runner: HNSWRunner = HNSWRunner(task(case))
-        res: HNSWRunnerResult = runner.run()
-        monitor.stop()
-        results.append(res)
-        save_hnsw_runner_result(res)
-    plot_results(results)
+    if scenario == Scenario.HNSW:
+        run_hnsw(client_tasks, container, case, build_configs)
+    elif scenario == Scenario.INSERT_SCALING:
+        run_insert_scaling(client_tasks, container, case, args.workers or [1, 2, 4, 8])
+    elif scenario == Scenario.BATCH_SIZE_CALIBRATION:
+        run_batch_size_calibration(client_tasks, container, case, args.batch_sizes, args.sample_size)
+    elif scenario == Scenario.MIXED_WORKLOAD:
+        run_mixed_workload(client_tasks, container, case, MixedWorkloadConfig(args.initial_fraction, args.write_rate,
+                                                                              args.writers, args.readers))
+    elif scenario == Scenario.FRESHNESS:
+        run_freshness(client_tasks, container, case, FreshnessConfig(args.initial_fraction, args.ingest_rates,
+                                                                     args.markers))
+    elif scenario == Scenario.CHURN:
+        run_churn(client_tasks, container, case, ChurnConfig(args.churn_fraction, args.churn_rounds, churn_mode))
+    elif scenario == Scenario.PREFIX_SCALING:
+        run_prefix_scaling(client_tasks, container, case, PrefixScalingConfig(args.prefix_fractions))
+    elif scenario == Scenario.BUILD_SCALING:
+        run_build_scaling(client_tasks, container, case, args.build_threads)
+    elif scenario == Scenario.QUERY_SCALING:
+        run_query_scaling(client_tasks, container, case,
+                          QueryScalingConfig(sorted(args.cpu_limits), args.threads_per_core))
+    elif scenario == Scenario.MEMORY_PRESSURE:
+        run_memory_pressure(client_tasks, container, case, MemoryPressureConfig(args.memory_fractions))
@@ -2,38 +2,91 @@ import os
 import time
 
 import matplotlib.pyplot as plt
+import numpy as np
 
 from ..config import PLOT_BASE_PATH
-from ..runner.result_config import HNSWRunnerResult
+from ..runner.result_config import HNSWRunnerResult, InsertScalingResult, BatchSizeCalibrationResult, \
+    MixedWorkloadResult, FreshnessResult, ChurnResult, PrefixScalingResult, BuildScalingResult, \
+    MemoryPressureResult
 
 
 def plot_results(results: list[HNSWRunnerResult], timestamp: str = time.strftime('%Y-%m-%d-%H-%M-%S')) -> None:
-    plots: list[tuple[plt.Figure, str]] = [plot_insert_time(results), plot_qps_recall(results),
+    plots: list[tuple[plt.Figure, str]] = [plot_insert_time(results), plot_insert_throughput(results),
+                                           plot_qps_recall(results),
                                            plot_query_time_recall(results), plot_index_size(results),
                                            plot_disk_size(results)]
+    if any(ef_result.latency_breakdown is not None for result in results
+           for mode_result in result.query_result.mode_results for ef_result in mode_result.ef_results):
+        plots.append(plot_latency_breakdown(results))
+    if any(result.storage_samples for result in results):
+        plots.append(plot_storage_breakdown(results))
     for fig, title in plots:
         fig.savefig(os.path.join(PLOT_BASE_PATH, f"{timestamp}-{title}.png"))
         plt.close(fig)
 
 
+def _runner_label(result: HNSWRunnerResult) -> str:
+    """
+    Label a runner by its client and, if the index is not HNSW, by the index type.
+
+    :param result: The HNSWRunnerResult object.
+    """
+    # The index configuration of a result read from a file stores the parameters instead of the methods
+    index_param = result.index_config.index_param
+    index_type = str((index_param() if callable(index_param) else index_param).get("index_type", "HNSW"))
+    label = type(result.client).__name__
+    return label if index_type.upper() == "HNSW" else f"{label} {index_type}"
+
+
 def plot_insert_time(results: list[HNSWRunnerResult]) -> (plt.Figure, str):
     """
-    Plot insertion time for each runner in the results.
+    Plot insertion time for each runner in the results. The bars are stacked by the insertion, the index creation and
+    the time waited until the index was ready.
 
     :param results: List of HNSWRunnerResult objects.
     """
+    t_insert = np.array([result.insert_result.t_insert for result in results])
+    t_index = np.array([result.insert_result.t_index for result in results])
+    t_ready = np.array([result.insert_result.t_ready for result in results])
     times = [result.insert_result.t_insert_index for result in results]
-    labels = [type(res.client).__name__ for res in results]
+    labels = [_runner_label(res) for res in results]
 
     fig, ax = plt.subplots()
-    ax.bar(labels, times)
+    ax.bar(labels, t_insert, label='Insert')
+    ax.bar(labels, t_index, bottom=t_insert, label='Index')
+    ax.bar(labels, t_ready, bottom=t_insert + t_index, label='Index ready')
     ax.set_ylabel('Time (seconds)')
     ax.set_title('Insertion and Index Time')
+    ax.legend()
     for t, label in zip(times, labels):
         ax.annotate(f'{t:.2f}', (label, t))
     return fig, "InsertionIndexTime"
 
 
+def plot_insert_throughput(results: list[HNSWRunnerResult]) -> (plt.Figure, str):
+    """
+    Plot the throughput of the insertion, the index creation and the index creation until the index was ready for each
+    runner in the results.
+
+    :param results: List of HNSWRunnerResult objects.
+    """
+    phases = [('Insert', [result.insert_result.insert_throughput for result in results]),
+              ('Index', [result.insert_result.index_throughput for result in results]),
+              ('Index ready', [result.insert_result.ready_throughput for result in results])]
+    labels = [_runner_label(res) for res in results]
+    x = np.arange(len(labels))
+    width = 0.8 / len(phases)
+
+    fig, ax = plt.subplots()
+    for i, (phase, throughputs) in enumerate(phases):
+        ax.bar(x + i * width, throughputs, width, label=phase)
+    ax.set_xticks(x + width * (len(phases) - 1) / 2, labels)
+    ax.set_ylabel('Vectors per second')
+    ax.set_title('Insertion and Index Throughput')
+    ax.legend()
+    return fig, "InsertionIndexThroughput"
+
+
 def plot_qps_recall(results: list[HNSWRunnerResult]) -> (plt.Figure, str):
     """
     Plot Queries Per Second (QPS) against Average Recall for each mode.
@@ -48,7 +101,7 @@ def plot_qps_recall(results: list[HNSWRunnerResult]) -> (plt.Figure, str):
         fig, ax = plt.subplots()
 
         for result in results:
-            runner_label = type(result.client).__name__
+            runner_label = _runner_label(result)
             for mode_result in result.query_result.mode_results:
                 if mode_result.mode == mode:
                     recalls = []
@@ -80,7 +133,7 @@ def plot_query_time_recall(results: list[HNSWRunnerResult]) -> (plt.Figure, str)
         fig, ax = plt.subplots()
 
         for result in results:
-            runner_label = type(result.client).__name__
+            runner_label = _runner_label(result)
             for mode_result in result.query_result.mode_results:
                 if mode_result.mode == mode:
                     recalls = []
@@ -105,7 +158,7 @@ def plot_index_size(results: list[HNSWRunnerResult]) -> (plt.Figure, str):
     :param results: List of HNSWRunnerResult objects.
     """
     index_sizes = [result.index_size for result in results]
-    labels = [type(res.client).__name__ for res in results]
+    labels = [_runner_label(res) for res in results]
 
     fig, ax = plt.subplots()
     ax.bar(labels, index_sizes)
@@ -116,6 +169,85 @@ def plot_index_size(results: list[HNSWRunnerResult]) -> (plt.Figure, str):
     return fig, "IndexSize"
 
 
+def plot_latency_breakdown(results: list[HNSWRunnerResult]) -> (plt.Figure, str):
+    """
+    Plot the split of the query latency into engine, network and client time as stacked bars for each runner and ef
+    value in the results. Without an engine time, the client time contains the engine time.
+
+    :param results: List of HNSWRunnerResult objects.
+    """
+    labels: list[str] = []
+    engine_times: list[float] = []
+    network_times: list[float] = []
+    client_times: list[float] = []
+    for result in results:
+        for ef_result in result.query_result.mode_results[0].ef_results:
+            breakdown = ef_result.latency_breakdown
+            if breakdown is None:
+                continue
+            labels.append(f"{_runner_label(result)}\nef={ef_result.ef}")
+            engine_times.append((breakdown.engine_time or 0.0) * 1000)
+            network_times.append(breakdown.network_time * 1000)
+            client_times.append(breakdown.client_time * 1000)
+
+    fig, ax = plt.subplots(figsize=(max(6.0, len(labels) * 0.8), 5))
+    ax.bar(labels, engine_times, label='Engine')
+    ax.bar(labels, network_times, bottom=engine_times, label='Network')
+    ax.bar(labels, client_times, bottom=np.add(engine_times, network_times), label='Client')
+    ax.set_ylabel('Latency (ms)')
+    ax.set_title('Query Latency Breakdown')
+    ax.tick_params(axis='x', labelsize=8)
+    ax.legend()
+    return fig, "LatencyBreakdown"
+
+
+def plot_storage_breakdown(results: list[HNSWRunnerResult]) -> (plt.Figure, str):
+    """
+    Plot the storage components as stacked bars for each runner and storage sample in the results (left) and the
+    write-ahead log written in every phase (right).
+
+    :param results: List of HNSWRunnerResult objects.
+    """
+    components = ["heap", "toast", "fsm", "vm", "vector_index", "other_indexes"]
+    # Other databases report their own components, e.g. the memory of every loaded Milvus segment
+    components += sorted({component for result in results for sample in result.storage_samples
+                          for component in sample.components} - set(components) - {"wal"})
+    labels: list[str] = []
+    sizes: dict[str, list[float]] = {component: [] for component in components}
+    wal_labels: list[str] = []
+    wal_sizes: list[float] = []
+    for result in results:
+        runner_label = _runner_label(result)
+        before: dict[str, float] = {}
+        for sample in result.storage_samples:
+            labels.append(f"{runner_label}\n{sample.name}")
+            for component in components:
+                sizes[component].append(sample.components.get(component, 0.0))
+            if sample.name.startswith("before_"):
+                before[sample.name[len("before_"):]] = sample.components.get("wal", 0.0)
+            elif sample.name.startswith("after_") and sample.name[len("after_"):] in before:
+                phase = sample.name[len("after_"):]
+                wal_labels.append(f"{runner_label}\n{phase}")
+                wal_sizes.append(sample.components.get("wal", 0.0) - before[phase])
+
+    fig, (ax_storage, ax_wal) = plt.subplots(1, 2, figsize=(max(12.0, len(labels) * 0.6), 6))
+    bottom = np.zeros(len(labels))
+    for component in components:
+        ax_storage.bar(labels, sizes[component], bottom=bottom, label=component)
+        bottom += sizes[component]
+    ax_storage.set_ylabel('Size (MB)')
+    ax_storage.set_title('Storage Breakdown')
+    ax_storage.tick_params(axis='x', labelsize=7, labelrotation=90)
+    ax_storage.legend()
+
+    ax_wal.bar(wal_labels, wal_sizes)
+    ax_wal.set_ylabel('WAL written (MB)')
+    ax_wal.set_title('Write-Ahead Log per Phase')
+    ax_wal.tick_params(axis='x', labelsize=7, labelrotation=90)
+    fig.tight_layout()
+    return fig, "StorageBreakdown"
+
+
 def plot_disk_size(results: list[HNSWRunnerResult]) -> (plt.Figure, str):
     """
     Plot disk size for each runner in the results.
@@ -123,7 +255,7 @@ def plot_disk_size(results: list[HNSWRunnerResult]) -> (plt.Figure, str):
     :param results: List of HNSWRunnerResult objects.
     """
     disk_sizes = [result.disk_size for result in results]
-    labels = [type(res.client).__name__ for res in results]
+    labels = [_runner_label(res) for res in results]
 
     fig, ax = plt.subplots()
     ax.bar(labels, disk_sizes)
@@ -132,3 +264,277 @@ def plot_disk_size(results: list[HNSWRunnerResult]) -> (plt.Figure, str):
     for disk_size, label in zip(disk_sizes, labels):
         ax.annotate(f'{disk_size:.2f}', (label, disk_size))
     return fig, "DiskSize"
+
+
+def plot_insert_scaling(results: list[InsertScalingResult], timestamp: str = time.strftime('%Y-%m-%d-%H-%M-%S')) -> None:
+    """
+    Plot the insertion throughput against the number of parallel workers for each client in the results.
+
+    :param results: List of InsertScalingResult objects.
+    :param timestamp: Timestamp used as prefix of the file name.
+    """
+    fig, ax = plt.subplots()
+    for result in results:
+        workers = [insert_result.workers for insert_result in result.insert_results]
+        throughputs = [insert_result.insert_throughput for insert_result in result.insert_results]
+        ax.plot(workers, throughputs, marker='o', label=type(result.client).__name__)
+    ax.set_xscale('log', base=2)
+    ax.set_xlabel('Workers')
+    ax.set_ylabel('Vectors per second')
+    ax.set_title('Insertion Throughput/Workers')
+    ax.legend()
+    fig.savefig(os.path.join(PLOT_BASE_PATH, f"{timestamp}-InsertScaling.png"))
+    plt.close(fig)
+
+
+def plot_batch_size_calibration(results: list[BatchSizeCalibrationResult],
+                                timestamp: str = time.strftime('%Y-%m-%d-%H-%M-%S')) -> None:
+    """
+    Plot the insertion throughput against the batch size for each client in the results.
+
+    :param results: List of BatchSizeCalibrationResult objects.
+    :param timestamp: Timestamp used as prefix of the file name.
+    """
+    fig, ax = plt.subplots()
+    for result in results:
+        throughputs = [insert_result.insert_throughput for insert_result in result.insert_results]
+        ax.plot(result.batch_sizes, throughputs, marker='o',
+                label=f"{type(result.client).__name__} (best {result.best_batch_size})")
+    ax.set_xscale('log', base=2)
+    ax.set_xlabel('Batch size')
+    ax.set_ylabel('Vectors per second')
+    ax.set_title('Insertion Throughput/Batch Size')
+    ax.legend()
+    fig.savefig(os.path.join(PLOT_BASE_PATH, f"{timestamp}-BatchSizeCalibration.png"))
+    plt.close(fig)
+
+
+def plot_mixed_workload(results: list[MixedWorkloadResult],
+                        timestamp: str = time.strftime('%Y-%m-%d-%H-%M-%S')) -> None:
+    """
+    Plot the queries per second, the recall and the p99 query time over the time of the workload for each client in
+    the results.
+
+    :param results: List of MixedWorkloadResult objects.
+    :param timestamp: Timestamp used as prefix of the file name.
+    """
+    fig, (ax_qps, ax_recall, ax_p99) = plt.subplots(3, 1, sharex=True, figsize=(8, 10))
+    for result in results:
+        starts = [window.start for window in result.windows]
+        label = type(result.client).__name__
+        ax_qps.plot(starts, [window.queries_per_second for window in result.windows], label=label)
+        ax_recall.plot(starts, [window.avg_recall for window in result.windows], label=label)
+        ax_p99.plot(starts, [window.p99_query_time * 1000 for window in result.windows], label=label)
+    ax_qps.set_ylabel('Queries per second')
+    ax_qps.set_title('Mixed Workload')
+    ax_qps.legend()
+    ax_recall.set_ylabel('Recall')
+    ax_p99.set_ylabel('p99 query time (ms)')
+    ax_p99.set_xlabel('Time (s)')
+    fig.savefig(os.path.join(PLOT_BASE_PATH, f"{timestamp}-MixedWorkload.png"))
+    plt.close(fig)
+
+
+def plot_freshness(results: list[FreshnessResult], timestamp: str = time.strftime('%Y-%m-%d-%H-%M-%S')) -> None:
+    """
+    Plot the median and the 99th percentile of the visibility delay against the background ingest rate for each
+    client in the results.
+
+    :param results: List of FreshnessResult objects.
+    :param timestamp: Timestamp used as prefix of the file name.
+    """
+    fig, ax = plt.subplots()
+    for result in results:
+        rates = [rate_result.ingest_rate for rate_result in result.rate_results]
+        line, = ax.plot(rates, [rate_result.p50_delay * 1000 for rate_result in result.rate_results], marker='o',
+                        label=f"{type(result.client).__name__} p50")
+        ax.plot(rates, [rate_result.p99_delay * 1000 for rate_result in result.rate_results], marker='x',
+                linestyle='--', color=line.get_color(), label=f"{type(result.client).__name__} p99")
+    ax.set_yscale('log')
+    ax.set_xlabel('Background ingest rate (vectors per second)')
+    ax.set_ylabel('Visibility delay (ms)')
+    ax.set_title('Freshness/Ingest Rate')
+    ax.legend()
+    fig.savefig(os.path.join(PLOT_BASE_PATH, f"{timestamp}-Freshness.png"))
+    plt.close(fig)
+
+
+def plot_churn(results: list[ChurnResult], timestamp: str = time.strftime('%Y-%m-%d-%H-%M-%S')) -> None:
+    """
+    Plot the recall, the query time, the index size and the disk size against the replaced fraction of the dataset for
+    each client in the results. The recall and the query time are taken from the first ef value of the first query
+    mode.
+
+    :param results: List of ChurnResult objects.
+    :param timestamp: Timestamp used as prefix of the file name.
+    """
+    fig, ((ax_recall, ax_time), (ax_index, ax_disk)) = plt.subplots(2, 2, sharex=True, figsize=(12, 8))
+    for result in results:
+        label = type(result.client).__name__
+        fractions = [round_result.total_replaced_fraction for round_result in result.round_results]
+        ef_results = [round_result.query_result.mode_results[0].ef_results[0] for round_result in
+                      result.round_results]
+        ax_recall.plot(fractions, [ef_result.avg_recall for ef_result in ef_results], marker='o', label=label)
+        ax_time.plot(fractions, [ef_result.avg_query_time * 1000 for ef_result in ef_results], marker='o',
+                     label=label)
+        ax_index.plot(fractions, [round_result.index_size for round_result in result.round_results], marker='o',
+                      label=label)
+        ax_disk.plot(fractions, [round_result.disk_size for round_result in result.round_results], marker='o',
+                     label=label)
+    ax_recall.set_ylabel('Average Recall')
+    ax_recall.legend()
+    ax_time.set_ylabel('Average query time (ms)')
+    ax_index.set_ylabel('Index size (MB)')
+    ax_index.set_xlabel('Replaced fraction of the dataset')
+    ax_disk.set_ylabel('Disk size (MB)')
+    ax_disk.set_xlabel('Replaced fraction of the dataset')
+    fig.suptitle('Churn')
+    fig.savefig(os.path.join(PLOT_BASE_PATH, f"{timestamp}-Churn.png"))
+    plt.close(fig)
+
+
+def plot_prefix_scaling(results: list[PrefixScalingResult], extrapolation_factor: float = 10,
+                        timestamp: str = time.strftime('%Y-%m-%d-%H-%M-%S')) -> None:
+    """
+    Plot every fitted cost against the number of vectors for each client in the results. The measured steps are
+    plotted as points and the fitted power law as a line extrapolated beyond the dataset size.
+
+    :param results: List of PrefixScalingResult objects.
+    :param extrapolation_factor: The factor by which the fitted curves are extrapolated beyond the largest prefix.
+    :param timestamp: Timestamp used as prefix of the file name.
+    """
+    names = [fit.name for fit in results[0].fits] if results else []
+    fig, axes = plt.subplots(2, (len(names) + 1) // 2, figsize=(15, 8))
+    axes = axes.flatten()
+    for result in results:
+        for ax, fit in zip(axes, result.fits):
+            curve = np.geomspace(min(fit.num_vectors), max(fit.num_vectors) * extrapolation_factor, 50)
+            line, = ax.plot(curve, fit.coefficient * curve ** fit.exponent, linestyle='--',
+                            label=f"{type(result.client).__name__} (exponent {fit.exponent:.2f})")
+            ax.scatter(fit.num_vectors, fit.values, color=line.get_color())
+    for ax, name in zip(axes, names):
+        ax.set_xscale('log')
+        ax.set_yscale('log')
+        ax.set_xlabel('Vectors')
+        ax.set_title(name)
+        ax.legend()
+    for ax in axes[len(names):]:
+        ax.set_visible(False)
+    fig.suptitle('Prefix Scaling')
+    fig.savefig(os.path.join(PLOT_BASE_PATH, f"{timestamp}-PrefixScaling.png"))
+    plt.close(fig)
+
+
+def plot_build_scaling(results: list[BuildScalingResult], timestamp: str = time.strftime('%Y-%m-%d-%H-%M-%S')) -> None:
+    """
+    Plot the speedup, the parallel efficiency and the CPU usage of the index build against the number of build
+    threads for each client in the results. The dotted line in the speedup plot is the ideal linear speedup.
+
+    :param results: List of BuildScalingResult objects.
+    :param timestamp: Timestamp used as prefix of the file name.
+    """
+    fig, (ax_speedup, ax_efficiency, ax_cpu) = plt.subplots(1, 3, figsize=(18, 5))
+    for result in results:
+        threads = [step.threads for step in result.step_results]
+        label = type(result.client).__name__
+        if any(step.container_limited for step in result.step_results):
+            label += " (container limit)"
+        ax_speedup.plot(threads, [step.speedup for step in result.step_results], marker='o', label=label)
+        ax_efficiency.plot(threads, [step.parallel_efficiency for step in result.step_results], marker='o',
+                           label=label)
+        ax_cpu.plot(threads, [step.avg_cpu_usage / 100 for step in result.step_results], marker='o', label=label)
+    all_threads = sorted({step.threads for result in results for step in result.step_results})
+    if all_threads:
+        ax_speedup.plot(all_threads, [t / all_threads[0] for t in all_threads], linestyle=':', color='gray',
+                        label='Ideal')
+        ax_cpu.plot(all_threads, all_threads, linestyle=':', color='gray', label='Ideal')
+    for ax in (ax_speedup, ax_efficiency, ax_cpu):
+        ax.set_xscale('log', base=2)
+        ax.set_xlabel('Build threads')
+        ax.legend()
+    ax_speedup.set_ylabel('Speedup')
+    ax_speedup.set_title('Index Build Speedup')
+    ax_efficiency.set_ylabel('Parallel efficiency')
+    ax_efficiency.set_title('Index Build Efficiency')
+    ax_cpu.set_ylabel('Average used cores')
+    ax_cpu.set_title('Index Build CPU Usage')
+    fig.savefig(os.path.join(PLOT_BASE_PATH, f"{timestamp}-BuildScaling.png"))
+    plt.close(fig)
+
+
+def plot_query_scaling(results: list[list[HNSWRunnerResult]],
+                       timestamp: str = time.strftime('%Y-%m-%d-%H-%M-%S')) -> None:
+    """
+    Plot the queries per second and the queries per second per core against the CPU limit of the container for each
+    client and ef search value in the results. Scaling flattens where the queries per second per core drop.
+
+    :param results: List with the results of every CPU limit for each client.
+    :param timestamp: Timestamp used as prefix of the file name.
+    """
+    fig, (ax_qps, ax_qps_core) = plt.subplots(1, 2, figsize=(14, 5))
+    for client_results in results:
+        if not client_results:
+            continue
+        cores = [r.cpu_limit for r in client_results]
+        client_name = type(client_results[0].client).__name__
+        for mode_index, mode_result in enumerate(client_results[0].query_result.mode_results):
+            for ef_index, ef_result in enumerate(mode_result.ef_results):
+                qps = [r.query_result.mode_results[mode_index].ef_results[ef_index].queries_per_second
+                       for r in client_results]
+                label = f"{client_name} ef={ef_result.ef}"
+                ax_qps.plot(cores, qps, marker='o', label=label)
+                ax_qps_core.plot(cores, [q / c for q, c in zip(qps, cores)], marker='o', label=label)
+    for ax in (ax_qps, ax_qps_core):
+        ax.set_xscale('log', base=2)
+        ax.set_xlabel('CPU limit (cores)')
+        ax.legend()
+    ax_qps.set_yscale('log')
+    ax_qps.set_ylabel('Queries per second')
+    ax_qps.set_title('Query Throughput')
+    ax_qps_core.set_ylabel('Queries per second per core')
+    ax_qps_core.set_title('Query Throughput per Core')
+    fig.savefig(os.path.join(PLOT_BASE_PATH, f"{timestamp}-QueryScaling.png"))
+    plt.close(fig)
+
+
+def plot_memory_pressure(results: list[MemoryPressureResult],
+                         timestamp: str = time.strftime('%Y-%m-%d-%H-%M-%S')) -> None:
+    """
+    Plot the slowdown of the average query time and the major page faults against the memory limit as a fraction of the
+    index size for each client in the results. The slowdown is relative to the queries without a limit and uses the
+    largest ef search value. Limits at which the queries failed or processes were killed by the OOM killer are marked
+    with a dotted vertical line in the color of the client.
+
+    :param results: List of MemoryPressureResult objects.
+    :param timestamp: Timestamp used as prefix of the file name.
+    """
+    fig, (ax_slowdown, ax_faults) = plt.subplots(1, 2, figsize=(14, 5))
+    for result in results:
+        baseline = result.step_results[0].query_result
+        limited = result.step_results[1:]
+        if baseline is None or not limited:
+            continue
+        label = type(result.client).__name__
+        baseline_time = baseline.mode_results[0].ef_results[-1].avg_query_time
+        fractions = [step.index_fraction for step in limited]
+        slowdowns = [step.query_result.mode_results[0].ef_results[-1].avg_query_time / baseline_time
+                     if step.query_result is not None else np.nan for step in limited]
+        line, = ax_slowdown.plot(fractions, slowdowns, marker='o', label=label)
+        ax_faults.plot(fractions, [step.major_faults for step in limited], marker='o', color=line.get_color(),
+                       label=label)
+        failed = [step.index_fraction for step in limited
+                  if step.query_result is None or step.oom_killed or step.oom_kills > 0]
+        for fraction in failed:
+            ax_slowdown.axvline(fraction, color=line.get_color(), linestyle=':')
+            ax_faults.axvline(fraction, color=line.get_color(), linestyle=':')
+    for ax in (ax_slowdown, ax_faults):
+        ax.set_xlabel('Memory limit (fraction of index size)')
+        ax.invert_xaxis()
+        ax.legend()
+    ax_slowdown.axhline(1, linestyle=':', color='gray')
+    ax_slowdown.set_ylabel('Query time / query time without limit')
+    ax_slowdown.set_title('Query Slowdown under Memory Pressure')
+    ax_faults.set_ylabel('Major page faults')
+    ax_faults.set_title('Major Page Faults during Queries')
+    fig.savefig(os.path.join(PLOT_BASE_PATH, f"{timestamp}-MemoryPressure.png"))
+    plt.close(fig)
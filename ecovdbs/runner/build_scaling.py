@@ -0,0 +1,89 @@
+import logging
+from datetime import datetime
+
+from .result_config import BuildScalingResult, BuildScalingStepResult, InsertRunnerResult
+from .runner import InsertRunner
+from .task_config import HNSWTask, IndexTime, InsertConfig
+from ..client.base_client import BaseClient
+from ..docker_stats import ContainerMonitor
+
+log = logging.getLogger(__name__)
+
+
+class BuildScalingRunner:
+    """
+    Runner class for rebuilding the same index with an increasing number of build threads. The data is inserted only
+    once, then the index is dropped and rebuilt for every number of threads. Clients that build the index during the
+    insertion (:attr:`IndexTime.NO_INDEX`) insert the data again for every number of threads.
+
+    The number of threads is set with :meth:`BaseHNSWConfig.change_build_threads`. If the database has no build
+    thread setting, the CPU time of its container is limited to the number of threads instead.
+    """
+
+    def __init__(self, hnsw_task: HNSWTask, threads: list[int], monitor: ContainerMonitor):
+        """
+        Initialize the BuildScalingRunner with a given HNSW task, the numbers of threads and the container monitor.
+
+        :param hnsw_task: The HNSW task configuration (see :class:`HNSWTask`).
+        :param threads: The numbers of build threads in increasing order.
+        :param monitor: The running monitor of the database container. It provides the CPU usage during the builds
+            and limits the container if necessary.
+        """
+        self.__client: BaseClient = hnsw_task.client
+        self.__index_config = hnsw_task.query_config.index_config
+        self.__threads: list[int] = threads
+        self.__monitor: ContainerMonitor = monitor
+        query_mode = hnsw_task.insert_config.query_mode
+        workers = hnsw_task.insert_config.workers
+        if hnsw_task.insert_config.index_time == IndexTime.NO_INDEX:
+            self.__insert_runner = None
+            self.__build_runner = InsertRunner(hnsw_task.client, hnsw_task.insert_config, hnsw_task.dataset)
+        else:
+            self.__insert_runner = InsertRunner(
+                hnsw_task.client, InsertConfig(IndexTime.NO_INDEX, query_mode, workers), hnsw_task.dataset)
+            self.__build_runner = InsertRunner(
+                hnsw_task.client, InsertConfig(IndexTime.POST_INDEX, query_mode, workers), hnsw_task.dataset)
+
+    def run(self) -> BuildScalingResult:
+        """
+        Build the index for every number of threads.
+
+        :return: Result of the build scaling scenario (see :class:`BuildScalingResult`).
+        """
+        log.info("Start BuildScalingRunner for client %s", type(self.__client).__name__)
+        if self.__insert_runner is not None:
+            self.__insert_runner.run()
+        step_results: list[BuildScalingStepResult] = []
+        container_limited = False
+        try:
+            for threads in self.__threads:
+                container_limited = self.__apply_threads(threads)
+                log.info("Build index with %d threads", threads)
+                start = datetime.now()
+                insert_result: InsertRunnerResult = self.__build_runner.rebuild()
+                end = datetime.now()
+                t_build = insert_result.t_insert_index
+                speedup = step_results[0].t_build / t_build if step_results and t_build > 0 else 1.0
+                step_results.append(BuildScalingStepResult(
+                    threads, container_limited, insert_result, t_build, speedup,
+                    speedup * self.__threads[0] / threads, self.__monitor.average_cpu_usage(start, end)))
+        finally:
+            if container_limited:
+                self.__monitor.limit_cpus(None)
+        return BuildScalingResult(self.__client, self.__index_config, step_results)
+
+    def __apply_threads(self, threads: int) -> bool:
+        """
+        Set the number of build threads of the index or limit the container if the index has no thread setting.
+
+        :param threads: The number of build threads.
+        :return: True if the container was limited instead of setting the number of threads of the index.
+        """
+        try:
+            self.__index_config.change_build_threads(threads)
+            return False
+        except NotImplementedError:
+            log.info("%s has no build thread setting, limit the container to %d cores",
+                     type(self.__client).__name__, threads)
+            self.__monitor.limit_cpus(threads)
+            return True
@@ -1,6 +1,7 @@
 from dataclasses import dataclass, field
 from enum import Enum
 
+from ..client.base_config import Quantization, FilterStrategy, CacheMode, ScalarIndexType, ConsistencyLevel
 from ..dataset.dataset import Dataset
 from ..dataset.dataset_reader import read_sift_small
 
@@ -33,6 +34,48 @@ class QueryMode(Enum):
     RANGED_QUERY = 2
 
 
+class Scenario(Enum):
+    """
+    Enum class for the benchmark scenario.
+
+    Attributes:
+        HNSW: Insert the data, create the index and run the queries.
+        INSERT_SCALING: Insert the data with an increasing number of parallel workers.
+        BATCH_SIZE_CALIBRATION: Insert a sample of the data with different batch sizes and save the best batch size.
+        MIXED_WORKLOAD: Insert a part of the data and run the queries while the rest of the data is inserted.
+        FRESHNESS: Measure how long newly inserted vectors take to become searchable under different ingest rates.
+        CHURN: Replace a part of the data in rounds and run the queries after every round.
+        PREFIX_SCALING: Insert the data in growing prefixes and measure the costs at every prefix size.
+        BUILD_SCALING: Rebuild the index with an increasing number of build threads.
+        QUERY_SCALING: Run the queries concurrently while the database container is limited to an increasing number
+            of cores.
+        MEMORY_PRESSURE: Run the queries while the memory of the database container is limited relative to the index
+            size.
+    """
+    HNSW = 0
+    INSERT_SCALING = 1
+    BATCH_SIZE_CALIBRATION = 2
+    MIXED_WORKLOAD = 3
+    FRESHNESS = 4
+    CHURN = 5
+    PREFIX_SCALING = 6
+    BUILD_SCALING = 7
+    QUERY_SCALING = 8
+    MEMORY_PRESSURE = 9
+
+
+class ChurnMode(Enum):
+    """
+    Enum class for the way vectors are replaced by the churn scenario.
+
+    Attributes:
+        UPSERT: Replace the vectors with :meth:`BaseClient.upsert`.
+        DELETE_INSERT: Delete the vectors with :meth:`BaseClient.delete` and insert them again.
+    """
+    UPSERT = 0
+    DELETE_INSERT = 1
+
+
 @dataclass
 class HNSWConfig:
     """
@@ -50,6 +93,132 @@ class HNSWConfig:
     ef_search: list[int] = field(default_factory=lambda: [120, 200, 400, 800])
 
 
+@dataclass
+class HNSWGridConfig:
+    """
+    Configuration class for a grid of HNSW parameters. Every combination of ``M`` and ``ef_construction`` is a build
+    configuration and every build configuration is queried with all values of ``ef_search``.
+
+    Attributes:
+        M: A list of values for the number of bidirectional links. Default is [24].
+        ef_construction: A list of sizes for the dynamic list used during the index construction. Default is [200].
+        ef_search: A list of sizes for the dynamic list for the nearest neighbors (used during search). Default is a
+            list of values [120, 200, 400, 800].
+    """
+    M: list[int] = field(default_factory=lambda: [24])
+    ef_construction: list[int] = field(default_factory=lambda: [200])
+    ef_search: list[int] = field(default_factory=lambda: [120, 200, 400, 800])
+
+    def build_configs(self) -> list[HNSWConfig]:
+        """
+        Get all build configurations of the grid.
+
+        :return: A list of HNSW configurations, one for every combination of ``M`` and ``ef_construction`` (see
+            :class:`HNSWConfig`).
+        """
+        return [HNSWConfig(m, ef_construction, self.ef_search) for m in self.M for ef_construction in
+                self.ef_construction]
+
+
+@dataclass
+class MixedWorkloadConfig:
+    """
+    Configuration class for a mixed read/write workload.
+
+    Attributes:
+        initial_fraction: The fraction of the dataset that is inserted (and indexed) before the workload starts.
+            Default is 0.5.
+        write_rate: The number of vectors per second inserted by all writers together. 0 inserts as fast as possible.
+            Default is 1000.
+        writers: The number of writer threads inserting the rest of the dataset. Default is 1.
+        readers: The number of reader threads running the queries while the writers insert. Default is 1.
+        window: The length of the time windows in seconds used for the results over time. Default is 1.
+    """
+    initial_fraction: float = 0.5
+    write_rate: float = 1000
+    writers: int = 1
+    readers: int = 1
+    window: float = 1
+
+
+@dataclass
+class FreshnessConfig:
+    """
+    Configuration class for the freshness (time-to-searchable) measurement.
+
+    Attributes:
+        initial_fraction: The fraction of the dataset that is inserted (and indexed) before the measurement starts.
+            Default is 0.5.
+        ingest_rates: The background ingest rates in vectors per second. The markers are probed once for every rate,
+            0 probes without background ingest. Default is 0, 1000 and 10000.
+        markers: The number of marker vectors probed for every ingest rate. Default is 100.
+        timeout: The number of seconds after which a marker that is not found counts as a timeout. Default is 30.
+        poll_interval: The number of seconds between two queries for a marker that is not yet found. Default is 0.005.
+    """
+    initial_fraction: float = 0.5
+    ingest_rates: list[float] = field(default_factory=lambda: [0, 1000, 10000])
+    markers: int = 100
+    timeout: float = 30
+    poll_interval: float = 0.005
+
+
+@dataclass
+class ChurnConfig:
+    """
+    Configuration class for the churn scenario. In every round a random part of the vectors is replaced by the same
+    vectors under the same ids, so the ground truth stays valid while the index accumulates deleted entries.
+
+    Attributes:
+        fraction: The fraction of the dataset replaced in every round. Default is 0.05.
+        rounds: The number of rounds. Default is 5.
+        mode: The way the vectors are replaced (see :class:`ChurnMode`). Default is UPSERT.
+        seed: The seed for choosing the replaced vectors. Default is 0.
+    """
+    fraction: float = 0.05
+    rounds: int = 5
+    mode: ChurnMode = ChurnMode.UPSERT
+    seed: int = 0
+
+
+@dataclass
+class PrefixScalingConfig:
+    """
+    Configuration class for the prefix scaling scenario.
+
+    Attributes:
+        fractions: The increasing fractions of the dataset inserted up to every step. Default is 0.1, 0.2, ..., 1.0.
+        extrapolation_factor: The factor by which the fitted cost curves are extrapolated beyond the dataset size in
+            the plots. Default is 10.
+    """
+    fractions: list[float] = field(default_factory=lambda: [i / 10 for i in range(1, 11)])
+    extrapolation_factor: float = 10
+
+
+@dataclass
+class QueryScalingConfig:
+    """
+    Configuration class for the query scaling scenario.
+
+    Attributes:
+        cpu_limits: The numbers of cores the database container is limited to. Default is 1, 2, 4, 8 and 16.
+        threads_per_core: The number of concurrent query threads per core of the limit. Default is 2.
+    """
+    cpu_limits: list[float] = field(default_factory=lambda: [1, 2, 4, 8, 16])
+    threads_per_core: int = 2
+
+
+@dataclass
+class MemoryPressureConfig:
+    """
+    Configuration class for the memory pressure scenario.
+
+    Attributes:
+        index_fractions: The memory limits of the database container as fractions of the index size. The memory used
+            by the idle container is added to every limit. Default is 1.5, 1 and 0.5.
+    """
+    index_fractions: list[float] = field(default_factory=lambda: [1.5, 1.0, 0.5])
+
+
 @dataclass
 class HNSWCase:
     """
@@ -60,11 +229,53 @@ class HNSWCase:
         hnsw_config: Configuration for the HNSW algorithm (see :class:`HNSWConfig`).
         index_time: The time at which the index is created (see :class:`IndexTime`).
         query_mode: The query mode (see :class:`QueryMode`).
+        insert_workers: The number of parallel workers inserting the data. Default is 1.
+        profile_queries: The number of queries profiled for every ef value. Default is 0 (no profiling).
+        query_batch_size: The number of standard queries sent at once. Default is 1.
+        quantization: The representation of the vectors in the index (see :class:`Quantization`). Only used by
+            pgvector. Default is no quantization.
+        rerank_factor: The number of candidates per result that are re-ranked with the full vectors if the index is
+            quantized. Default is 4.
+        filter_strategy: The execution of filtered queries (see :class:`FilterStrategy`). Only used by pgvector.
+            Default is to filter the results of the vector index.
+        filter_factor: The number of candidates per result of the post-filter strategy. Default is 10.
+        partial_indexes: The number of filter values with a partial index of the partial index strategy. Default is
+            10.
+        cache_mode: The state of the caches before the queries of every ef value (see :class:`CacheMode`). Only used
+            by pgvector. Default is to leave the caches as they are.
+        partition_key: Whether the metadata is the partition key of the collection. Only used by Milvus. Default is
+            False.
+        scalar_index: The index of the metadata (see :class:`ScalarIndexType`). Only used by Milvus. Default is no
+            index.
+        consistency_level: The consistency level of the searches (see :class:`ConsistencyLevel`). Only used by Milvus.
+            Default is bounded staleness.
+        mmap: Whether the loaded collection and its vector index are memory-mapped. Only used by Milvus. Default is
+            False.
     """
     dataset: Dataset
     hnsw_config: HNSWConfig
     index_time: IndexTime
     query_mode: QueryMode
+    insert_workers: int = 1
+    profile_queries: int = 0
+    query_batch_size: int = 1
+    quantization: Quantization = Quantization.NONE
+    rerank_factor: int = 4
+    filter_strategy: FilterStrategy = FilterStrategy.INDEX
+    filter_factor: int = 10
+    partial_indexes: int = 10
+    cache_mode: CacheMode = CacheMode.NONE
+    partition_key: bool = False
+    scalar_index: ScalarIndexType = ScalarIndexType.NONE
+    consistency_level: ConsistencyLevel = ConsistencyLevel.BOUNDED
+    mmap: bool = False
+
 
+def test_case() -> HNSWCase:
+    """
+    Build a small HNSW case on the SIFT small dataset. It is built on demand, so importing the configs does not download
+    the dataset.
 
-TEST_CASE = HNSWCase(read_sift_small(), HNSWConfig(), IndexTime.PRE_INDEX, QueryMode.QUERY)
+    :return: The test case.
+    """
+    return HNSWCase(read_sift_small(), HNSWConfig(), IndexTime.PRE_INDEX, QueryMode.QUERY)
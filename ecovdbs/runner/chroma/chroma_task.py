@@ -34,6 +34,8 @@ class ChromaHNSWTask(HNSWTask):
         self.client = ChromaClient(dimension=case.dataset.dimension, index_config=index_config)
         self.dataset = case.dataset
         index_time = case.index_time if case.index_time is IndexTime.NO_INDEX else IndexTime.NO_INDEX
-        self.insert_config = InsertConfig(index_time=index_time, query_mode=case.query_mode)
+        self.insert_config = InsertConfig(index_time=index_time, query_mode=case.query_mode,
+                                          workers=case.insert_workers)
         self.query_config = HNSWQueryConfig(ef_search=case.hnsw_config.ef_search, index_config=index_config,
-                                            query_mode=case.query_mode)
+                                            query_mode=case.query_mode, profile_queries=case.profile_queries,
+                                            query_batch_size=case.query_batch_size)
@@ -0,0 +1,91 @@
+import logging
+from typing import Optional
+
+import numpy as np
+
+from .case_config import ChurnConfig, ChurnMode
+from .result_config import ChurnResult, ChurnRoundResult, InsertRunnerResult, HNSWQueryRunnerResult
+from .runner import InsertRunner, HNSWQueryRunner
+from .task_config import HNSWTask, QueryMode
+from .utility import time_it, wait_for_index
+from ..client.base_client import BaseClient
+
+log = logging.getLogger(__name__)
+
+
+class ChurnRunner:
+    """
+    Runner class for the churn scenario. After the initial insertion, a random part of the vectors is replaced in
+    every round and the queries are run against the database after every round.
+    """
+
+    def __init__(self, hnsw_task: HNSWTask, config: ChurnConfig):
+        """
+        Initialize the ChurnRunner with a given HNSW task and the churn configuration.
+
+        :param hnsw_task: The HNSW task configuration (see :class:`HNSWTask`).
+        :param config: The configuration of the churn (see :class:`ChurnConfig`).
+        """
+        self.__client: BaseClient = hnsw_task.client
+        self.__index_config = hnsw_task.query_config.index_config
+        self.__config: ChurnConfig = config
+        self.__data_vectors: list[list[float]] = hnsw_task.dataset.data_vectors
+        self.__metadata: Optional[list[str]] = hnsw_task.dataset.metadata \
+            if QueryMode.FILTERED_QUERY == hnsw_task.insert_config.query_mode else None
+        self.__insert_runner = InsertRunner(hnsw_task.client, hnsw_task.insert_config, hnsw_task.dataset)
+        self.__query_runner = HNSWQueryRunner(hnsw_task.client, hnsw_task.query_config, hnsw_task.dataset)
+        self.__rng = np.random.default_rng(config.seed)
+
+    def run(self) -> ChurnResult:
+        """
+        Run the initial insertion and all churn rounds.
+
+        :return: Result of the churn scenario (see :class:`ChurnResult`).
+        """
+        log.info("Start ChurnRunner for client %s", type(self.__client).__name__)
+        insert_result: InsertRunnerResult = self.__insert_runner.run()
+        round_results: list[ChurnRoundResult] = [self.__round_result(0, 0, 0, 0, 0)]
+        num_vectors = len(self.__data_vectors)
+        num_replaced = int(num_vectors * self.__config.fraction)
+        total_replaced = 0
+        for churn_round in range(1, self.__config.rounds + 1):
+            ids: list[int] = sorted(self.__rng.choice(num_vectors, size=num_replaced, replace=False).tolist())
+            log.info("Round %d: replace %d vectors with %s", churn_round, num_replaced, self.__config.mode.name)
+            _, t_replace = self.__replace(ids)
+            _, t_ready = wait_for_index(self.__client)
+            total_replaced += num_replaced
+            round_results.append(self.__round_result(churn_round, num_replaced, total_replaced / num_vectors,
+                                                     t_replace, t_ready))
+        return ChurnResult(self.__client, self.__index_config, self.__config.mode, self.__config.fraction,
+                           insert_result, round_results)
+
+    def __round_result(self, churn_round: int, num_replaced: int, total_replaced_fraction: float, t_replace: float,
+                       t_ready: float) -> ChurnRoundResult:
+        """
+        Run the queries and measure the storage after a round.
+
+        :param churn_round: The number of the round.
+        :param num_replaced: The number of vectors replaced in the round.
+        :param total_replaced_fraction: The fraction of all vectors replaced so far.
+        :param t_replace: The time taken to replace the vectors.
+        :param t_ready: The time waited until the index was fully built.
+        :return: The state after the round (see :class:`ChurnRoundResult`).
+        """
+        query_result: HNSWQueryRunnerResult = self.__query_runner.run()
+        return ChurnRoundResult(churn_round, num_replaced, total_replaced_fraction, t_replace, t_ready,
+                                num_replaced / t_replace if t_replace > 0 else 0, query_result,
+                                self.__client.index_storage(), self.__client.disk_storage())
+
+    @time_it
+    def __replace(self, ids: list[int]) -> None:
+        """
+        Replace the vectors with the given ids by themselves and flush the changes.
+
+        :param ids: The ids of the vectors to replace.
+        """
+        embeddings = [self.__data_vectors[i] for i in ids]
+        metadata = [self.__metadata[i] for i in ids] if self.__metadata else None
+        if self.__config.mode == ChurnMode.DELETE_INSERT:
+            self.__client.delete(ids)
+        self.__client.upsert(embeddings, ids, metadata)
+        self.__client.flush()
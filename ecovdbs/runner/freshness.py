@@ -0,0 +1,202 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from typing import Optional
+
+import numpy as np
+
+from .case_config import FreshnessConfig
+from .mixed_workload import WRITE_BATCHES_PER_SECOND
+from .result_config import FreshnessResult, FreshnessRateResult, InsertRunnerResult
+from .runner import InsertRunner
+from .task_config import HNSWTask
+from .utility import percentile
+from ..client.base_client import BaseClient
+from ..client.base_config import MetricType
+
+log = logging.getLogger(__name__)
+
+# Number of vectors processed at once while calculating the largest norm of the data vectors
+NORM_CHUNK_SIZE = 10_000
+
+
+class FreshnessRunner:
+    """
+    Runner class for measuring the freshness (time-to-searchable) of a client. Marker vectors with known ids are
+    inserted one after the other and queried with themselves until they are found, while a background writer inserts
+    data at a fixed rate. Markers, probes and the background writer use their own connections (see
+    :meth:`BaseClient.fork`).
+    """
+
+    def __init__(self, hnsw_task: HNSWTask, config: FreshnessConfig):
+        """
+        Initialize the FreshnessRunner with a given HNSW task and the measurement configuration.
+
+        :param hnsw_task: The HNSW task configuration. The probe queries use the first ``ef_search`` value of the task
+            (see :class:`HNSWTask`).
+        :param config: The configuration of the measurement (see :class:`FreshnessConfig`).
+        """
+        self.__client: BaseClient = hnsw_task.client
+        self.__index_config = hnsw_task.query_config.index_config
+        self.__ef: int = hnsw_task.query_config.ef_search[0]
+        self.__config: FreshnessConfig = config
+        self.__data_vectors: list[list[float]] = hnsw_task.dataset.data_vectors
+        self.__metadata: Optional[list[str]] = hnsw_task.dataset.metadata
+        self.__k: int = len(hnsw_task.dataset.ground_truth_neighbors[0])
+        self.__num_initial: int = max(1, int(len(self.__data_vectors) * config.initial_fraction))
+        initial_dataset = replace(hnsw_task.dataset, data_vectors=self.__data_vectors[:self.__num_initial],
+                                  metadata=self.__metadata[:self.__num_initial] if self.__metadata else None)
+        self.__insert_runner = InsertRunner(hnsw_task.client, hnsw_task.insert_config, initial_dataset)
+        self.__markers: np.ndarray = self.__create_markers(hnsw_task.dataset.dimension,
+                                                           hnsw_task.dataset.metric_type)
+        # The ids after the initial data are handed out in increasing order to the background writer and the markers
+        self.__next_id: int = self.__num_initial
+        self.__id_lock = threading.Lock()
+
+    def run(self) -> FreshnessResult:
+        """
+        Run the freshness measurement for every background ingest rate.
+
+        :return: Result of the freshness measurement (see :class:`FreshnessResult`).
+        """
+        log.info("Start FreshnessRunner for client %s", type(self.__client).__name__)
+        initial_insert_result: InsertRunnerResult = self.__insert_runner.run()
+        self.__index_config.change_ef_search(self.__ef)
+        self.__client.load()
+        rate_results: list[FreshnessRateResult] = []
+        for ingest_rate in self.__config.ingest_rates:
+            log.info("Probe %d markers with a background ingest rate of %s vectors per second",
+                     self.__config.markers, ingest_rate)
+            rate_results.append(self.__run_rate(ingest_rate))
+        self.__client.flush()
+        return FreshnessResult(self.__client, self.__index_config, initial_insert_result, self.__ef, rate_results)
+
+    def __run_rate(self, ingest_rate: float) -> FreshnessRateResult:
+        """
+        Probe all markers while the background writer inserts data at the given rate.
+
+        :param ingest_rate: The background ingest rate in vectors per second. 0 probes without background ingest.
+        :return: The freshness under the ingest rate (see :class:`FreshnessRateResult`).
+        """
+        writer, marker_client, probe_client = self.__client.fork(), self.__client.fork(), self.__client.fork()
+        probes_done = threading.Event()
+        try:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                ingested = executor.submit(self.__ingest, writer, ingest_rate, probes_done) if ingest_rate > 0 \
+                    else None
+                try:
+                    insert_times, delays = self.__probe(marker_client, probe_client)
+                finally:
+                    probes_done.set()
+                ingest_throughput = ingested.result() if ingested else 0
+        finally:
+            for fork in (writer, marker_client, probe_client):
+                fork.close()
+        found = np.array([delay for delay in delays if delay is not None])
+        return FreshnessRateResult(
+            ingest_rate, ingest_throughput, len(delays), len(delays) - len(found), insert_times, found.tolist(),
+            float(found.mean()) if len(found) else 0, percentile(found, 50), percentile(found, 90),
+            percentile(found, 99), float(found.max()) if len(found) else 0)
+
+    def __probe(self, marker_client: BaseClient,
+                probe_client: BaseClient) -> tuple[list[float], list[Optional[float]]]:
+        """
+        Insert the markers one after the other and query every marker until it is found or the timeout is reached.
+
+        :param marker_client: The client used to insert the markers.
+        :param probe_client: The client used to query the markers.
+        :return: The insert time and the visibility delay of every marker. The delay is None if the marker was not
+            found within the timeout.
+        """
+        insert_times: list[float] = []
+        delays: list[Optional[float]] = []
+        for marker in self.__markers:
+            marker_id = self.__allocate_ids(1)
+            insert_start = time.perf_counter()
+            marker_client.insert([marker.tolist()], ["marker"] if self.__metadata else None, marker_id)
+            inserted = time.perf_counter()
+            insert_times.append(inserted - insert_start)
+            delays.append(self.__wait_until_visible(probe_client, marker.tolist(), marker_id, inserted))
+        return insert_times, delays
+
+    def __wait_until_visible(self, probe_client: BaseClient, marker: list[float], marker_id: int,
+                             inserted: float) -> Optional[float]:
+        """
+        Query the marker until its id is returned.
+
+        :param probe_client: The client used to query the marker.
+        :param marker: The marker vector.
+        :param marker_id: The id of the marker.
+        :param inserted: The time the insert of the marker returned.
+        :return: The time from the return of the insert until the marker was found or None after the timeout.
+        """
+        while True:
+            res = probe_client.query(marker, self.__k)
+            now = time.perf_counter()
+            if marker_id in res:
+                return now - inserted
+            if now - inserted > self.__config.timeout:
+                log.warning("Marker %d was not found within %s seconds", marker_id, self.__config.timeout)
+                return None
+            time.sleep(self.__config.poll_interval)
+
+    def __ingest(self, client: BaseClient, ingest_rate: float, probes_done: threading.Event) -> float:
+        """
+        Insert data vectors in batches at the given rate until all markers are probed. The data vectors after the
+        initial part are inserted in a cycle, every time with new ids.
+
+        :param client: The client of the background writer.
+        :param ingest_rate: The number of vectors per second to insert.
+        :param probes_done: Event that is set when all markers are probed.
+        :return: The measured number of inserted vectors per second.
+        """
+        batch_size = max(1, int(ingest_rate / WRITE_BATCHES_PER_SECOND))
+        num_rest = len(self.__data_vectors) - self.__num_initial
+        position = 0
+        inserted = 0
+        start = time.perf_counter()
+        while not probes_done.is_set():
+            # Source vectors of the batch, wrapping around to the start of the rest of the dataset
+            source = self.__num_initial + position % num_rest if num_rest else 0
+            size = min(batch_size, len(self.__data_vectors) - source)
+            client.insert(self.__data_vectors[source:source + size],
+                          self.__metadata[source:source + size] if self.__metadata else None,
+                          self.__allocate_ids(size))
+            position += size
+            inserted += size
+            # Wait until the schedule of the writer allows the next batch
+            delay = start + inserted / ingest_rate - time.perf_counter()
+            if delay > 0:
+                probes_done.wait(delay)
+        return inserted / (time.perf_counter() - start)
+
+    def __allocate_ids(self, num: int) -> int:
+        """
+        Allocate a contiguous range of unused ids.
+
+        :param num: The number of ids.
+        :return: The first id of the range.
+        """
+        with self.__id_lock:
+            start_id = self.__next_id
+            self.__next_id += num
+        return start_id
+
+    def __create_markers(self, dimension: int, metric_type: MetricType) -> np.ndarray:
+        """
+        Create the random marker vectors. For the inner product, the markers are scaled to twice the largest norm of
+        the data vectors, so that every marker is its own nearest neighbor.
+
+        :param dimension: The dimension of the vectors.
+        :param metric_type: The metric type of the dataset.
+        :return: Matrix of marker vectors.
+        """
+        markers = np.random.default_rng().random((self.__config.markers, dimension), dtype=np.float32)
+        if metric_type == MetricType.IP:
+            max_norm = max(float(np.linalg.norm(np.asarray(self.__data_vectors[i:i + NORM_CHUNK_SIZE],
+                                                           dtype=np.float32), axis=1).max())
+                           for i in range(0, len(self.__data_vectors), NORM_CHUNK_SIZE))
+            markers *= 2 * max_norm / np.linalg.norm(markers, axis=1, keepdims=True)
+        return markers
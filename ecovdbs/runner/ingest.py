@@ -0,0 +1,60 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from ..client.base_client import BaseClient
+
+log = logging.getLogger(__name__)
+
+
+def partition(num_vectors: int, workers: int) -> list[tuple[int, int]]:
+    """
+    Partition the range of vector indices into contiguous ranges of nearly equal size.
+
+    :param num_vectors: The number of vectors to partition.
+    :param workers: The number of partitions.
+    :return: A list of ``(start, end)`` tuples, one for each non-empty partition. ``end`` is exclusive.
+    """
+    size, rest = divmod(num_vectors, workers)
+    ranges: list[tuple[int, int]] = []
+    start = 0
+    for i in range(workers):
+        end = start + size + (1 if i < rest else 0)
+        if end > start:
+            ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def parallel_insert(client: BaseClient, embeddings: list[list[float]], metadata: Optional[list[str]] = None,
+                    workers: int = 1, start_id: int = 0) -> None:
+    """
+    Insert embeddings into the database with several workers in parallel. The ids are partitioned into contiguous
+    ranges and every worker inserts one range over its own connection (see :meth:`BaseClient.fork`). The inserted data
+    is not flushed.
+
+    :param client: The client to insert with. With one worker, the client itself is used.
+    :param embeddings: List of embeddings to insert.
+    :param metadata: List of metadata to insert.
+    :param workers: The number of parallel workers, each with its own connection.
+    :param start_id: Index of the first inserted vector.
+    """
+    if workers <= 1:
+        client.insert(embeddings, metadata, start_id)
+        return
+    if not metadata or len(metadata) != len(embeddings):
+        metadata = None
+    ranges = partition(len(embeddings), workers)
+    log.info("Insert %d embeddings with %d workers", len(embeddings), len(ranges))
+    forks: list[BaseClient] = [client.fork() for _ in ranges]
+    try:
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = [executor.submit(fork.insert, embeddings[start:end],
+                                       metadata[start:end] if metadata else None, start_id + start)
+                       for fork, (start, end) in zip(forks, ranges)]
+            # Raise the first exception of a worker
+            for future in futures:
+                future.result()
+    finally:
+        for fork in forks:
+            fork.close()
@@ -0,0 +1,88 @@
+import logging
+from datetime import datetime
+from typing import Optional
+
+from .case_config import MemoryPressureConfig
+from .result_config import HNSWQueryRunnerResult, MemoryPressureResult, MemoryPressureStepResult
+from .runner import InsertRunner, HNSWQueryRunner
+from .task_config import HNSWTask
+from ..client.base_client import BaseClient
+from ..client.utility import bytes_to_mb
+from ..docker_stats import ContainerMonitor, MemoryPressure
+
+log = logging.getLogger(__name__)
+
+
+class MemoryPressureRunner:
+    """
+    Runner class for running the queries while the memory of the database container is limited. The data is inserted
+    and indexed once without a limit and the queries are run without a limit as a baseline. Then the memory of the
+    running container is limited to the memory of the idle container plus a fraction of the index size, from the largest
+    to the smallest fraction, and the queries are run again. OOM kills, swap and major page faults are read from the
+    container after every run. The scenario stops after the container was stopped by the OOM killer.
+    """
+
+    def __init__(self, hnsw_task: HNSWTask, config: MemoryPressureConfig, monitor: ContainerMonitor):
+        """
+        Initialize the MemoryPressureRunner with a given HNSW task, the scenario configuration and the container monitor.
+
+        :param hnsw_task: The HNSW task configuration (see :class:`HNSWTask`).
+        :param config: The configuration of the memory pressure scenario (see :class:`MemoryPressureConfig`).
+        :param monitor: The running monitor of the database container. It limits the container and provides the memory
+            usage and the memory pressure counters.
+        """
+        self.__client: BaseClient = hnsw_task.client
+        self.__index_config = hnsw_task.query_config.index_config
+        self.__insert_runner = InsertRunner(hnsw_task.client, hnsw_task.insert_config, hnsw_task.dataset)
+        self.__query_runner = HNSWQueryRunner(hnsw_task.client, hnsw_task.query_config, hnsw_task.dataset)
+        self.__index_fractions: list[float] = sorted(config.index_fractions, reverse=True)
+        self.__monitor: ContainerMonitor = monitor
+
+    def run(self) -> MemoryPressureResult:
+        """
+        Insert the data and run the queries without a limit and for every memory limit.
+
+        :return: Result of the memory pressure scenario (see :class:`MemoryPressureResult`).
+        """
+        log.info("Start MemoryPressureRunner for client %s", type(self.__client).__name__)
+        idle_memory = bytes_to_mb(self.__monitor.memory_usage())
+        insert_result = self.__insert_runner.run()
+        index_size = self.__client.index_storage()
+        step_results: list[MemoryPressureStepResult] = [self.__run_step(None, None)]
+        try:
+            for index_fraction in self.__index_fractions:
+                memory_limit = idle_memory + index_fraction * index_size
+                log.info("Limit the container to %.2f MB (%.2f of the index size)", memory_limit, index_fraction)
+                self.__monitor.limit_memory(memory_limit)
+                step_results.append(self.__run_step(index_fraction, memory_limit))
+                if step_results[-1].oom_killed:
+                    log.warning("Container was stopped by the OOM killer at %.2f MB", memory_limit)
+                    break
+        finally:
+            if not step_results[-1].oom_killed:
+                self.__monitor.limit_memory(None)
+        return MemoryPressureResult(self.__client, self.__index_config, insert_result, index_size, idle_memory,
+                                    step_results)
+
+    def __run_step(self, index_fraction: Optional[float], memory_limit: Optional[float]) -> MemoryPressureStepResult:
+        """
+        Run the queries and read the memory pressure counters before and after them.
+
+        :param index_fraction: The memory limit as a fraction of the index size or None without a limit.
+        :param memory_limit: The memory limit in MB or None without a limit.
+        :return: Result of the queries under the memory limit (see :class:`MemoryPressureStepResult`).
+        """
+        before: MemoryPressure = self.__monitor.memory_pressure()
+        query_result: Optional[HNSWQueryRunnerResult] = None
+        start = datetime.now()
+        try:
+            query_result = self.__query_runner.run()
+        except Exception as e:
+            # The database or one of its processes may be killed by the OOM killer during the queries
+            log.warning("Queries failed with a memory limit of %s MB: %s", memory_limit, e)
+        end = datetime.now()
+        after: MemoryPressure = self.__monitor.memory_pressure()
+        return MemoryPressureStepResult(index_fraction, memory_limit, query_result,
+                                        bytes_to_mb(self.__monitor.average_memory_usage(start, end)), after.oom_killed,
+                                        max(0, after.oom_kills - before.oom_kills), bytes_to_mb(after.swap),
+                                        max(0, after.major_faults - before.major_faults))
@@ -1,12 +1,69 @@
+import math
 from dataclasses import dataclass
+from typing import Optional
 
 from ..case_config import HNSWCase
 from ..task_config import HNSWTask, InsertConfig, HNSWQueryConfig, IndexTime
 from ...client.milvus.milvus_client import MilvusClient
-from ...client.milvus.milvus_config import MilvusHNSWConfig
+from ...client.milvus.milvus_config import MilvusHNSWConfig, MilvusIVFFlatIndex, MilvusIVFSQ8Index, \
+    MilvusIVFPQIndex, MilvusSCANNIndex, MilvusFlatConfig, MilvusConfig
+from ...client.base_config import BaseHNSWConfig
 from ...dataset.dataset import Dataset
 
 
+def _nlist(num_vectors: int) -> int:
+    """
+    Get the number of cluster units of an IVF index. Milvus recommends ``4 * sqrt(n)``.
+
+    :param num_vectors: The number of vectors in the collection.
+    :return: The number of cluster units, between 1 and 65536.
+    """
+    return min(max(int(4 * math.sqrt(num_vectors)), 1), 65536)
+
+
+def _nprobe_sweep(nlist: int) -> list[int]:
+    """
+    Get the values of ``nprobe`` swept for an IVF index: the powers of two up to a quarter of the cluster units.
+    Probing more units approaches the exhaustive search of a FLAT index.
+
+    :param nlist: The number of cluster units.
+    :return: The values of ``nprobe`` in ascending order.
+    """
+    return [2 ** i for i in range(max(nlist // 4, 1).bit_length())]
+
+
+def _pq_m(dimension: int) -> int:
+    """
+    Get the number of factors of product quantization. The factors have to divide the dimension, the largest divisor
+    with at least four dimensions per factor is used.
+
+    :param dimension: The dimension of the vectors.
+    :return: The number of factors.
+    """
+    return max(m for m in range(1, dimension // 4 + 1) if dimension % m == 0) if dimension >= 4 else 1
+
+
+def _init_task(task: HNSWTask, case: HNSWCase, index_config: BaseHNSWConfig,
+               search_values: Optional[list[int]] = None) -> None:
+    """
+    Initialize a Milvus task with a given index configuration.
+
+    :param task: The task to initialize.
+    :param case: The HNSW case configuration (see :class:`HNSWCase`).
+    :param index_config: The configuration of the index. Its ``change_ef_search`` sets the swept search parameter.
+    :param search_values: The values of the swept search parameter. Defaults to the ``ef_search`` values of the case.
+    """
+    db_config = MilvusConfig(partition_key=case.partition_key, scalar_index=case.scalar_index,
+                             consistency_level=case.consistency_level, mmap=case.mmap)
+    task.client = MilvusClient(dimension=case.dataset.dimension, index_config=index_config, db_config=db_config)
+    task.dataset = case.dataset
+    index_time = case.index_time if case.index_time is not IndexTime.NO_INDEX else IndexTime.PRE_INDEX
+    task.insert_config = InsertConfig(index_time=index_time, query_mode=case.query_mode, workers=case.insert_workers)
+    task.query_config = HNSWQueryConfig(ef_search=search_values or case.hnsw_config.ef_search,
+                                        index_config=index_config, query_mode=case.query_mode,
+                                        profile_queries=case.profile_queries, query_batch_size=case.query_batch_size)
+
+
 @dataclass
 class MilvusHNSWTask(HNSWTask):
     """
@@ -32,9 +89,148 @@ class MilvusHNSWTask(HNSWTask):
         index_config = MilvusHNSWConfig(metric_type=case.dataset.metric_type, M=case.hnsw_config.M,
                                         efConstruction=case.hnsw_config.ef_construction,
                                         ef=case.hnsw_config.ef_search[0])
-        self.client = MilvusClient(dimension=case.dataset.dimension, index_config=index_config)
-        self.dataset = case.dataset
-        index_time = case.index_time if case.index_time is not IndexTime.NO_INDEX else IndexTime.PRE_INDEX
-        self.insert_config = InsertConfig(index_time=index_time, query_mode=case.query_mode)
-        self.query_config = HNSWQueryConfig(ef_search=case.hnsw_config.ef_search, index_config=index_config,
-                                            query_mode=case.query_mode)
+        _init_task(self, case, index_config)
+
+
+@dataclass
+class MilvusIVFFlatTask(HNSWTask):
+    """
+    Represents a task for running an IVF_FLAT index on a Milvus database. The powers of two up to a quarter of the
+    cluster units are swept as ``nprobe`` instead of the ``ef_search`` values.
+
+    Attributes:
+        client: Milvus client to interact with the Milvus database.
+        dataset: Dataset to be used for the task.
+        insert_config: Configuration for the insertion operation.
+        query_config: Configuration for the query operation.
+    """
+    client: MilvusClient
+    dataset: Dataset
+    insert_config: InsertConfig
+    query_config: HNSWQueryConfig
+
+    def __init__(self, case: HNSWCase):
+        """
+        Initialize the MilvusIVFFlatTask with a given HNSW case configuration.
+
+        :param case: The HNSW case configuration (see :class:`HNSWCase`).
+        """
+        nlist = _nlist(len(case.dataset.data_vectors))
+        nprobe = _nprobe_sweep(nlist)
+        index_config = MilvusIVFFlatIndex(metric_type=case.dataset.metric_type, nlist=nlist, nprobe=nprobe[0])
+        _init_task(self, case, index_config, nprobe)
+
+
+@dataclass
+class MilvusIVFSQ8Task(HNSWTask):
+    """
+    Represents a task for running an IVF_SQ8 index on a Milvus database. The powers of two up to a quarter of the
+    cluster units are swept as ``nprobe`` instead of the ``ef_search`` values.
+
+    Attributes:
+        client: Milvus client to interact with the Milvus database.
+        dataset: Dataset to be used for the task.
+        insert_config: Configuration for the insertion operation.
+        query_config: Configuration for the query operation.
+    """
+    client: MilvusClient
+    dataset: Dataset
+    insert_config: InsertConfig
+    query_config: HNSWQueryConfig
+
+    def __init__(self, case: HNSWCase):
+        """
+        Initialize the MilvusIVFSQ8Task with a given HNSW case configuration.
+
+        :param case: The HNSW case configuration (see :class:`HNSWCase`).
+        """
+        nlist = _nlist(len(case.dataset.data_vectors))
+        nprobe = _nprobe_sweep(nlist)
+        index_config = MilvusIVFSQ8Index(metric_type=case.dataset.metric_type, nlist=nlist, nprobe=nprobe[0])
+        _init_task(self, case, index_config, nprobe)
+
+
+@dataclass
+class MilvusIVFPQTask(HNSWTask):
+    """
+    Represents a task for running an IVF_PQ index on a Milvus database. The powers of two up to a quarter of the
+    cluster units are swept as ``nprobe`` instead of the ``ef_search`` values.
+
+    Attributes:
+        client: Milvus client to interact with the Milvus database.
+        dataset: Dataset to be used for the task.
+        insert_config: Configuration for the insertion operation.
+        query_config: Configuration for the query operation.
+    """
+    client: MilvusClient
+    dataset: Dataset
+    insert_config: InsertConfig
+    query_config: HNSWQueryConfig
+
+    def __init__(self, case: HNSWCase):
+        """
+        Initialize the MilvusIVFPQTask with a given HNSW case configuration.
+
+        :param case: The HNSW case configuration (see :class:`HNSWCase`).
+        """
+        nlist = _nlist(len(case.dataset.data_vectors))
+        nprobe = _nprobe_sweep(nlist)
+        index_config = MilvusIVFPQIndex(metric_type=case.dataset.metric_type, nlist=nlist,
+                                        m=_pq_m(case.dataset.dimension), nprobe=nprobe[0])
+        _init_task(self, case, index_config, nprobe)
+
+
+@dataclass
+class MilvusSCANNTask(HNSWTask):
+    """
+    Represents a task for running a SCANN index on a Milvus database. The ``ef_search`` values are swept as
+    ``reorder_k``, ``nprobe`` is fixed to a sixteenth of the cluster units.
+
+    Attributes:
+        client: Milvus client to interact with the Milvus database.
+        dataset: Dataset to be used for the task.
+        insert_config: Configuration for the insertion operation.
+        query_config: Configuration for the query operation.
+    """
+    client: MilvusClient
+    dataset: Dataset
+    insert_config: InsertConfig
+    query_config: HNSWQueryConfig
+
+    def __init__(self, case: HNSWCase):
+        """
+        Initialize the MilvusSCANNTask with a given HNSW case configuration.
+
+        :param case: The HNSW case configuration (see :class:`HNSWCase`).
+        """
+        nlist = _nlist(len(case.dataset.data_vectors))
+        index_config = MilvusSCANNIndex(metric_type=case.dataset.metric_type, nlist=nlist, nprobe=max(nlist // 16, 1),
+                                        reorder_k=case.hnsw_config.ef_search[0])
+        _init_task(self, case, index_config)
+
+
+@dataclass
+class MilvusFlatTask(HNSWTask):
+    """
+    Represents a task for running a FLAT index on a Milvus database. The search is exhaustive, so every ``ef_search``
+    value gives the exact results and the task is the baseline of the other index types.
+
+    Attributes:
+        client: Milvus client to interact with the Milvus database.
+        dataset: Dataset to be used for the task.
+        insert_config: Configuration for the insertion operation.
+        query_config: Configuration for the query operation.
+    """
+    client: MilvusClient
+    dataset: Dataset
+    insert_config: InsertConfig
+    query_config: HNSWQueryConfig
+
+    def __init__(self, case: HNSWCase):
+        """
+        Initialize the MilvusFlatTask with a given HNSW case configuration.
+
+        :param case: The HNSW case configuration (see :class:`HNSWCase`).
+        """
+        index_config = MilvusFlatConfig(metric_type=case.dataset.metric_type)
+        _init_task(self, case, index_config)
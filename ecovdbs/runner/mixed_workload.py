@@ -0,0 +1,187 @@
+import logging
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from typing import Optional
+
+import numpy as np
+
+from .case_config import MixedWorkloadConfig
+from .ingest import partition
+from .result_config import MixedWorkloadResult, MixedWorkloadWindowResult, InsertRunnerResult
+from .runner import InsertRunner
+from .task_config import HNSWTask
+from .utility import percentile, nanmean
+from ..client.base_client import BaseClient
+
+log = logging.getLogger(__name__)
+
+# Number of batches a writer inserts per second if the write rate is limited
+WRITE_BATCHES_PER_SECOND = 10
+# Number of vectors a writer inserts per batch if the write rate is not limited
+UNLIMITED_WRITE_BATCH_SIZE = 1000
+
+
+class MixedWorkloadRunner:
+    """
+    Runner class for a mixed read/write workload. A part of the dataset is inserted up front, then writer threads
+    insert the rest of the dataset at a fixed rate while reader threads run the queries. Every thread uses its own
+    connection (see :meth:`BaseClient.fork`).
+    """
+
+    def __init__(self, hnsw_task: HNSWTask, config: MixedWorkloadConfig):
+        """
+        Initialize the MixedWorkloadRunner with a given HNSW task and the workload configuration.
+
+        :param hnsw_task: The HNSW task configuration. The queries use the first ``ef_search`` value of the task and
+            always run in :attr:`QueryMode.QUERY` (see :class:`HNSWTask`).
+        :param config: The configuration of the workload (see :class:`MixedWorkloadConfig`).
+        """
+        self.__client: BaseClient = hnsw_task.client
+        self.__index_config = hnsw_task.query_config.index_config
+        self.__ef: int = hnsw_task.query_config.ef_search[0]
+        self.__config: MixedWorkloadConfig = config
+        self.__data_vectors: list[list[float]] = hnsw_task.dataset.data_vectors
+        self.__metadata: Optional[list[str]] = hnsw_task.dataset.metadata
+        self.__query_vectors: list[list[float]] = hnsw_task.dataset.query_vectors
+        self.__ground_truth_neighbors: list[list[int]] = hnsw_task.dataset.ground_truth_neighbors
+        self.__k: int = len(self.__ground_truth_neighbors[0])
+        self.__num_initial: int = int(len(self.__data_vectors) * config.initial_fraction)
+        initial_dataset = replace(hnsw_task.dataset, data_vectors=self.__data_vectors[:self.__num_initial],
+                                  metadata=self.__metadata[:self.__num_initial] if self.__metadata else None)
+        self.__insert_runner = InsertRunner(hnsw_task.client, hnsw_task.insert_config, initial_dataset)
+        # Marks the vectors whose insertion has finished
+        self.__inserted: np.ndarray = np.zeros(len(self.__data_vectors), dtype=bool)
+        self.__start: float = 0
+
+    def run(self) -> MixedWorkloadResult:
+        """
+        Run the mixed workload.
+
+        :return: Result of the mixed workload (see :class:`MixedWorkloadResult`).
+        """
+        log.info("Start MixedWorkloadRunner for client %s", type(self.__client).__name__)
+        initial_insert_result: InsertRunnerResult = self.__insert_runner.run()
+        self.__inserted[:self.__num_initial] = True
+        self.__index_config.change_ef_search(self.__ef)
+        self.__client.load()
+
+        writers_done = threading.Event()
+        ranges = partition(len(self.__data_vectors) - self.__num_initial, self.__config.writers)
+        write_rate = self.__config.write_rate / max(len(ranges), 1)
+        # (time since start, number of inserted vectors) for every written batch
+        writes: list[tuple[float, int]] = []
+        # (time since start, query time, recall) for every query
+        reads: list[tuple[float, float, float]] = []
+        forks: list[BaseClient] = [self.__client.fork() for _ in range(len(ranges) + self.__config.readers)]
+        log.info("Insert %d vectors with %d writers while %d readers query", len(self.__data_vectors) -
+                 self.__num_initial, len(ranges), self.__config.readers)
+        try:
+            with ThreadPoolExecutor(max_workers=len(forks)) as executor:
+                self.__start = time.perf_counter()
+                readers = [executor.submit(self.__read, fork, i, writers_done, reads)
+                           for i, fork in enumerate(forks[len(ranges):])]
+                writers = [executor.submit(self.__write, fork, self.__num_initial + start, self.__num_initial + end,
+                                           write_rate, writes) for fork, (start, end) in zip(forks, ranges)]
+                try:
+                    for writer in writers:
+                        writer.result()
+                    write_time = time.perf_counter() - self.__start
+                finally:
+                    writers_done.set()
+                for reader in readers:
+                    reader.result()
+                total_time = time.perf_counter() - self.__start
+        finally:
+            for fork in forks:
+                fork.close()
+        self.__client.flush()
+        return self.__result(initial_insert_result, writes, reads, write_time, total_time)
+
+    def __write(self, client: BaseClient, start: int, end: int, write_rate: float,
+                writes: list[tuple[float, int]]) -> None:
+        """
+        Insert the vectors from ``start`` to ``end`` in batches at the given rate.
+
+        :param client: The client of the writer.
+        :param start: Index of the first vector to insert.
+        :param end: Index after the last vector to insert.
+        :param write_rate: The number of vectors per second inserted by this writer. 0 inserts as fast as possible.
+        :param writes: List the time and size of every inserted batch is appended to.
+        """
+        batch_size = max(1, int(write_rate / WRITE_BATCHES_PER_SECOND)) if write_rate > 0 \
+            else UNLIMITED_WRITE_BATCH_SIZE
+        writer_start = time.perf_counter()
+        for batch_start in range(start, end, batch_size):
+            batch_end = min(batch_start + batch_size, end)
+            client.insert(self.__data_vectors[batch_start:batch_end],
+                          self.__metadata[batch_start:batch_end] if self.__metadata else None, batch_start)
+            self.__inserted[batch_start:batch_end] = True
+            writes.append((time.perf_counter() - self.__start, batch_end - batch_start))
+            if write_rate > 0:
+                # Wait until the schedule of the writer allows the next batch
+                delay = writer_start + (batch_end - start) / write_rate - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+    def __read(self, client: BaseClient, reader: int, writers_done: threading.Event,
+               reads: list[tuple[float, float, float]]) -> None:
+        """
+        Run the queries in a loop until all writers are done.
+
+        :param client: The client of the reader.
+        :param reader: The index of the reader. Every reader starts at a different query.
+        :param writers_done: Event that is set when all writers are done.
+        :param reads: List the time, query time and recall of every query is appended to.
+        """
+        num_queries = len(self.__query_vectors)
+        i = reader * num_queries // max(self.__config.readers, 1)
+        while not writers_done.is_set():
+            query, gt = self.__query_vectors[i % num_queries], self.__ground_truth_neighbors[i % num_queries]
+            query_start = time.perf_counter()
+            res = client.query(query, self.__k)
+            query_end = time.perf_counter()
+            # Only the ground truth neighbors that are already inserted can be found
+            visible = {neighbor for neighbor in gt[:self.__k] if self.__inserted[neighbor]}
+            recall = len(visible & set(res)) / len(visible) if visible else math.nan
+            reads.append((query_end - self.__start, query_end - query_start, recall))
+            i += 1
+
+    def __result(self, initial_insert_result: InsertRunnerResult, writes: list[tuple[float, int]],
+                 reads: list[tuple[float, float, float]], write_time: float,
+                 total_time: float) -> MixedWorkloadResult:
+        """
+        Aggregate the measured writes and reads into the result of the workload.
+
+        :param initial_insert_result: The result of inserting the initial part of the dataset.
+        :param writes: The time and size of every inserted batch.
+        :param reads: The time, query time and recall of every query.
+        :param write_time: The time taken by the writers.
+        :param total_time: The duration of the workload.
+        :return: Result of the mixed workload (see :class:`MixedWorkloadResult`).
+        """
+        write_times = np.array([w[0] for w in writes])
+        write_sizes = np.array([w[1] for w in writes])
+        read_times = np.array([r[0] for r in reads])
+        query_times = np.array([r[1] for r in reads])
+        recalls = np.array([r[2] for r in reads])
+        windows: list[MixedWorkloadWindowResult] = []
+        window = self.__config.window
+        for w in range(math.ceil(total_time / window)):
+            start = w * window
+            length = min(window, total_time - start)
+            in_window = (read_times >= start) & (read_times < start + window)
+            written = write_sizes[(write_times >= start) & (write_times < start + window)].sum()
+            window_query_times = query_times[in_window]
+            windows.append(MixedWorkloadWindowResult(
+                start, len(window_query_times) / length, nanmean(recalls[in_window]),
+                percentile(window_query_times, 50), percentile(window_query_times, 99), written / length))
+        return MixedWorkloadResult(
+            self.__client, self.__index_config, initial_insert_result, self.__ef, self.__config.writers,
+            self.__config.readers, self.__config.write_rate, int(write_sizes.sum()) / write_time if write_time else 0,
+            total_time, len(reads), len(reads) / total_time, nanmean(recalls),
+            float(query_times.mean()) if len(query_times) else 0, percentile(query_times, 50),
+            percentile(query_times, 90), percentile(query_times, 95), percentile(query_times, 99), windows)
+
@@ -8,6 +8,12 @@ class MockChromaClient(BaseClient):
     def __init__(self):
         MockChromaClient.__name__ = "ChromaClient"
 
+    def fork(self) -> BaseClient:
+        pass
+
+    def close(self) -> None:
+        pass
+
     def insert(self, embeddings: list[list[float]], metadata: Optional[list[str]] = None, start_id: int = 0) -> None:
         pass
 
@@ -15,9 +21,27 @@ class MockChromaClient(BaseClient):
                      start_id: int = 0) -> None:
         pass
 
+    def upsert(self, embeddings: list[list[float]], ids: list[int], metadata: Optional[list[str]] = None) -> None:
+        pass
+
+    def delete(self, ids: list[int]) -> None:
+        pass
+
+    def set_batch_size(self, batch_size: int) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
     def create_index(self) -> None:
         pass
 
+    def index_progress(self) -> float:
+        pass
+
+    def drop_index(self) -> None:
+        pass
+
     def disk_storage(self) -> float:
         pass
 
@@ -30,18 +54,39 @@ class MockChromaClient(BaseClient):
     def query(self, query: list[float], k: int) -> list[int]:
         pass
 
+    def batch_query(self, queries: list[list[float]], k: int) -> list[list[int]]:
+        pass
+
     def filtered_query(self, query: list[float], k: int, keyword_filter: str) -> list[int]:
         pass
 
     def ranged_query(self, query: list[float], k: int, distance: float) -> list[int]:
         pass
 
+    def ping(self) -> None:
+        pass
+
+    def query_engine_time(self, query: list[float], k: int) -> Optional[float]:
+        pass
+
+    def query_plan(self, query: list[float], k: int, keyword_filter: Optional[str] = None) -> Optional[str]:
+        pass
+
+    def storage_breakdown(self, vacuum: bool = False) -> Optional[dict[str, float]]:
+        pass
+
 
 class MockMilvusClient(BaseClient):
 
     def __init__(self):
         MockMilvusClient.__name__ = "MilvusClient"
 
+    def fork(self) -> BaseClient:
+        pass
+
+    def close(self) -> None:
+        pass
+
     def insert(self, embeddings: list[list[float]], metadata: Optional[list[str]] = None, start_id: int = 0) -> None:
         pass
 
@@ -49,9 +94,27 @@ class MockMilvusClient(BaseClient):
                      start_id: int = 0) -> None:
         pass
 
+    def upsert(self, embeddings: list[list[float]], ids: list[int], metadata: Optional[list[str]] = None) -> None:
+        pass
+
+    def delete(self, ids: list[int]) -> None:
+        pass
+
+    def set_batch_size(self, batch_size: int) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
     def create_index(self) -> None:
         pass
 
+    def index_progress(self) -> float:
+        pass
+
+    def drop_index(self) -> None:
+        pass
+
     def disk_storage(self) -> float:
         pass
 
@@ -64,18 +127,39 @@ class MockMilvusClient(BaseClient):
     def query(self, query: list[float], k: int) -> list[int]:
         pass
 
+    def batch_query(self, queries: list[list[float]], k: int) -> list[list[int]]:
+        pass
+
     def filtered_query(self, query: list[float], k: int, keyword_filter: str) -> list[int]:
         pass
 
     def ranged_query(self, query: list[float], k: int, distance: float) -> list[int]:
         pass
 
+    def ping(self) -> None:
+        pass
+
+    def query_engine_time(self, query: list[float], k: int) -> Optional[float]:
+        pass
+
+    def query_plan(self, query: list[float], k: int, keyword_filter: Optional[str] = None) -> Optional[str]:
+        pass
+
+    def storage_breakdown(self, vacuum: bool = False) -> Optional[dict[str, float]]:
+        pass
+
 
 class MockRedisClient(BaseClient):
 
     def __init__(self):
         MockRedisClient.__name__ = "RedisClient"
 
+    def fork(self) -> BaseClient:
+        pass
+
+    def close(self) -> None:
+        pass
+
     def insert(self, embeddings: list[list[float]], metadata: Optional[list[str]] = None, start_id: int = 0) -> None:
         pass
 
@@ -83,9 +167,27 @@ class MockRedisClient(BaseClient):
                      start_id: int = 0) -> None:
         pass
 
+    def upsert(self, embeddings: list[list[float]], ids: list[int], metadata: Optional[list[str]] = None) -> None:
+        pass
+
+    def delete(self, ids: list[int]) -> None:
+        pass
+
+    def set_batch_size(self, batch_size: int) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
     def create_index(self) -> None:
         pass
 
+    def index_progress(self) -> float:
+        pass
+
+    def drop_index(self) -> None:
+        pass
+
     def disk_storage(self) -> float:
         pass
 
@@ -98,18 +200,39 @@ class MockRedisClient(BaseClient):
     def query(self, query: list[float], k: int) -> list[int]:
         pass
 
+    def batch_query(self, queries: list[list[float]], k: int) -> list[list[int]]:
+        pass
+
     def filtered_query(self, query: list[float], k: int, keyword_filter: str) -> list[int]:
         pass
 
     def ranged_query(self, query: list[float], k: int, distance: float) -> list[int]:
         pass
 
+    def ping(self) -> None:
+        pass
+
+    def query_engine_time(self, query: list[float], k: int) -> Optional[float]:
+        pass
+
+    def query_plan(self, query: list[float], k: int, keyword_filter: Optional[str] = None) -> Optional[str]:
+        pass
+
+    def storage_breakdown(self, vacuum: bool = False) -> Optional[dict[str, float]]:
+        pass
+
 
 class MockPgvectorClient(BaseClient):
 
     def __init__(self):
         MockPgvectorClient.__name__ = "PgvectorClient"
 
+    def fork(self) -> BaseClient:
+        pass
+
+    def close(self) -> None:
+        pass
+
     def insert(self, embeddings: list[list[float]], metadata: Optional[list[str]] = None, start_id: int = 0) -> None:
         pass
 
@@ -117,9 +240,27 @@ class MockPgvectorClient(BaseClient):
                      start_id: int = 0) -> None:
         pass
 
+    def upsert(self, embeddings: list[list[float]], ids: list[int], metadata: Optional[list[str]] = None) -> None:
+        pass
+
+    def delete(self, ids: list[int]) -> None:
+        pass
+
+    def set_batch_size(self, batch_size: int) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
     def create_index(self) -> None:
         pass
 
+    def index_progress(self) -> float:
+        pass
+
+    def drop_index(self) -> None:
+        pass
+
     def disk_storage(self) -> float:
         pass
 
@@ -132,12 +273,27 @@ class MockPgvectorClient(BaseClient):
     def query(self, query: list[float], k: int) -> list[int]:
         pass
 
+    def batch_query(self, queries: list[list[float]], k: int) -> list[list[int]]:
+        pass
+
     def filtered_query(self, query: list[float], k: int, keyword_filter: str) -> list[int]:
         pass
 
     def ranged_query(self, query: list[float], k: int, distance: float) -> list[int]:
         pass
 
+    def ping(self) -> None:
+        pass
+
+    def query_engine_time(self, query: list[float], k: int) -> Optional[float]:
+        pass
+
+    def query_plan(self, query: list[float], k: int, keyword_filter: Optional[str] = None) -> Optional[str]:
+        pass
+
+    def storage_breakdown(self, vacuum: bool = False) -> Optional[dict[str, float]]:
+        pass
+
 
 client_mock_mapper = {
     "ChromaClient": MockChromaClient,
@@ -3,7 +3,8 @@ from dataclasses import dataclass
 from ..case_config import HNSWCase
 from ..task_config import HNSWTask, InsertConfig, HNSWQueryConfig, IndexTime
 from ...client.pgvector.pgvector_client import PgvectorClient
-from ...client.pgvector.pgvector_config import PgvectorHNSWConfig
+from ...client.base_config import Quantization
+from ...client.pgvector.pgvector_config import PgvectorHNSWConfig, PgvectorConfig, HNSW_MAX_EF_SEARCH
 from ...dataset.dataset import Dataset
 
 
@@ -28,12 +29,24 @@ class PgvectorHNSWTask(HNSWTask):
         Initialize the PgvectorHNSWTask with a given HNSW case configuration.
 
         :param case: The HNSW case configuration (see :class:`HNSWCase`).
+        :raises ValueError: If the re-ranking of a quantized index needs more candidates than the HNSW index scan can
+            return (see :data:`HNSW_MAX_EF_SEARCH`).
         """
+        k = len(case.dataset.ground_truth_neighbors[0])
+        if case.quantization != Quantization.NONE and k * case.rerank_factor > HNSW_MAX_EF_SEARCH:
+            raise ValueError(f"k * rerank_factor = {k} * {case.rerank_factor} exceeds the maximum hnsw.ef_search of "
+                             f"{HNSW_MAX_EF_SEARCH}")
         index_config = PgvectorHNSWConfig(metric_type=case.dataset.metric_type, m=case.hnsw_config.M,
-                                          ef_construction=case.hnsw_config.ef_construction)
-        self.client = PgvectorClient(dimension=case.dataset.dimension, index_config=index_config)
+                                          ef_construction=case.hnsw_config.ef_construction,
+                                          quantization=case.quantization, rerank_factor=case.rerank_factor,
+                                          filter_strategy=case.filter_strategy, filter_factor=case.filter_factor,
+                                          partial_indexes=case.partial_indexes)
+        self.client = PgvectorClient(dimension=case.dataset.dimension, index_config=index_config,
+                                     db_config=PgvectorConfig(cache_mode=case.cache_mode))
         self.dataset = case.dataset
         index_time = case.index_time if case.index_time is not IndexTime.NO_INDEX else IndexTime.PRE_INDEX
-        self.insert_config = InsertConfig(index_time=index_time, query_mode=case.query_mode)
+        self.insert_config = InsertConfig(index_time=index_time, query_mode=case.query_mode,
+                                          workers=case.insert_workers)
         self.query_config = HNSWQueryConfig(ef_search=case.hnsw_config.ef_search, index_config=index_config,
-                                            query_mode=case.query_mode)
+                                            query_mode=case.query_mode, profile_queries=case.profile_queries,
+                                            query_batch_size=case.query_batch_size)
@@ -0,0 +1,136 @@
+import logging
+from dataclasses import replace
+from itertools import accumulate
+from typing import Optional
+
+from .case_config import PrefixScalingConfig
+from .ingest import parallel_insert
+from .result_config import PrefixScalingResult, PrefixScalingStepResult, PowerLawFit, HNSWQueryRunnerResult
+from .runner import HNSWQueryRunner
+from .task_config import HNSWTask, IndexTime, QueryMode
+from .utility import time_it, fit_power_law, wait_for_index
+from ..client.base_client import BaseClient
+from ..dataset.dataset import Dataset
+from ..dataset.utility import brute_force_neighbors
+
+log = logging.getLogger(__name__)
+
+
+class PrefixScalingRunner:
+    """
+    Runner class for the prefix scaling scenario. The dataset is inserted in growing prefixes and after every step the
+    insert and index costs, the storage and the queries against the exact ground truth of the prefix are measured.
+    Power laws are fitted to the costs to extrapolate them to larger datasets.
+
+    How the index follows the growing prefix depends on the index time of the task:
+
+    - :attr:`IndexTime.PRE_INDEX`: The index is created once before the first step and updated by the inserts.
+    - :attr:`IndexTime.POST_INDEX`: The index is dropped and built again on the whole prefix after every step.
+    - :attr:`IndexTime.NO_INDEX`: The index is built by the inserts.
+    """
+
+    def __init__(self, hnsw_task: HNSWTask, config: PrefixScalingConfig):
+        """
+        Initialize the PrefixScalingRunner with a given HNSW task and the prefix configuration.
+
+        :param hnsw_task: The HNSW task configuration. The queries always run in :attr:`QueryMode.QUERY`, because the
+            ground truth of the other query modes can not be recalculated for a prefix (see :class:`HNSWTask`).
+        :param config: The configuration of the prefixes (see :class:`PrefixScalingConfig`).
+        """
+        self.__client: BaseClient = hnsw_task.client
+        self.__index_config = hnsw_task.query_config.index_config
+        self.__index_time: IndexTime = hnsw_task.insert_config.index_time
+        self.__workers: int = hnsw_task.insert_config.workers
+        self.__query_config = replace(hnsw_task.query_config, query_mode=QueryMode.QUERY)
+        self.__dataset: Dataset = hnsw_task.dataset
+        self.__metadata: Optional[list[str]] = hnsw_task.dataset.metadata \
+            if QueryMode.FILTERED_QUERY == hnsw_task.insert_config.query_mode else None
+        num_vectors = len(hnsw_task.dataset.data_vectors)
+        self.__sizes: list[int] = sorted({max(1, min(num_vectors, int(num_vectors * fraction)))
+                                          for fraction in config.fractions})
+
+    def run(self) -> PrefixScalingResult:
+        """
+        Run all steps of the prefix scaling scenario and fit the cost curves.
+
+        :return: Result of the prefix scaling scenario (see :class:`PrefixScalingResult`).
+        """
+        log.info("Start PrefixScalingRunner for client %s", type(self.__client).__name__)
+        step_results: list[PrefixScalingStepResult] = []
+        num_inserted = 0
+        for step, num_vectors in enumerate(self.__sizes):
+            log.info("Step %d: grow the prefix from %d to %d vectors", step, num_inserted, num_vectors)
+            t_index = 0
+            if self.__index_time == IndexTime.PRE_INDEX and step == 0:
+                _, t_index = self.__create_index()
+            _, t_insert = self.__insert(num_inserted, num_vectors)
+            if self.__index_time == IndexTime.POST_INDEX:
+                self.__client.drop_index()
+                _, t_index = self.__create_index()
+            t_ready = 0
+            if self.__index_time != IndexTime.NO_INDEX:
+                _, t_ready = wait_for_index(self.__client)
+            query_result = self.__query(num_vectors)
+            step_results.append(PrefixScalingStepResult(
+                num_vectors, num_vectors - num_inserted, t_insert, t_index, t_ready,
+                (num_vectors - num_inserted) / t_insert if t_insert > 0 else 0, self.__client.index_storage(),
+                self.__client.disk_storage(), query_result))
+            num_inserted = num_vectors
+        return PrefixScalingResult(self.__client, self.__index_config, self.__index_time, step_results,
+                                   self.__fit(step_results))
+
+    def __fit(self, step_results: list[PrefixScalingStepResult]) -> list[PowerLawFit]:
+        """
+        Fit power laws to the costs of the steps against the number of vectors. The insert time is accumulated over
+        the steps. The build time is the time until the index covers the whole prefix, which is accumulated over the
+        steps unless the index is built again in every step.
+
+        :param step_results: The results of the steps.
+        :return: The fitted cost curves.
+        """
+        sizes = [step.num_vectors for step in step_results]
+        build_times = [step.t_index + step.t_ready for step in step_results]
+        if self.__index_time != IndexTime.POST_INDEX:
+            build_times = list(accumulate(build_times))
+        costs: dict[str, list[float]] = {
+            "insert_time": list(accumulate(step.t_insert for step in step_results)),
+            "build_time": build_times,
+            "index_size": [step.index_size for step in step_results],
+            "disk_size": [step.disk_size for step in step_results],
+            "query_time": [step.query_result.mode_results[0].ef_results[0].avg_query_time for step in step_results],
+        }
+        return [PowerLawFit(name, *fit_power_law(sizes, values), sizes, values) for name, values in costs.items()]
+
+    @time_it
+    def __insert(self, start: int, end: int) -> None:
+        """
+        Insert the vectors from ``start`` to ``end`` with the configured number of workers and flush them.
+
+        :param start: Index of the first vector to insert.
+        :param end: Index after the last vector to insert.
+        """
+        parallel_insert(self.__client, self.__dataset.data_vectors[start:end],
+                        self.__metadata[start:end] if self.__metadata else None, self.__workers, start)
+        self.__client.flush()
+
+    @time_it
+    def __create_index(self) -> None:
+        """
+        Create the HNSW index in the database.
+        """
+        self.__client.create_index()
+
+    def __query(self, num_vectors: int) -> HNSWQueryRunnerResult:
+        """
+        Run the queries against the exact ground truth of the prefix.
+
+        :param num_vectors: The size of the prefix.
+        :return: Result of the queries (see :class:`HNSWQueryRunnerResult`).
+        """
+        prefix = self.__dataset.data_vectors[:num_vectors]
+        k = len(self.__dataset.ground_truth_neighbors[0])
+        log.info("Calculate the ground truth of %d queries for %d vectors", len(self.__dataset.query_vectors),
+                 num_vectors)
+        ground_truth = brute_force_neighbors(prefix, self.__dataset.query_vectors, k, self.__dataset.metric_type)
+        prefix_dataset = replace(self.__dataset, data_vectors=prefix, ground_truth_neighbors=ground_truth)
+        return HNSWQueryRunner(self.__client, self.__query_config, prefix_dataset).run()
@@ -0,0 +1,160 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+import numpy as np
+
+from .case_config import QueryScalingConfig
+from .ingest import partition
+from .result_config import HNSWQueryEFResult, HNSWQueryModeResult, HNSWQueryRunnerResult, HNSWRunnerResult
+from .runner import InsertRunner
+from .task_config import HNSWTask, HNSWQueryConfig, QueryMode
+from ..client.base_client import BaseClient
+from ..dataset.dataset import Dataset
+from ..docker_stats import ContainerMonitor
+
+log = logging.getLogger(__name__)
+
+
+class ConcurrentQueryRunner:
+    """
+    Runner class for running the queries of the HNSW task with several threads at once. Every thread runs a contiguous
+    part of the queries on its own connection (see :meth:`BaseClient.fork`), the queries per second are measured over
+    the wall-clock time of all threads. The forks are created after the data is loaded for every ef value.
+    """
+
+    def __init__(self, client: BaseClient, config: HNSWQueryConfig, dataset: Dataset, threads: int) -> None:
+        """
+        Initialize the ConcurrentQueryRunner with the client, configuration, dataset and the number of threads.
+
+        :param client: The client to interact with the database (see :class:`BaseClient`).
+        :param config: Configuration for the query operation (see :class:`HNSWQueryConfig`).
+        :param dataset: The dataset to be used for the query operation (see :class:`Dataset`).
+        :param threads: The number of concurrent query threads.
+        """
+        self.__client: BaseClient = client
+        self.__config: HNSWQueryConfig = config
+        self.__query_vectors: list[list[float]] = dataset.query_vectors
+        self.__ground_truth_neighbors: list[list[int]] = dataset.ground_truth_neighbors
+        self.__extended: Optional[list[str | float]] = {
+            QueryMode.QUERY: None,
+            QueryMode.FILTERED_QUERY: dataset.keyword_filter,
+            QueryMode.RANGED_QUERY: dataset.distance
+        }[config.query_mode]
+        if config.query_mode != QueryMode.QUERY and self.__extended is None:
+            raise ValueError("Invalid query mode")
+        self.__threads: int = threads
+
+    def run(self) -> HNSWQueryRunnerResult:
+        """
+        Run the queries concurrently for every ef search value.
+
+        :return: Results of the query operation (see :class:`HNSWQueryRunnerResult`).
+        """
+        query_mode = self.__config.query_mode
+        num_queries = len(self.__query_vectors)
+        k = len(self.__ground_truth_neighbors[0])
+        log.info("Run %d queries for mode %s with %d threads for client %s", num_queries * len(self.__config.ef_search),
+                 query_mode.name, self.__threads, type(self.__client).__name__)
+        ranges = partition(num_queries, self.__threads)
+        ef_results: list[HNSWQueryEFResult] = []
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            for ef in self.__config.ef_search:
+                self.__config.index_config.change_ef_search(ef)
+                # Loading may restart the database, which breaks the connections of existing forks
+                self.__client.load()
+                forks: list[BaseClient] = [self.__client.fork() for _ in ranges]
+                try:
+                    start = time.perf_counter()
+                    futures = [executor.submit(self.__run_queries, fork, query_start, query_end)
+                               for fork, (query_start, query_end) in zip(forks, ranges)]
+                    # Every thread returns the recall and the latency of each of its queries
+                    recalls, latencies = np.concatenate([f.result() for f in futures], axis=1)
+                    total_time = time.perf_counter() - start
+                finally:
+                    for fork in forks:
+                        fork.close()
+                ef_results.append(HNSWQueryEFResult(ef, float(np.mean(recalls)), float(np.mean(latencies)),
+                                                    num_queries / total_time, total_time, num_queries, k))
+        return HNSWQueryRunnerResult([HNSWQueryModeResult(query_mode, ef_results)])
+
+    def __run_queries(self, client: BaseClient, start: int, end: int) -> np.ndarray:
+        """
+        Run the queries between start and end on one connection.
+
+        :param client: The forked client of the thread.
+        :param start: Index of the first query.
+        :param end: Index after the last query.
+        :return: An array with the recall of every query in the first row and its latency in the second row.
+        """
+        query_func = self.__query_func(client)
+        result = np.empty((2, end - start))
+        for i in range(start, end):
+            gt = self.__ground_truth_neighbors[i]
+            extended = self.__extended[i] if self.__extended is not None else None
+            query_start = time.perf_counter()
+            res = query_func(self.__query_vectors[i], len(gt), extended)
+            result[1, i - start] = time.perf_counter() - query_start
+            result[0, i - start] = len(set(gt) & set(res)) / len(gt)
+        return result
+
+    def __query_func(self, client: BaseClient) -> Callable[[list[float], int, Optional[str | float]], list[int]]:
+        """
+        Get the query function of the client for the query mode.
+
+        :param client: The forked client of the thread.
+        :return: A function taking the query vector, k and the keyword filter or distance of the query.
+        """
+        if self.__config.query_mode == QueryMode.FILTERED_QUERY:
+            return client.filtered_query
+        if self.__config.query_mode == QueryMode.RANGED_QUERY:
+            return client.ranged_query
+        return lambda query, k, _: client.query(query, k)
+
+
+class QueryScalingRunner:
+    """
+    Runner class for running the queries while the database container is limited to an increasing number of cores. The
+    data is inserted and indexed only once without a limit. For every limit, the CPU quota of the running container is
+    updated (see :meth:`ContainerMonitor.limit_cpus`) and the queries are run concurrently with a number of threads
+    proportional to the limit, so that the database and not the benchmark is the bottleneck.
+    """
+
+    def __init__(self, hnsw_task: HNSWTask, config: QueryScalingConfig, monitor: ContainerMonitor):
+        """
+        Initialize the QueryScalingRunner with a given HNSW task, the scenario configuration and the container monitor.
+
+        :param hnsw_task: The HNSW task configuration (see :class:`HNSWTask`).
+        :param config: The configuration of the query scaling scenario (see :class:`QueryScalingConfig`).
+        :param monitor: The running monitor of the database container, used to limit the container.
+        """
+        self.__task: HNSWTask = hnsw_task
+        self.__client: BaseClient = hnsw_task.client
+        self.__config: QueryScalingConfig = config
+        self.__monitor: ContainerMonitor = monitor
+
+    def run(self) -> list[HNSWRunnerResult]:
+        """
+        Insert the data and run the queries for every CPU limit.
+
+        :return: One result per CPU limit, with the limit and the number of query threads recorded
+            (see :class:`HNSWRunnerResult`).
+        """
+        log.info("Start QueryScalingRunner for client %s", type(self.__client).__name__)
+        insert_result = InsertRunner(self.__client, self.__task.insert_config, self.__task.dataset).run()
+        index_size = self.__client.index_storage()
+        disk_size = self.__client.disk_storage()
+        results: list[HNSWRunnerResult] = []
+        try:
+            for cpu_limit in self.__config.cpu_limits:
+                threads = max(1, round(cpu_limit * self.__config.threads_per_core))
+                log.info("Limit the container to %s cores and query with %d threads", cpu_limit, threads)
+                self.__monitor.limit_cpus(cpu_limit)
+                query_result = ConcurrentQueryRunner(self.__client, self.__task.query_config, self.__task.dataset,
+                                                     threads).run()
+                results.append(HNSWRunnerResult(self.__client, self.__task.query_config.index_config, insert_result,
+                                                query_result, index_size, disk_size, cpu_limit, threads))
+        finally:
+            self.__monitor.limit_cpus(None)
+        return results
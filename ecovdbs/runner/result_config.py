@@ -1,5 +1,7 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Optional
 
+from .case_config import ChurnMode, IndexTime
 from .task_config import QueryMode
 from ..client.base_client import BaseClient
 from ..client.base_config import BaseHNSWConfig
@@ -11,9 +13,50 @@ class InsertRunnerResult:
     Data class representing the result of an insertion operation.
 
     Attributes:
-        t_insert_index: The time taken to insert the data and create the index.
+        t_insert_index: The time taken until the data is inserted and the index is ready for queries. This is the sum
+            of ``t_insert``, ``t_index`` and ``t_ready``.
+        t_insert: The time taken to insert the data.
+        t_index: The time taken by the index creation call.
+        t_ready: The time waited after the insertion and the index creation until the index was fully built.
+        num_vectors: The number of inserted vectors.
+        insert_throughput: The number of inserted vectors per second during the insertion.
+        index_throughput: The number of indexed vectors per second during the index creation call.
+        ready_throughput: The number of indexed vectors per second from the start of the index creation until the
+            index was fully built (``t_index`` + ``t_ready``).
+        workers: The number of parallel workers that inserted the data.
     """
     t_insert_index: float
+    t_insert: float = 0
+    t_index: float = 0
+    t_ready: float = 0
+    num_vectors: int = 0
+    insert_throughput: float = 0
+    index_throughput: float = 0
+    ready_throughput: float = 0
+    workers: int = 1
+
+
+@dataclass(frozen=True)
+class QueryLatencyBreakdown:
+    """
+    Data class representing the split of the query latency into the time spent in the database engine, on the network
+    and in the client, averaged over a sample of profiled queries.
+
+    Attributes:
+        num_queries: The number of profiled queries.
+        total_time: The average latency of a query measured by the client in seconds.
+        engine_time: The average time the database engine spent on a query in seconds. None if the database does not
+            report the time.
+        network_time: The average duration of a request without work in the engine in seconds, i.e. the network and
+            protocol overhead.
+        client_time: The remaining latency in seconds, i.e. the time spent encoding the request and decoding the
+            response in the client. Includes the engine time if it is not reported.
+    """
+    num_queries: int
+    total_time: float
+    engine_time: Optional[float]
+    network_time: float
+    client_time: float
 
 
 @dataclass(frozen=True)
@@ -29,6 +72,17 @@ class HNSWQueryEFResult:
         total_time: The total time taken to execute all queries.
         num_queries: The total number of queries executed.
         k: The number of nearest neighbors considered.
+        latency_breakdown: The split of the query latency of a sample of the queries. None if the queries were not
+            profiled (see :class:`QueryLatencyBreakdown`).
+        query_plans: The plan of a filtered query for every filter value. None if the query mode is not filtered or
+            the database does not expose the plans.
+        load_time: The time taken to load the data before the queries (see :meth:`BaseClient.load`). The data is
+            loaded again for every ef value, so with the cold cache mode of pgvector the queries of every ef value start
+            from empty caches and ``avg_query_time`` includes warming them up.
+        first_query_time: The time taken by the first query after loading the data. With a query batch size above 1,
+            the time of the first batch.
+        avg_batch_time: The average time taken to execute a batch of queries. 0 if the queries were sent one at a
+            time. ``avg_query_time`` is the time of a batch divided by its number of queries.
     """
     ef: int
     avg_recall: float
@@ -37,6 +91,11 @@ class HNSWQueryEFResult:
     total_time: float
     num_queries: int
     k: int
+    latency_breakdown: Optional[QueryLatencyBreakdown] = None
+    query_plans: Optional[dict[str, str]] = None
+    load_time: float = 0
+    first_query_time: float = 0
+    avg_batch_time: float = 0
 
 
 @dataclass(frozen=True)
@@ -63,6 +122,56 @@ class HNSWQueryRunnerResult:
     mode_results: list[HNSWQueryModeResult]
 
 
+@dataclass(frozen=True)
+class PhaseResult:
+    """
+    Data class representing the resource usage of the database container in one phase of a run, e.g. the insertion,
+    the index build or the queries for one ef value.
+
+    Attributes:
+        name: The name of the phase.
+        operations: The number of vectors inserted or indexed or the number of queries run in the phase.
+        duration: The duration of the phase in seconds.
+        avg_cpu_usage: The average CPU usage in percent of one core.
+        peak_cpu_usage: The highest CPU usage between two samples in percent of one core.
+        avg_memory: The average memory usage in MB.
+        peak_memory: The highest memory usage in MB.
+        block_read: The data read from block devices in MB.
+        block_write: The data written to block devices in MB.
+        network_received: The data received over the network in MB.
+        network_sent: The data sent over the network in MB.
+        operations_per_cpu_second: The operations per second of CPU time, i.e. the inserts per CPU second or the
+            queries per second per used core. 0 if no CPU time was measured.
+        memory_per_million_vectors: The peak memory in MB per million vectors in the database.
+    """
+    name: str
+    operations: int
+    duration: float
+    avg_cpu_usage: float
+    peak_cpu_usage: float
+    avg_memory: float
+    peak_memory: float
+    block_read: float
+    block_write: float
+    network_received: float
+    network_sent: float
+    operations_per_cpu_second: float
+    memory_per_million_vectors: float
+
+
+@dataclass(frozen=True)
+class StorageSample:
+    """
+    Data class representing the storage of the database split into its components at one point of a run.
+
+    Attributes:
+        name: The point of the run, ``before_<phase>``, ``after_<phase>`` or ``after_vacuum``.
+        components: The size of every component in MB (see :meth:`BaseClient.storage_breakdown`).
+    """
+    name: str
+    components: dict[str, float]
+
+
 @dataclass(frozen=True)
 class HNSWRunnerResult:
     """
@@ -75,6 +184,14 @@ class HNSWRunnerResult:
         query_result: The result of the query operations (see :class:`HNSWQueryRunnerResult`).
         index_size: The size of the HNSW index in MB.
         disk_size: The disk size used by the database in MB.
+        cpu_limit: The number of cores the database container was limited to during the queries. None if the
+            container was not limited.
+        query_threads: The number of threads running the queries concurrently, each with its own connection.
+        phase_results: The resource usage of the database container in every phase of the run. Empty if the run was
+            not monitored (see :class:`PhaseResult`).
+        storage_samples: The storage components before and after every phase of the run and after reclaiming the
+            space of deleted entries. Empty if the database does not expose the components (see
+            :class:`StorageSample`).
     """
     client: BaseClient
     index_config: BaseHNSWConfig
@@ -82,3 +199,362 @@ class HNSWRunnerResult:
     query_result: HNSWQueryRunnerResult
     index_size: float
     disk_size: float
+    cpu_limit: Optional[float] = None
+    query_threads: int = 1
+    phase_results: list[PhaseResult] = field(default_factory=list)
+    storage_samples: list[StorageSample] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class InsertScalingResult:
+    """
+    Data class representing the result of inserting the data with an increasing number of parallel workers.
+
+    Attributes:
+        client: The used database client (see :class:`BaseClient`).
+        insert_results: The results of the insertion, one for every number of workers (see
+            :class:`InsertRunnerResult`).
+    """
+    client: BaseClient
+    insert_results: list[InsertRunnerResult]
+
+
+@dataclass(frozen=True)
+class BatchSizeCalibrationResult:
+    """
+    Data class representing the result of the insert batch size calibration.
+
+    Attributes:
+        client: The used database client (see :class:`BaseClient`).
+        dimension: The dimension of the inserted embeddings.
+        batch_sizes: The batch sizes that were inserted successfully.
+        insert_results: The results of the insertion of the sample, one for every batch size in ``batch_sizes`` (see
+            :class:`InsertRunnerResult`).
+        best_batch_size: The batch size with the highest insert throughput.
+    """
+    client: BaseClient
+    dimension: int
+    batch_sizes: list[int]
+    insert_results: list[InsertRunnerResult]
+    best_batch_size: int
+
+
+@dataclass(frozen=True)
+class MixedWorkloadWindowResult:
+    """
+    Data class representing the results of a mixed workload within one time window.
+
+    Attributes:
+        start: The start of the window in seconds since the start of the workload.
+        queries_per_second: The number of queries finished per second within the window.
+        avg_recall: The average recall of the queries finished within the window.
+        p50_query_time: The median time taken to execute a query within the window.
+        p99_query_time: The 99th percentile of the time taken to execute a query within the window.
+        inserts_per_second: The number of vectors inserted per second within the window.
+    """
+    start: float
+    queries_per_second: float
+    avg_recall: float
+    p50_query_time: float
+    p99_query_time: float
+    inserts_per_second: float
+
+
+@dataclass(frozen=True)
+class MixedWorkloadResult:
+    """
+    Data class representing the result of a mixed read/write workload.
+
+    Attributes:
+        client: The used database client (see :class:`BaseClient`).
+        index_config: The configuration of the HNSW index (see :class:`BaseHNSWConfig`).
+        initial_insert_result: The result of inserting the initial part of the dataset (see
+            :class:`InsertRunnerResult`).
+        ef: The size of the dynamic list for the nearest neighbors used by the queries.
+        writers: The number of writer threads.
+        readers: The number of reader threads.
+        write_rate: The configured number of vectors inserted per second. 0 if not limited.
+        write_throughput: The measured number of vectors inserted per second.
+        total_time: The duration of the workload in seconds.
+        num_queries: The number of queries executed during the workload.
+        queries_per_second: The number of queries executed per second.
+        avg_recall: The average recall of the queries. Only the ground truth neighbors that were already inserted are
+            considered.
+        avg_query_time: The average time taken to execute a query.
+        p50_query_time: The median time taken to execute a query.
+        p90_query_time: The 90th percentile of the time taken to execute a query.
+        p95_query_time: The 95th percentile of the time taken to execute a query.
+        p99_query_time: The 99th percentile of the time taken to execute a query.
+        windows: The results over time (see :class:`MixedWorkloadWindowResult`).
+    """
+    client: BaseClient
+    index_config: BaseHNSWConfig
+    initial_insert_result: InsertRunnerResult
+    ef: int
+    writers: int
+    readers: int
+    write_rate: float
+    write_throughput: float
+    total_time: float
+    num_queries: int
+    queries_per_second: float
+    avg_recall: float
+    avg_query_time: float
+    p50_query_time: float
+    p90_query_time: float
+    p95_query_time: float
+    p99_query_time: float
+    windows: list[MixedWorkloadWindowResult]
+
+
+@dataclass(frozen=True)
+class FreshnessRateResult:
+    """
+    Data class representing the freshness of a client under one background ingest rate.
+
+    Attributes:
+        ingest_rate: The configured background ingest rate in vectors per second. 0 without background ingest.
+        ingest_throughput: The measured background ingest rate in vectors per second.
+        num_markers: The number of probed marker vectors.
+        num_timeouts: The number of markers that were not found within the timeout.
+        insert_times: The time taken to insert every marker until the client returned.
+        visibility_delays: The time from the return of the insert until the marker was first found by a query, for
+            every marker that was found.
+        avg_delay: The average visibility delay.
+        p50_delay: The median visibility delay.
+        p90_delay: The 90th percentile of the visibility delays.
+        p99_delay: The 99th percentile of the visibility delays.
+        max_delay: The maximum visibility delay.
+    """
+    ingest_rate: float
+    ingest_throughput: float
+    num_markers: int
+    num_timeouts: int
+    insert_times: list[float]
+    visibility_delays: list[float]
+    avg_delay: float
+    p50_delay: float
+    p90_delay: float
+    p99_delay: float
+    max_delay: float
+
+
+@dataclass(frozen=True)
+class FreshnessResult:
+    """
+    Data class representing the result of the freshness (time-to-searchable) measurement.
+
+    Attributes:
+        client: The used database client (see :class:`BaseClient`).
+        index_config: The configuration of the HNSW index (see :class:`BaseHNSWConfig`).
+        initial_insert_result: The result of inserting the initial part of the dataset (see
+            :class:`InsertRunnerResult`).
+        ef: The size of the dynamic list for the nearest neighbors used by the probe queries.
+        rate_results: The freshness for every background ingest rate (see :class:`FreshnessRateResult`).
+    """
+    client: BaseClient
+    index_config: BaseHNSWConfig
+    initial_insert_result: InsertRunnerResult
+    ef: int
+    rate_results: list[FreshnessRateResult]
+
+
+@dataclass(frozen=True)
+class ChurnRoundResult:
+    """
+    Data class representing the state of the database after one round of the churn scenario.
+
+    Attributes:
+        round: The number of the round. Round 0 is the state after the initial insertion.
+        num_replaced: The number of vectors replaced in the round.
+        total_replaced_fraction: The number of all vectors replaced so far divided by the size of the dataset.
+        t_replace: The time taken to replace the vectors of the round.
+        t_ready: The time waited until the index was fully built after the replacement.
+        replace_throughput: The number of vectors replaced per second.
+        query_result: The result of the queries after the round (see :class:`HNSWQueryRunnerResult`).
+        index_size: The size of the index after the round.
+        disk_size: The size of the disk after the round.
+    """
+    round: int
+    num_replaced: int
+    total_replaced_fraction: float
+    t_replace: float
+    t_ready: float
+    replace_throughput: float
+    query_result: HNSWQueryRunnerResult
+    index_size: float
+    disk_size: float
+
+
+@dataclass(frozen=True)
+class ChurnResult:
+    """
+    Data class representing the result of the churn scenario.
+
+    Attributes:
+        client: The used database client (see :class:`BaseClient`).
+        index_config: The configuration of the HNSW index (see :class:`BaseHNSWConfig`).
+        mode: The way the vectors were replaced (see :class:`ChurnMode`).
+        fraction: The fraction of the dataset replaced in every round.
+        insert_result: The result of the initial insertion (see :class:`InsertRunnerResult`).
+        round_results: The state after every round, starting with round 0 (see :class:`ChurnRoundResult`).
+    """
+    client: BaseClient
+    index_config: BaseHNSWConfig
+    mode: ChurnMode
+    fraction: float
+    insert_result: InsertRunnerResult
+    round_results: list[ChurnRoundResult]
+
+
+@dataclass(frozen=True)
+class PrefixScalingStepResult:
+    """
+    Data class representing the costs at one prefix size of the prefix scaling scenario.
+
+    Attributes:
+        num_vectors: The number of vectors in the database after the step.
+        num_inserted: The number of vectors inserted in the step.
+        t_insert: The time taken to insert the vectors of the step.
+        t_index: The time taken by the index creation call of the step. 0 if the index is only updated.
+        t_ready: The time waited until the index was fully built.
+        insert_throughput: The number of vectors inserted per second in the step.
+        index_size: The size of the index after the step.
+        disk_size: The size of the disk after the step.
+        query_result: The result of the queries against the ground truth of the prefix (see
+            :class:`HNSWQueryRunnerResult`).
+    """
+    num_vectors: int
+    num_inserted: int
+    t_insert: float
+    t_index: float
+    t_ready: float
+    insert_throughput: float
+    index_size: float
+    disk_size: float
+    query_result: HNSWQueryRunnerResult
+
+
+@dataclass(frozen=True)
+class PowerLawFit:
+    """
+    Data class representing a cost curve ``value = coefficient * num_vectors ** exponent`` fitted to the steps of the
+    prefix scaling scenario.
+
+    Attributes:
+        name: The name of the fitted cost.
+        coefficient: The coefficient of the power law.
+        exponent: The exponent of the power law.
+        num_vectors: The number of vectors of every step the power law is fitted to.
+        values: The measured cost of every step the power law is fitted to.
+    """
+    name: str
+    coefficient: float
+    exponent: float
+    num_vectors: list[int]
+    values: list[float]
+
+
+@dataclass(frozen=True)
+class PrefixScalingResult:
+    """
+    Data class representing the result of the prefix scaling scenario.
+
+    Attributes:
+        client: The used database client (see :class:`BaseClient`).
+        index_config: The configuration of the HNSW index (see :class:`BaseHNSWConfig`).
+        index_time: The time at which the index is created (see :class:`IndexTime`).
+        step_results: The costs at every prefix size (see :class:`PrefixScalingStepResult`).
+        fits: The cost curves fitted to the steps (see :class:`PowerLawFit`).
+    """
+    client: BaseClient
+    index_config: BaseHNSWConfig
+    index_time: IndexTime
+    step_results: list[PrefixScalingStepResult]
+    fits: list[PowerLawFit]
+
+
+@dataclass(frozen=True)
+class BuildScalingStepResult:
+    """
+    Data class representing one index build of the build scaling scenario.
+
+    Attributes:
+        threads: The number of build threads.
+        container_limited: True if the database has no build thread setting and the container was limited to
+            ``threads`` cores instead.
+        insert_result: The result of the rebuild (see :class:`InsertRunnerResult`).
+        t_build: The time taken until the rebuilt index was ready.
+        speedup: The build time with the fewest threads divided by ``t_build``.
+        parallel_efficiency: The speedup divided by the increase of the number of threads.
+        avg_cpu_usage: The average CPU usage of the database container during the build in percent of one core.
+    """
+    threads: int
+    container_limited: bool
+    insert_result: InsertRunnerResult
+    t_build: float
+    speedup: float
+    parallel_efficiency: float
+    avg_cpu_usage: float
+
+
+@dataclass(frozen=True)
+class BuildScalingResult:
+    """
+    Data class representing the result of the build scaling scenario.
+
+    Attributes:
+        client: The used database client (see :class:`BaseClient`).
+        index_config: The configuration of the HNSW index (see :class:`BaseHNSWConfig`).
+        step_results: The builds in the order of the number of threads (see :class:`BuildScalingStepResult`).
+    """
+    client: BaseClient
+    index_config: BaseHNSWConfig
+    step_results: list[BuildScalingStepResult]
+
+
+@dataclass(frozen=True)
+class MemoryPressureStepResult:
+    """
+    Data class representing the queries under one memory limit of the memory pressure scenario.
+
+    Attributes:
+        index_fraction: The memory limit as a fraction of the index size. None for the run without a limit.
+        memory_limit: The memory limit of the container in MB. None for the run without a limit.
+        query_result: The result of the queries (see :class:`HNSWQueryRunnerResult`). None if the queries failed.
+        avg_memory_usage: The average memory usage of the container during the queries in MB.
+        oom_killed: True if the container was stopped by the OOM killer.
+        oom_kills: The number of processes inside the container killed by the OOM killer during the queries.
+        swap: The swap used by the container after the queries in MB.
+        major_faults: The number of major page faults during the queries.
+    """
+    index_fraction: Optional[float]
+    memory_limit: Optional[float]
+    query_result: Optional[HNSWQueryRunnerResult]
+    avg_memory_usage: float
+    oom_killed: bool
+    oom_kills: int
+    swap: float
+    major_faults: int
+
+
+@dataclass(frozen=True)
+class MemoryPressureResult:
+    """
+    Data class representing the result of the memory pressure scenario.
+
+    Attributes:
+        client: The used database client (see :class:`BaseClient`).
+        index_config: The configuration of the HNSW index (see :class:`BaseHNSWConfig`).
+        insert_result: The result of the insertion (see :class:`InsertRunnerResult`).
+        index_size: The size of the index in MB.
+        idle_memory: The memory usage of the container before the insertion in MB.
+        step_results: The run without a limit followed by the runs with decreasing limits
+            (see :class:`MemoryPressureStepResult`).
+    """
+    client: BaseClient
+    index_config: BaseHNSWConfig
+    insert_result: InsertRunnerResult
+    index_size: float
+    idle_memory: float
+    step_results: list[MemoryPressureStepResult]
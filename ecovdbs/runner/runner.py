@@ -1,33 +1,116 @@
 import logging
 import tqdm
-from typing import Optional, Callable
+from contextlib import nullcontext, contextmanager
+from copy import deepcopy
+from dataclasses import replace
+from typing import Iterator, Optional, Callable
 
+from .case_config import HNSWConfig
+from .ingest import parallel_insert
 from .result_config import (InsertRunnerResult, HNSWQueryEFResult, HNSWQueryModeResult, HNSWQueryRunnerResult,
-                            HNSWRunnerResult)
+                            HNSWRunnerResult, InsertScalingResult, BatchSizeCalibrationResult, PhaseResult,
+                            QueryLatencyBreakdown, StorageSample)
 from .task_config import HNSWTask, IndexTime, InsertConfig, HNSWQueryConfig, QueryMode
-from .utility import time_it
+from .utility import time_it, wait_for_index
 from ..client.base_client import BaseClient
 from ..client.base_config import BaseHNSWConfig
+from ..client.utility import save_batch_size, bytes_to_mb, batch_ranges
 from ..dataset.dataset import Dataset
+from ..docker_stats import ContainerMonitor, Phase
 
 log = logging.getLogger(__name__)
 
 
+def _throughput(num_vectors: int, duration: float) -> float:
+    """
+    Calculate the throughput of an operation.
+
+    :param num_vectors: The number of processed vectors.
+    :param duration: The duration of the operation in seconds.
+    :return: The number of processed vectors per second or 0 if the operation took no time.
+    """
+    return num_vectors / duration if duration > 0 else 0
+
+
+@contextmanager
+def _phase(monitor: Optional[ContainerMonitor], name: str, operations: int, client: Optional[BaseClient] = None,
+           storage_samples: Optional[list[StorageSample]] = None) -> Iterator[None]:
+    """
+    Mark a phase on the container monitor (see :meth:`ContainerMonitor.phase`) and sample the storage of the database
+    before and after the phase, outside the marked phase.
+
+    :param monitor: The monitor of the database container or None if the run is not monitored.
+    :param name: The name of the phase.
+    :param operations: The number of vectors or queries processed in the phase.
+    :param client: The client of the database whose storage is sampled.
+    :param storage_samples: The list the storage samples are appended to or None if the storage is not sampled.
+    """
+    _sample_storage(client, storage_samples, f"before_{name}")
+    with monitor.phase(name, operations) if monitor is not None else nullcontext():
+        yield
+    _sample_storage(client, storage_samples, f"after_{name}")
+
+
+def _sample_storage(client: Optional[BaseClient], storage_samples: Optional[list[StorageSample]], name: str,
+                    vacuum: bool = False) -> None:
+    """
+    Append the storage components of the database to the samples (see :meth:`BaseClient.storage_breakdown`).
+
+    :param client: The client of the database.
+    :param storage_samples: The list the sample is appended to or None if the storage is not sampled.
+    :param name: The name of the sample.
+    :param vacuum: Whether to reclaim the space of deleted entries before the storage is measured.
+    """
+    if client is None or storage_samples is None:
+        return
+    components = client.storage_breakdown(vacuum)
+    if components is not None:
+        storage_samples.append(StorageSample(name, components))
+
+
+def _phase_results(monitor: ContainerMonitor, phases: list[Phase], num_vectors: int) -> list[PhaseResult]:
+    """
+    Compute the resource usage and the efficiency of the database container in the phases.
+
+    :param monitor: The monitor of the database container.
+    :param phases: The phases marked on the monitor.
+    :param num_vectors: The number of vectors in the database.
+    :return: A result for every phase (see :class:`PhaseResult`).
+    """
+    results: list[PhaseResult] = []
+    for phase in phases:
+        usage = monitor.resource_usage(phase.start, phase.end)
+        peak_memory = bytes_to_mb(usage.peak_memory)
+        results.append(PhaseResult(
+            phase.name, phase.operations, (phase.end - phase.start).total_seconds(), usage.avg_cpu_usage,
+            usage.peak_cpu_usage, bytes_to_mb(usage.avg_memory), peak_memory, bytes_to_mb(usage.block_read),
+            bytes_to_mb(usage.block_write), bytes_to_mb(usage.network_received), bytes_to_mb(usage.network_sent),
+            phase.operations / usage.cpu_time if usage.cpu_time > 0 else 0.0,
+            peak_memory / (num_vectors / 1_000_000) if num_vectors else 0.0))
+    return results
+
+
 class HNSWRunner:
     """
     Runner class for HNSW tasks, coordinating insertion and query operations.
     """
 
-    def __init__(self, hnsw_task: HNSWTask):
+    def __init__(self, hnsw_task: HNSWTask, monitor: Optional[ContainerMonitor] = None):
         """
         Initialize the HNSWRunner with a given HNSW task.
 
         :param hnsw_task: The HNSW task configuration (see :class:`HNSWTask`).
+        :param monitor: The running monitor of the database container. If given, the insertion, the index build and
+            the queries for every ef value are marked as phases and their resource usage is added to the result.
         """
         self.__client = hnsw_task.client
         self.__index_config = hnsw_task.query_config.index_config
-        self.__insert_runner = InsertRunner(hnsw_task.client, hnsw_task.insert_config, hnsw_task.dataset)
-        self.__query_runner = HNSWQueryRunner(hnsw_task.client, hnsw_task.query_config, hnsw_task.dataset)
+        self.__monitor: Optional[ContainerMonitor] = monitor
+        self.__storage_samples: list[StorageSample] = []
+        self.__insert_runner = InsertRunner(hnsw_task.client, hnsw_task.insert_config, hnsw_task.dataset, monitor,
+                                            self.__storage_samples)
+        self.__query_runner = HNSWQueryRunner(hnsw_task.client, hnsw_task.query_config, hnsw_task.dataset, monitor,
+                                              self.__storage_samples)
 
     def run(self):
         """
@@ -35,11 +118,78 @@ class HNSWRunner:
 
         :return: Results of the HNSW task (see :class:`HNSWRunnerResult`).
         """
+        first_phase = len(self.__monitor.phases) if self.__monitor is not None else 0
         insert_result = self.__insert_runner.run()
         query_result = self.__query_runner.run()
         index_size = self.__client.index_storage()
         disk_size = self.__client.disk_storage()
-        return HNSWRunnerResult(self.__client, self.__index_config, insert_result, query_result, index_size, disk_size)
+        phase_results = _phase_results(self.__monitor, self.__monitor.phases[first_phase:],
+                                       insert_result.num_vectors) if self.__monitor is not None else []
+        _sample_storage(self.__client, self.__storage_samples, "after_vacuum", vacuum=True)
+        return HNSWRunnerResult(self.__client, self.__index_config, insert_result, query_result, index_size, disk_size,
+                                phase_results=phase_results, storage_samples=list(self.__storage_samples))
+
+
+class HNSWGridRunner:
+    """
+    Runner class for a grid of HNSW build configurations. The data is inserted only once and for every build
+    configuration only the index is dropped and rebuilt before the queries are run against it.
+    """
+
+    def __init__(self, hnsw_task: HNSWTask, build_configs: list[HNSWConfig],
+                 monitor: Optional[ContainerMonitor] = None):
+        """
+        Initialize the HNSWGridRunner with a given HNSW task and the build configurations.
+
+        The index is always built after the insertion, because the data is reused by all build configurations. Clients
+        that build the index during the insertion (:attr:`IndexTime.NO_INDEX`) insert the data again for every build
+        configuration.
+
+        :param hnsw_task: The HNSW task configuration (see :class:`HNSWTask`).
+        :param build_configs: The build configurations to run. Only ``M`` and ``ef_construction`` are used, the
+            ``ef_search`` values are taken from the task (see :class:`HNSWConfig`).
+        :param monitor: The running monitor of the database container. If given, every result contains the resource
+            usage of the phases of its build configuration.
+        """
+        self.__client = hnsw_task.client
+        self.__index_config = hnsw_task.query_config.index_config
+        self.__build_configs = build_configs
+        self.__monitor: Optional[ContainerMonitor] = monitor
+        index_time = IndexTime.NO_INDEX if hnsw_task.insert_config.index_time == IndexTime.NO_INDEX \
+            else IndexTime.POST_INDEX
+        insert_config = InsertConfig(index_time=index_time, query_mode=hnsw_task.insert_config.query_mode,
+                                     workers=hnsw_task.insert_config.workers)
+        self.__storage_samples: list[StorageSample] = []
+        self.__insert_runner = InsertRunner(hnsw_task.client, insert_config, hnsw_task.dataset, monitor,
+                                            self.__storage_samples)
+        self.__query_runner = HNSWQueryRunner(hnsw_task.client, hnsw_task.query_config, hnsw_task.dataset, monitor,
+                                              self.__storage_samples)
+
+    def run(self) -> list[HNSWRunnerResult]:
+        """
+        Run the HNSW task for every build configuration.
+
+        :return: Results of the HNSW task, one for every build configuration in the given order (see
+            :class:`HNSWRunnerResult`).
+        """
+        results: list[HNSWRunnerResult] = []
+        for i, build_config in enumerate(self.__build_configs):
+            log.info("Run build configuration M=%d ef_construction=%d", build_config.M, build_config.ef_construction)
+            self.__index_config.change_build_param(build_config.M, build_config.ef_construction)
+            first_phase = len(self.__monitor.phases) if self.__monitor is not None else 0
+            first_sample = len(self.__storage_samples)
+            insert_result = self.__insert_runner.run() if i == 0 else self.__insert_runner.rebuild()
+            query_result = self.__query_runner.run()
+            index_size = self.__client.index_storage()
+            disk_size = self.__client.disk_storage()
+            phase_results = _phase_results(self.__monitor, self.__monitor.phases[first_phase:],
+                                           insert_result.num_vectors) if self.__monitor is not None else []
+            _sample_storage(self.__client, self.__storage_samples, "after_vacuum", vacuum=True)
+            # The index configuration is changed by the next build configuration, therefore a copy is stored
+            results.append(HNSWRunnerResult(self.__client, deepcopy(self.__index_config), insert_result,
+                                            query_result, index_size, disk_size, phase_results=phase_results,
+                                            storage_samples=self.__storage_samples[first_sample:]))
+        return results
 
 
 class InsertRunner:
@@ -47,16 +197,24 @@ class InsertRunner:
     Runner class for handling insert operations in the HNSW task.
     """
 
-    def __init__(self, client: BaseClient, config: InsertConfig, dataset: Dataset):
+    def __init__(self, client: BaseClient, config: InsertConfig, dataset: Dataset,
+                 monitor: Optional[ContainerMonitor] = None, storage_samples: Optional[list[StorageSample]] = None):
         """
         Initialize the InsertRunner with the client, configuration, and dataset.
 
         :param client: The client to interact with the database (see :class:`BaseClient`).
         :param config: Configuration for the insert operation (see :class:`InsertConfig`).
         :param dataset: The dataset to be used for the insert operation (see :class:`Dataset`).
+        :param monitor: The running monitor of the database container. If given, the insertion and the index build are
+            marked as the phases ``ingest`` and ``build``.
+        :param storage_samples: The list the storage before and after the phases is appended to. If None, the storage
+            is not sampled.
         """
         self.__client: BaseClient = client
+        self.__monitor: Optional[ContainerMonitor] = monitor
+        self.__storage_samples: Optional[list[StorageSample]] = storage_samples
         self.__index_time: IndexTime = config.index_time
+        self.__workers: int = config.workers
         self.__data_vectors: list[list[float]] = dataset.data_vectors
         self.__metadata: Optional[
             list[str]] = dataset.metadata if QueryMode.FILTERED_QUERY == config.query_mode else None
@@ -68,29 +226,76 @@ class InsertRunner:
         :return: Result of the insert operation (see :class:`InsertRunnerResult`).
         """
         log.info("Start InsertRunner for client %s", type(self.__client).__name__)
+        num_vectors = len(self.__data_vectors)
         if self.__index_time == IndexTime.PRE_INDEX:
-            _, t_index = self.__create_index()
-            _, t_insert = self.__insert(self.__data_vectors, self.__metadata)
+            # The index is built incrementally during the insertion, the build phase is the wait for the rest
+            with _phase(self.__monitor, "ingest", num_vectors, self.__client, self.__storage_samples):
+                _, t_index = self.__create_index()
+                _, t_insert = self.__insert(self.__data_vectors, self.__metadata)
+            with _phase(self.__monitor, "build", num_vectors, self.__client, self.__storage_samples):
+                _, t_ready = wait_for_index(self.__client)
         elif self.__index_time == IndexTime.POST_INDEX:
-            _, t_insert = self.__insert(self.__data_vectors, self.__metadata)
-            _, t_index = self.__create_index()
+            with _phase(self.__monitor, "ingest", num_vectors, self.__client, self.__storage_samples):
+                _, t_insert = self.__insert(self.__data_vectors, self.__metadata)
+            with _phase(self.__monitor, "build", num_vectors, self.__client, self.__storage_samples):
+                _, t_index = self.__create_index()
+                _, t_ready = wait_for_index(self.__client)
         elif self.__index_time == IndexTime.NO_INDEX:
-            _, t_insert = self.__insert(self.__data_vectors, self.__metadata)
+            with _phase(self.__monitor, "ingest", num_vectors, self.__client, self.__storage_samples):
+                _, t_insert = self.__insert(self.__data_vectors, self.__metadata)
             t_index = 0
+            t_ready = 0
         else:
             raise ValueError("Invalid index time")
-        return InsertRunnerResult(t_insert + t_index)
+        return self.__result(t_insert, t_index, t_ready)
+
+    def rebuild(self) -> InsertRunnerResult:
+        """
+        Drop the index and build it again on the already inserted data. If the index is built during the insertion
+        (:attr:`IndexTime.NO_INDEX`), the data is inserted again instead.
+
+        :return: Result of the rebuild operation (see :class:`InsertRunnerResult`).
+        """
+        log.info("Rebuild index for client %s", type(self.__client).__name__)
+        self.__client.drop_index()
+        num_vectors = len(self.__data_vectors)
+        if self.__index_time == IndexTime.NO_INDEX:
+            with _phase(self.__monitor, "ingest", num_vectors, self.__client, self.__storage_samples):
+                _, t_insert = self.__insert(self.__data_vectors, self.__metadata)
+            t_index = 0
+            t_ready = 0
+        else:
+            t_insert = 0
+            with _phase(self.__monitor, "build", num_vectors, self.__client, self.__storage_samples):
+                _, t_index = self.__create_index()
+                _, t_ready = wait_for_index(self.__client)
+        return self.__result(t_insert, t_index, t_ready)
+
+    def __result(self, t_insert: float, t_index: float, t_ready: float) -> InsertRunnerResult:
+        """
+        Create the result of the insert operation from the measured times.
+
+        :param t_insert: The time taken to insert the data.
+        :param t_index: The time taken by the index creation call.
+        :param t_ready: The time waited until the index was fully built.
+        :return: Result of the insert operation (see :class:`InsertRunnerResult`).
+        """
+        num_vectors = len(self.__data_vectors)
+        return InsertRunnerResult(t_insert + t_index + t_ready, t_insert, t_index, t_ready, num_vectors,
+                                  _throughput(num_vectors, t_insert), _throughput(num_vectors, t_index),
+                                  _throughput(num_vectors, t_index + t_ready), self.__workers)
 
     @time_it
     def __insert(self, embeddings: list[list[float]], metadata: Optional[list[str]] = None) -> None:
         """
-        Insert embeddings into the database.
+        Insert embeddings into the database with the configured number of workers and flush them.
 
         :param embeddings: List of data vectors to be inserted.
         :param metadata: Optional list of metadata corresponding to the data vectors.
         """
         log.info("Insert %d embeddings", len(embeddings))
-        self.__client.insert(embeddings, metadata)
+        parallel_insert(self.__client, embeddings, metadata, self.__workers)
+        self.__client.flush()
 
     @time_it
     def __create_index(self) -> None:
@@ -101,23 +306,127 @@ class InsertRunner:
         self.__client.create_index()
 
 
+class InsertScalingRunner:
+    """
+    Runner class for inserting the data with an increasing number of parallel workers.
+    """
+
+    def __init__(self, task_factory: Callable[[], HNSWTask], workers: list[int]):
+        """
+        Initialize the InsertScalingRunner with a factory for the HNSW task and the numbers of workers.
+
+        :param task_factory: A function that creates a new HNSW task. A new task is created for every number of workers,
+            so that every insertion starts with an empty database (see :class:`HNSWTask`).
+        :param workers: The numbers of parallel workers to insert the data with.
+        """
+        self.__task_factory = task_factory
+        self.__workers = workers
+
+    def run(self) -> InsertScalingResult:
+        """
+        Insert the data once for every number of workers. No index is created, so only the insertion is measured
+        (except for clients that build the index during the insertion like Chroma DB).
+
+        :return: Results of the insertions (see :class:`InsertScalingResult`).
+        """
+        insert_results: list[InsertRunnerResult] = []
+        client: Optional[BaseClient] = None
+        for workers in self.__workers:
+            task = self.__task_factory()
+            client = task.client
+            log.info("Insert with %d workers for client %s", workers, type(client).__name__)
+            insert_config = InsertConfig(index_time=IndexTime.NO_INDEX, query_mode=task.insert_config.query_mode,
+                                         workers=workers)
+            insert_results.append(InsertRunner(client, insert_config, task.dataset).run())
+            client.close()
+        return InsertScalingResult(client, insert_results)
+
+
+class BatchSizeCalibrationRunner:
+    """
+    Runner class for calibrating the insert batch size of a client. A sample of the data is inserted with every batch
+    size and the batch size with the highest throughput is saved for the client and the dimension of the dataset.
+    """
+
+    def __init__(self, task_factory: Callable[[], HNSWTask], batch_sizes: list[int], sample_size: int):
+        """
+        Initialize the BatchSizeCalibrationRunner with a factory for the HNSW task, the batch sizes and the sample size.
+
+        :param task_factory: A function that creates a new HNSW task. A new task is created for every batch size, so
+            that every insertion starts with an empty database (see :class:`HNSWTask`).
+        :param batch_sizes: The batch sizes to try.
+        :param sample_size: The number of vectors inserted for every batch size.
+        """
+        self.__task_factory = task_factory
+        self.__batch_sizes = batch_sizes
+        self.__sample_size = sample_size
+
+    def run(self) -> BatchSizeCalibrationResult:
+        """
+        Insert the sample once for every batch size and save the batch size with the highest insert throughput. Batch
+        sizes for which the insertion fails (e.g. because the request is too large) are skipped.
+
+        :return: Results of the calibration (see :class:`BatchSizeCalibrationResult`).
+        """
+        batch_sizes: list[int] = []
+        insert_results: list[InsertRunnerResult] = []
+        client: Optional[BaseClient] = None
+        dimension: int = 0
+        for batch_size in self.__batch_sizes:
+            task = self.__task_factory()
+            client = task.client
+            dimension = task.dataset.dimension
+            metadata = task.dataset.metadata[:self.__sample_size] if task.dataset.metadata else None
+            sample = replace(task.dataset, data_vectors=task.dataset.data_vectors[:self.__sample_size],
+                             metadata=metadata)
+            log.info("Insert %d vectors with batch size %d for client %s", len(sample.data_vectors), batch_size,
+                     type(client).__name__)
+            client.set_batch_size(batch_size)
+            insert_config = InsertConfig(index_time=IndexTime.NO_INDEX, query_mode=task.insert_config.query_mode)
+            try:
+                insert_results.append(InsertRunner(client, insert_config, sample).run())
+                batch_sizes.append(batch_size)
+            except Exception as e:
+                log.warning("Insert with batch size %d failed for client %s: %s", batch_size, type(client).__name__,
+                            e)
+            finally:
+                client.close()
+        if not insert_results:
+            raise RuntimeError(f"All batch sizes failed for client {type(client).__name__}")
+        best_batch_size = max(zip(batch_sizes, insert_results), key=lambda r: r[1].insert_throughput)[0]
+        log.info("Best batch size for client %s and dimension %d is %d", type(client).__name__, dimension,
+                 best_batch_size)
+        save_batch_size(type(client).__name__, dimension, best_batch_size)
+        return BatchSizeCalibrationResult(client, dimension, batch_sizes, insert_results, best_batch_size)
+
+
 class HNSWQueryRunner:
     """
     Runner class for handling query operations in the HNSW task.
     """
 
-    def __init__(self, client: BaseClient, config: HNSWQueryConfig, dataset: Dataset) -> None:
+    def __init__(self, client: BaseClient, config: HNSWQueryConfig, dataset: Dataset,
+                 monitor: Optional[ContainerMonitor] = None,
+                 storage_samples: Optional[list[StorageSample]] = None) -> None:
         """
         Initialize the HNSWQueryRunner with the client, configuration, and dataset.
 
         :param client: The client to interact with the database (see :class:`BaseClient`).
         :param config: Configuration for the query operation (see :class:`HNSWQueryConfig`).
         :param dataset: The dataset to be used for the query operation (see :class:`Dataset`).
+        :param monitor: The running monitor of the database container. If given, the queries for every ef value are
+            marked as the phase ``query_ef<ef>``.
+        :param storage_samples: The list the storage before and after the phases is appended to. If None, the storage
+            is not sampled.
         """
         self.__client: BaseClient = client
+        self.__monitor: Optional[ContainerMonitor] = monitor
+        self.__storage_samples: Optional[list[StorageSample]] = storage_samples
         self.__ef_search: list[int] = config.ef_search
         self.__index_config: BaseHNSWConfig = config.index_config
         self.__query_mode: QueryMode = config.query_mode
+        self.__profile_queries: int = config.profile_queries
+        self.__query_batch_size: int = config.query_batch_size
         self.__query_vectors: list[list[float]] = dataset.query_vectors
         self.__ground_truth_neighbors: list[list[int]] = dataset.ground_truth_neighbors
         self.__keyword_filters: Optional[list[str]] = dataset.keyword_filter
@@ -149,22 +458,30 @@ class HNSWQueryRunner:
         ef_results: list[HNSWQueryEFResult] = []
         for ef in self.__ef_search:
             self.__index_config.change_ef_search(ef)
-            self.__client.load()
+            _, load_time = time_it(self.__client.load)()
             self.total_time = 0
             self.total_recall = 0
+            self.total_batch_time = 0
+            self.num_batches = 0
+            self.first_query_time = None
 
             log.info("Run %d queries for ef %d", self.__num_queries, ef)
-            if query_mode == QueryMode.QUERY:
-                _, total_duration = self.__run_queries()
-            else:
-                _, total_duration = self.__run_queries_extended(query_func, extended_list)
+            with _phase(self.__monitor, f"query_ef{ef}", self.__num_queries, self.__client, self.__storage_samples):
+                if query_mode == QueryMode.QUERY:
+                    _, total_duration = self.__run_queries()
+                else:
+                    _, total_duration = self.__run_queries_extended(query_func, extended_list)
 
             avg_recall: float = self.total_recall / self.__num_queries
             avg_query_time: float = self.total_time / self.__num_queries
             queries_per_second: float = self.__num_queries / total_duration
+            avg_batch_time: float = self.total_batch_time / self.num_batches if self.num_batches else 0
 
+            latency_breakdown = self.__profile() if self.__profile_queries > 0 else None
+            query_plans = self.__query_plans() if query_mode == QueryMode.FILTERED_QUERY else None
             ef_results.append(HNSWQueryEFResult(ef, avg_recall, avg_query_time, queries_per_second, total_duration,
-                                                self.__num_queries, self.__k))
+                                                self.__num_queries, self.__k, latency_breakdown, query_plans,
+                                                load_time, self.first_query_time or 0, avg_batch_time))
         return HNSWQueryModeResult(query_mode, ef_results)
 
     def __get_mode_params(self, query_mode):
@@ -187,13 +504,70 @@ class HNSWQueryRunner:
             raise ValueError("Invalid query mode")
         return extended_list, query_func
 
+    def __profile(self) -> QueryLatencyBreakdown:
+        """
+        Split the latency of the first queries into engine, network and client time. Every query is run three times:
+        timed by the client, with the server-side timing of the database (see :meth:`BaseClient.query_engine_time`)
+        and as a request without work in the engine (see :meth:`BaseClient.ping`). The standard query is profiled in
+        every query mode.
+
+        :return: The average split of the latency (see :class:`QueryLatencyBreakdown`).
+        """
+        queries = self.__query_vectors[:self.__profile_queries]
+        log.info("Profile %d queries", len(queries))
+        total_time = 0.0
+        engine_times: list[float] = []
+        network_time = 0.0
+        for q in queries:
+            total_time += self.__query(q, self.__k)[1]
+            engine_time = self.__client.query_engine_time(q, self.__k)
+            if engine_time is not None:
+                engine_times.append(engine_time)
+            network_time += time_it(self.__client.ping)()[1]
+        total_time /= len(queries)
+        network_time /= len(queries)
+        engine_time = sum(engine_times) / len(engine_times) if engine_times else None
+        client_time = max(0.0, total_time - network_time - (engine_time or 0.0))
+        return QueryLatencyBreakdown(len(queries), total_time, engine_time, network_time, client_time)
+
+    def __query_plans(self) -> Optional[dict[str, str]]:
+        """
+        Get the plan of the first filtered query of every filter value after the timed run (see
+        :meth:`BaseClient.query_plan`).
+
+        :return: The plans by filter value or None if the database does not expose the plans.
+        """
+        plans: dict[str, str] = {}
+        for q, gt, keyword_filter in zip(self.__query_vectors, self.__ground_truth_neighbors, self.__keyword_filters):
+            if keyword_filter in plans:
+                continue
+            plan = self.__client.query_plan(q, len(gt), keyword_filter)
+            if plan is None:
+                return None
+            plans[keyword_filter] = plan
+        return plans
+
     @time_it
     def __run_queries(self) -> None:
         """
-        Run the standard queries.
+        Run the standard queries. With a query batch size above 1, the queries are sent in batches and every query of a
+        batch is counted with its share of the time of the batch. The time of the batches is summed separately.
         """
+        if self.__query_batch_size > 1:
+            for start, end in tqdm.tqdm(batch_ranges(self.__num_queries, self.__query_batch_size)):
+                results, t = self.__batch_query(self.__query_vectors[start:end], self.__k)
+                if self.first_query_time is None:
+                    self.first_query_time = t
+                for gt, res in zip(self.__ground_truth_neighbors[start:end], results):
+                    self.total_recall += len(set(gt) & set(res)) / self.__k
+                self.total_time += t
+                self.total_batch_time += t
+                self.num_batches += 1
+            return
         for q, gt in tqdm.tqdm(zip(self.__query_vectors, self.__ground_truth_neighbors)):
             res, t = self.__query(q, self.__k)
+            if self.first_query_time is None:
+                self.first_query_time = t
             recall = len(set(gt) & set(res)) / self.__k
             self.total_recall += recall
             self.total_time += t
@@ -210,6 +584,8 @@ class HNSWQueryRunner:
         for q, gt, e in tqdm.tqdm(zip(self.__query_vectors, self.__ground_truth_neighbors, extended)):
             self.__k = len(gt)
             res, t = query_func(q, self.__k, e)
+            if self.first_query_time is None:
+                self.first_query_time = t
             recall = len(set(gt) & set(res)) / self.__k
             self.total_recall += recall
             self.total_time += t
@@ -225,6 +601,17 @@ class HNSWQueryRunner:
         """
         return self.__client.query(query, k)
 
+    @time_it
+    def __batch_query(self, queries: list[list[float]], k: int) -> list[list[int]]:
+        """
+        Perform a batch of standard queries.
+
+        :param queries: The query vectors.
+        :param k: The number of nearest neighbors to retrieve per query.
+        :return: List of retrieved nearest neighbors for every query.
+        """
+        return self.__client.batch_query(queries, k)
+
     @time_it
     def __filtered_query(self, query: list[float], k: int, keyword_filter: str) -> list[int]:
         """
@@ -14,9 +14,11 @@ class InsertConfig:
     Attributes:
         index_time: The time at which the index is created (see :class:`IndexTime`).
         query_mode: The query mode (see :class:`QueryMode`).
+        workers: The number of parallel workers inserting the data, each with its own connection. Default is 1.
     """
     index_time: IndexTime
     query_mode: QueryMode
+    workers: int = 1
 
 
 @dataclass(frozen=True)
@@ -28,10 +30,16 @@ class HNSWQueryConfig:
         ef_search: A list of sizes for the dynamic list for the nearest neighbors (used during search).
         index_config: Configuration for the HNSW index (see :class:`BaseHNSWConfig`).
         query_mode: The query modes (see :class:`QueryMode`).
+        profile_queries: The number of queries profiled for every ef value to split their latency into engine, network
+            and client time. Default is 0 (no profiling).
+        query_batch_size: The number of standard queries sent at once (see :meth:`BaseClient.batch_query`). Default is
+            1 (every query is sent on its own).
     """
     ef_search: list[int]
     index_config: BaseHNSWConfig
     query_mode: QueryMode
+    profile_queries: int = 0
+    query_batch_size: int = 1
 
 
 @dataclass(init=False)
@@ -4,11 +4,13 @@ import time
 from dataclasses import is_dataclass, fields
 from enum import Enum
 from functools import wraps
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Optional, Union, get_args, get_origin
+
+import numpy as np
 
-from .case_config import QueryMode
 from .chroma.chroma_task import ChromaHNSWTask
-from .milvus.milvus_task import MilvusHNSWTask
+from .milvus.milvus_task import MilvusHNSWTask, MilvusIVFFlatTask, MilvusIVFSQ8Task, MilvusIVFPQTask, MilvusSCANNTask, \
+    MilvusFlatTask
 from .redis.redis_task import RedisHNSWTask
 from .pgvector.pgvector_task import PgvectorHNSWTask
 from .result_config import HNSWRunnerResult
@@ -17,9 +19,21 @@ from ..client.base_client import BaseClient
 from ..client.base_config import BaseHNSWConfig
 from ..config import RESULT_BASE_PATH
 
+# Seconds between two polls of the index progress while waiting for the index to be ready
+INDEX_READY_POLL_INTERVAL = 0.1
+# Seconds without any index progress after which the index build is considered stalled
+INDEX_READY_STALL_TIMEOUT = 600
+# Index progress that counts as ready, the progress is a ratio of rows and may not reach exactly 1
+INDEX_READY_PROGRESS = 1 - 1e-9
+
 client_mapper = {
     "CHROMA": ChromaHNSWTask,
     "MILVUS": MilvusHNSWTask,
+    "MILVUS_IVF_FLAT": MilvusIVFFlatTask,
+    "MILVUS_IVF_SQ8": MilvusIVFSQ8Task,
+    "MILVUS_IVF_PQ": MilvusIVFPQTask,
+    "MILVUS_SCANN": MilvusSCANNTask,
+    "MILVUS_FLAT": MilvusFlatTask,
     "REDIS": RedisHNSWTask,
     "PGVECTOR": PgvectorHNSWTask
 }
@@ -51,6 +65,65 @@ def time_it(func) -> Callable[..., tuple[Any, float]]:
     return time_it_wrapper
 
 
+@time_it
+def wait_for_index(client: BaseClient, stall_timeout: float = INDEX_READY_STALL_TIMEOUT) -> None:
+    """
+    Wait until the index is fully built by polling the index progress of the client.
+
+    :param client: The client of the database.
+    :param stall_timeout: Seconds without any index progress after which the wait is aborted.
+    :raises TimeoutError: If the index progress did not increase for ``stall_timeout`` seconds.
+    """
+    last_progress = client.index_progress()
+    last_change = time.perf_counter()
+    while last_progress < INDEX_READY_PROGRESS:
+        time.sleep(INDEX_READY_POLL_INTERVAL)
+        progress = client.index_progress()
+        if progress > last_progress:
+            last_progress, last_change = progress, time.perf_counter()
+        elif time.perf_counter() - last_change > stall_timeout:
+            raise TimeoutError(f"Index progress stalled at {progress:.2%} for {stall_timeout} seconds")
+
+
+def percentile(values: np.ndarray, q: float) -> float:
+    """
+    Calculate a percentile of the values.
+
+    :param values: The values.
+    :param q: The percentile between 0 and 100.
+    :return: The percentile or 0 if there are no values.
+    """
+    return float(np.percentile(values, q)) if len(values) else 0
+
+
+def nanmean(values: np.ndarray) -> float:
+    """
+    Calculate the mean of the values ignoring NaN values.
+
+    :param values: The values.
+    :return: The mean or 0 if there are no values that are not NaN.
+    """
+    values = values[~np.isnan(values)]
+    return float(values.mean()) if len(values) else 0
+
+
+def fit_power_law(x: list[float], y: list[float]) -> tuple[float, float]:
+    """
+    Fit a power law ``y = coefficient * x ** exponent`` with a linear least squares fit in log-log space. Points with
+    a non-positive value are ignored.
+
+    :param x: The x values.
+    :param y: The y values.
+    :return: The coefficient and the exponent, both 0 if fewer than two points are positive.
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    positive = (x > 0) & (y > 0)
+    if positive.sum() < 2:
+        return 0, 0
+    exponent, log_coefficient = np.polyfit(np.log(x[positive]), np.log(y[positive]), 1)
+    return float(np.exp(log_coefficient)), float(exponent)
+
+
 def dataclass_to_dict(obj: Any) -> Any:
     """
     Convert a dataclass object (and its nested attributes) into a dictionary.
@@ -79,6 +152,21 @@ def dataclass_to_dict(obj: Any) -> Any:
     return obj
 
 
+def save_result(result: Any, path: Optional[str] = None) -> None:
+    """
+    Save a result data class with a ``client`` attribute to a JSON file.
+
+    :param result: Result object to save.
+    :param path: Path to save the JSON file. Defaults to a file in the result directory named after the timestamp, the
+        client and the type of the result.
+    """
+    if path is None:
+        path = os.path.join(RESULT_BASE_PATH, f"{time.strftime('%Y-%m-%d-%H-%M-%S')}-{type(result.client).__name__}-"
+                                              f"{type(result).__name__}.json")
+    with open(path, 'w') as file:
+        json.dump(dataclass_to_dict(result), file, indent=4)
+
+
 def save_hnsw_runner_result(result: HNSWRunnerResult, path: Optional[str] = None) -> None:
     """
     Save an HNSWRunnerResult object to a JSON file.
@@ -108,14 +196,27 @@ class MockBaseHNSWConfig(BaseHNSWConfig):
     def change_ef_search(self, ef: int) -> None:
         pass
 
+    def change_build_param(self, M: int, ef_construction: int) -> None:
+        pass
+
+    def change_build_threads(self, threads: int) -> None:
+        pass
+
 
 def dict_to_dataclass(data: Any, cls: Any) -> Any:
+    if get_origin(cls) is Union:
+        # Optional fields are restored as their type if a value is set
+        if data is None:
+            return None
+        cls = next(arg for arg in get_args(cls) if arg is not type(None))
     if cls == BaseClient:
         return client_mock_mapper[data]()
     elif cls == BaseHNSWConfig:
         return MockBaseHNSWConfig(data["index_param"], data["search_param"])
-    elif cls == QueryMode:
+    elif isinstance(cls, type) and issubclass(cls, Enum):
         return cls[data]
+    elif get_origin(cls) is dict:
+        return data
     elif isinstance(data, dict):
         fieldtypes = {f.name: f.type for f in cls.__dataclass_fields__.values()}
         return cls(**{k: dict_to_dataclass(v, fieldtypes[k]) for k, v in data.items()})
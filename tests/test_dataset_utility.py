@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from ecovdbs.client.base_config import MetricType
+from ecovdbs.dataset import utility
+from ecovdbs.dataset.utility import brute_force_neighbors
+
+
+def _naive_neighbors(data: np.ndarray, queries: np.ndarray, k: int, metric_type: MetricType) -> list[list[int]]:
+    if metric_type == MetricType.L2:
+        distances = np.linalg.norm(queries[:, None, :] - data[None, :, :], axis=2)
+    elif metric_type == MetricType.IP:
+        distances = -queries @ data.T
+    else:
+        distances = 1 - (queries @ data.T) / np.outer(np.linalg.norm(queries, axis=1), np.linalg.norm(data, axis=1))
+    return np.argsort(distances, axis=1)[:, :k].tolist()
+
+
+@pytest.mark.parametrize("metric_type", [MetricType.L2, MetricType.IP, MetricType.COSINE])
+def test_brute_force_neighbors(metric_type):
+    rng = np.random.default_rng(0)
+    data = rng.standard_normal((200, 8)).astype(np.float32)
+    queries = rng.standard_normal((25, 8)).astype(np.float32)
+    neighbors = brute_force_neighbors(data.tolist(), queries.tolist(), 10, metric_type)
+    assert neighbors == _naive_neighbors(data, queries, 10, metric_type)
+
+
+def test_brute_force_neighbors_in_blocks(monkeypatch):
+    # One query per block
+    monkeypatch.setattr(utility, "BRUTE_FORCE_BLOCK_SIZE", 50)
+    rng = np.random.default_rng(1)
+    data = rng.standard_normal((50, 4)).astype(np.float32)
+    queries = rng.standard_normal((7, 4)).astype(np.float32)
+    neighbors = brute_force_neighbors(data.tolist(), queries.tolist(), 5, MetricType.L2)
+    assert neighbors == _naive_neighbors(data, queries, 5, MetricType.L2)
+
+
+def test_brute_force_neighbors_caps_k():
+    neighbors = brute_force_neighbors([[0.0], [2.0], [1.0]], [[0.1]], 5, MetricType.L2)
+    assert neighbors == [[0, 2, 1]]
@@ -0,0 +1,45 @@
+import pytest
+
+from ecovdbs.client.base_config import MetricType, IndexType
+from ecovdbs.client.milvus.milvus_client import _range_bound, _theoretical_index_size
+from ecovdbs.runner.milvus.milvus_task import _nlist, _nprobe_sweep, _pq_m
+
+
+def test_range_bound():
+    assert _range_bound(MetricType.L2.value, 3) == 9
+    assert _range_bound(MetricType.IP.value, -0.25) == 0.25
+    assert _range_bound(MetricType.COSINE.value, 0.25) == 0.75
+
+
+def test_nlist():
+    assert _nlist(10_000) == 400
+    assert _nlist(1_000_000) == 4000
+    assert _nlist(0) == 1
+    assert _nlist(10 ** 12) == 65536
+
+
+def test_nprobe_sweep():
+    assert _nprobe_sweep(400) == [1, 2, 4, 8, 16, 32, 64]
+    assert _nprobe_sweep(1) == [1]
+
+
+@pytest.mark.parametrize("dimension, m", [(128, 32), (960, 240), (100, 25), (30, 6), (3, 1)])
+def test_pq_m(dimension, m):
+    assert _pq_m(dimension) == m
+    assert dimension % m == 0
+
+
+def test_theoretical_index_size():
+    nd, d = 1000, 128
+    raw, ids, centroids = nd * d * 4, nd * 8, 100 * d * 4
+    assert _theoretical_index_size({"index_type": IndexType.Flat.value, "params": {}}, nd, d) == raw
+    assert _theoretical_index_size({"index_type": IndexType.HNSW.value, "params": {"M": 16}}, nd, d) == \
+        raw + nd * 16 * 8
+    assert _theoretical_index_size({"index_type": IndexType.IVFFlat.value, "params": {"nlist": 100}}, nd, d) == \
+        raw + ids + centroids
+    assert _theoretical_index_size({"index_type": IndexType.IVFSQ8.value, "params": {"nlist": 100}}, nd, d) == \
+        nd * d + ids + centroids
+    ivf_pq = {"index_type": IndexType.IVFPQ.value, "params": {"nlist": 100, "m": 32, "nbits": 8}}
+    assert _theoretical_index_size(ivf_pq, nd, d) == nd * 32 + ids + centroids + 256 * d * 4
+    scann = {"index_type": IndexType.SCANN.value, "params": {"nlist": 100, "with_raw_data": False}}
+    assert _theoretical_index_size(scann, nd, d) == nd * d // 4 + ids + centroids
@@ -0,0 +1,43 @@
+import struct
+
+import numpy as np
+
+from ecovdbs.client.pgvector.pgvector_client import _copy_row_dtype, _encode_copy_block, _ef_search
+from ecovdbs.client.pgvector.pgvector_config import HNSW_MAX_EF_SEARCH
+
+
+def _expected_row(id_: int, vector: list[float], metadata: str) -> bytes:
+    encoded = metadata.encode("utf-8")
+    return (struct.pack(">hiq", 3, 8, id_)
+            + struct.pack(">ihh", 4 + 4 * len(vector), len(vector), 0)
+            + struct.pack(f">{len(vector)}f", *vector)
+            + struct.pack(">i", len(encoded)) + encoded)
+
+
+def test_copy_row_dtype_is_packed():
+    # 2 + 4 + 8 bytes for the field count and the id, 4 + 2 + 2 + 4 * d bytes for the vector, 4 for the metadata length
+    assert _copy_row_dtype(3).itemsize == 2 + 4 + 8 + 4 + 2 + 2 + 4 * 3 + 4
+
+
+def test_encode_copy_block_layout():
+    vectors = np.arange(12, dtype=">f4").reshape(4, 3)
+    metadata = ["a", "", "äbc", "xyz"]
+    encoded = _encode_copy_block(vectors, metadata, start_id=100, start=1, end=4)
+    expected = b"".join(_expected_row(100 + i, vectors[i].tolist(), metadata[i]) for i in range(1, 4))
+    assert encoded == expected
+
+
+def test_encode_copy_block_without_metadata():
+    vectors = np.array([[1.5, -2.0]], dtype=">f4")
+    assert _encode_copy_block(vectors, [""], start_id=0, start=0, end=1) == _expected_row(0, [1.5, -2.0], "")
+
+
+def test_ef_search_raised_to_candidates():
+    assert _ef_search(40, 0) == 40
+    assert _ef_search(40, 400) == 400
+    assert _ef_search(500, 400) == 500
+
+
+def test_ef_search_capped():
+    assert _ef_search(40, 100 * 11) == HNSW_MAX_EF_SEARCH
+    assert _ef_search(2000, 0) == HNSW_MAX_EF_SEARCH
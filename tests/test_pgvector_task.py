@@ -0,0 +1,15 @@
+import pytest
+
+from ecovdbs.client.base_config import MetricType, Quantization
+from ecovdbs.dataset.dataset import Dataset
+from ecovdbs.runner.case_config import HNSWCase, HNSWConfig, IndexTime, QueryMode
+from ecovdbs.runner.pgvector.pgvector_task import PgvectorHNSWTask
+
+
+def test_rerank_candidates_above_max_ef_search_rejected():
+    # k = 100, so 11 candidates per result need hnsw.ef_search = 1100
+    dataset = Dataset(2, MetricType.L2, [[0.0, 0.0]], [[0.0, 0.0]], [list(range(100))])
+    case = HNSWCase(dataset, HNSWConfig(), IndexTime.PRE_INDEX, QueryMode.QUERY, quantization=Quantization.HALFVEC,
+                    rerank_factor=11)
+    with pytest.raises(ValueError, match="rerank_factor"):
+        PgvectorHNSWTask(case)
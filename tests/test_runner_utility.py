@@ -0,0 +1,83 @@
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Optional
+
+import numpy as np
+import pytest
+
+from ecovdbs.runner.utility import percentile, nanmean, fit_power_law, dataclass_to_dict, dict_to_dataclass
+
+
+class _Color(Enum):
+    RED = 0
+    BLUE = 1
+
+
+@dataclass(frozen=True)
+class _Inner:
+    value: float
+    color: _Color = _Color.RED
+
+
+@dataclass(frozen=True)
+class _Outer:
+    inners: list[_Inner]
+    limit: Optional[int] = None
+    inner: Optional[_Inner] = None
+    color: Optional[_Color] = None
+    params: dict[str, int] = field(default_factory=dict)
+
+
+def test_percentile():
+    values = np.arange(1, 101, dtype=float)
+    assert percentile(values, 50) == 50.5
+    assert percentile(values, 100) == 100
+
+
+def test_percentile_without_values():
+    assert percentile(np.array([]), 99) == 0
+
+
+def test_nanmean_ignores_nan():
+    assert nanmean(np.array([1.0, np.nan, 3.0])) == 2.0
+
+
+def test_nanmean_without_values():
+    assert nanmean(np.array([np.nan, np.nan])) == 0
+    assert nanmean(np.array([])) == 0
+
+
+def test_fit_power_law():
+    x = [1, 2, 4, 8, 16]
+    coefficient, exponent = fit_power_law(x, [3 * v ** 1.5 for v in x])
+    assert coefficient == pytest.approx(3)
+    assert exponent == pytest.approx(1.5)
+
+
+def test_fit_power_law_ignores_non_positive_points():
+    coefficient, exponent = fit_power_law([0, 1, 2, 4], [5, 2, 4, -1])
+    assert coefficient == pytest.approx(2)
+    assert exponent == pytest.approx(1)
+
+
+def test_fit_power_law_with_too_few_points():
+    assert fit_power_law([1, 2], [1, 0]) == (0, 0)
+
+
+def test_dict_to_dataclass_round_trip():
+    outer = _Outer([_Inner(1.5), _Inner(2, _Color.BLUE)], limit=3, inner=_Inner(0.5, _Color.BLUE), color=_Color.RED,
+                   params={"ef_search": 40})
+    assert dict_to_dataclass(dataclass_to_dict(outer), _Outer) == outer
+
+
+def test_dict_to_dataclass_optional_none():
+    data = {"inners": [], "limit": None, "inner": None, "color": None, "params": {}}
+    assert dict_to_dataclass(data, _Outer) == _Outer([])
+
+
+def test_dict_to_dataclass_enum_and_dict():
+    outer = dict_to_dataclass({"inners": [{"value": 1, "color": "BLUE"}], "color": "BLUE", "params": {"a": 1}},
+                              _Outer)
+    assert outer.inners[0].color is _Color.BLUE
+    assert outer.color is _Color.BLUE
+    assert outer.params == {"a": 1}